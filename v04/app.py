@@ -1,25 +1,47 @@
 
+# Import startup profiler first, so it can time every import after it
+from utils.startup_profiler import profile_startup, startup_checkpoint, report_startup
+
 # Import shiny, shinyswatch, faicons, and asyncio
 from shiny import App, reactive, render, ui, req
 from shiny.types import ImgData
 import shinyswatch
 import asyncio
 
-# Import os for filepaths
+# Import os for filepaths, and partial for cached plots
 import os
+from functools import partial
 
 # Import setup
 from utils.setup.setup import *
+from utils.setup.snapshot import load_cdl_data, load_1_thru_3_totals
+from utils.setup.schema import apply_cdl_schema
+from utils.setup.aggregates import *
+from utils.setup.config import use_aggregate_tables
+from utils.setup.registry import DerivedData
 
 # Import other utils
 from utils.webscraper import *
 from utils.plots import *
 from utils.datagrids_and_value_boxes import *
+from utils.kills_index import build_player_kills_index, build_1_thru_3_kills_index
+from utils.streaks import \
+    build_win_streaks, build_player_ou_streak_index, build_1_thru_3_ou_streak_index, query_win_streak
+from utils.head_to_head import \
+    build_h2h_cube, query_last_match, query_h2h_map_record, query_h2h_series_record
+from utils.props_board import build_board_index, evaluate_props_board, build_props_board_lookup
+from utils.edges import edge_props, recency_windows, build_recent_board_indexes, rank_edges
+from utils.probability import build_probability_indexes
+from utils.backtest import record_prizepicks_lines
+from utils.render_cache import plot_cache, cached_plot
+from utils.render_pool import plot_pool, start_render_pool
+from utils.plot_warmer import start_plot_warmer
 
 # Import player card modules
 from shiny_modules.pg1_player_cards import * 
 from shiny_modules.pg2_player_cards import *
 from shiny_modules.pg3_map_summaries import *
+startup_checkpoint("imports")
 
 # Dictionary of faicons for value boxes
 ICONS = {
@@ -35,15 +57,6 @@ ICONS = {
     "circle_question": fa.icon_svg("circle-question", height = "16px"), 
 }
 
-# Dictionary to map map_num to gamemode
-map_nums_to_gamemode = {
-    1: "Hardpoint", 
-    2: "Search & Destroy", 
-    3: "Control", 
-    4: "Hardpoint", 
-    5: "Search & Destroy"
-}
-
 # Dictionary of paths to saved team logo images
 team_logo_path = "\images\\team_logos\\"
 team_logos = {
@@ -61,22 +74,6 @@ team_logos = {
     "Toronto Ultra": team_logo_path + "TOR.webp"
 }
 
-# Dictionary of team icons by team name
-team_icons = {
-    "Atlanta FaZe": "FaZe",
-    "Boston Breach": "Breach",
-    "Carolina Royal Ravens": "Ravens", 
-    "Las Vegas Legion": "Legion",
-    "Los Angeles Guerrillas": "Guerrillas", 
-    "Los Angeles Thieves": "Thieves", 
-    "Miami Heretics": "Heretics", 
-    "Minnesota ROKKR": "ROKKR", 
-    "New York Subliners": "Subliners",
-    "OpTic Texas": "OpTic", 
-    "Seattle Surge": "Surge", 
-    "Toronto Ultra": "Ultra"
-}
-
 # Dictionary of gamemode abbreviations for value box titles
 gamemode_abbrs = {
     "Hardpoint": "HP", 
@@ -94,42 +91,99 @@ team_b_color = theme_color_dark
 start_date = '2024-05-31' 
 
 
-# Load in cdl data
-og_cdlDF = load_and_clean_cdl_data()
+# Load in cdl data, from the local snapshot when it is current
+og_cdlDF = load_cdl_data()
+startup_checkpoint("load cdl data")
 
-# Build Maps 1 - 3 Totals Dataframe
-adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+# Team choices for the team inputs
+team_choices = sorted(og_cdlDF['team'].unique())
 
-# Build series summaries
-series_score_diffs = build_series_summaries(og_cdlDF).copy()
+# Derived dataframes, each built the first time a page needs it
+# Their build times are printed when CDL_PROFILE_STARTUP is set
+derived = DerivedData(verbose = profile_startup)
 
 # Filter maps from cdlDF
-cdlDF = filter_maps(og_cdlDF).copy()
+derived.register("cdlDF", lambda: filter_maps(og_cdlDF))
 
-# Build team summaries
-team_summaries_DF = build_team_summaries(cdlDF).copy()
+# Build Maps 1 - 3 Totals Dataframe
+derived.register("adj_1_thru_3_totals", lambda: load_1_thru_3_totals(og_cdlDF))
+
+# Build sorted kills indexes for the O/U value boxes
+derived.register("kills_index", lambda: build_player_kills_index(derived.cdlDF))
+derived.register("kills_1_thru_3_index", lambda: build_1_thru_3_kills_index(derived.adj_1_thru_3_totals))
+
+# Build current win streaks & O/U streak indexes for the streak value boxes
+derived.register("win_streaks", lambda: build_win_streaks(derived.cdlDF))
+derived.register("ou_streak_index", lambda: build_player_ou_streak_index(derived.cdlDF))
+derived.register("ou_1_thru_3_streak_index", lambda: build_1_thru_3_ou_streak_index(derived.adj_1_thru_3_totals))
+
+# Flatten the kills & O/U streak indexes for the props board
+derived.register("board_index", lambda: build_board_index(derived.kills_index, derived.ou_streak_index))
+derived.register("board_1_thru_3_index", 
+                 lambda: build_board_index(derived.kills_1_thru_3_index, derived.ou_1_thru_3_streak_index))
+
+# Data version of the cdl data, which keys the render cache & seeds the model probabilities
+derived.register("data_version", lambda: compute_data_version(og_cdlDF))
+plot_cache.set_data_version(derived.data_version)
+
+# Simulate the kills of every player for the model probabilities
+derived.register("probability_indexes", lambda: 
+                 build_probability_indexes(derived.kills_index, derived.kills_1_thru_3_index, derived.data_version))
+
+# Build board & probability indexes of the recency windows of the best edges page
+for n_recent in recency_windows.values():
+    if n_recent is not None:
+        derived.register(f"recent_board_indexes_{n_recent}", lambda n_recent = n_recent: 
+                         build_recent_board_indexes(derived.cdlDF, derived.adj_1_thru_3_totals, n_recent, 
+                                                    derived.data_version))
+
+# Build head-to-head records & last match dates of every matchup
+derived.register("h2h_cube", lambda: build_h2h_cube(derived.cdlDF))
+
+# Build series summaries, team summaries & standings
+# from the database's aggregate tables, or from the cdl data
+if use_aggregate_tables:
+    derived.register("aggregates", load_aggregate_tables)
+    derived.register("series_score_diffs", 
+                     lambda: apply_cdl_schema(build_series_summaries_from_aggregates(derived.aggregates)))
+    derived.register("team_summaries_DF", lambda: build_team_summaries_from_aggregates(derived.aggregates))
+    derived.register("current_standings", 
+                     lambda: build_current_standings_from_aggregates(derived.aggregates, start_date))
+else:
+    derived.register("series_score_diffs", lambda: apply_cdl_schema(build_series_summaries(og_cdlDF)))
+    derived.register("team_summaries_DF", lambda: build_team_summaries(derived.cdlDF))
+    derived.register("current_standings", lambda: build_current_standings(derived.cdlDF, start_date))
+
+# Build team record lookup for the map record value boxes
+derived.register("team_records", lambda: build_team_record_lookup(derived.team_summaries_DF))
 
 # Build rosters
-rostersDF = build_rosters(cdlDF).copy()
+derived.register("rostersDF", lambda: build_rosters(derived.cdlDF))
 
 # Load and pivot vetoes
-vetoes_wide = load_vetoes("v04\data\\vetoes.xlsx")
-vetoes_df = pivot_vetoes(vetoes_wide)
-
-# Compute CDL Standings for Major III Qualifiers
-current_standings = \
-    cdlDF[(cdlDF["match_date"] >= start_date)] \
-    [["match_id", "team", "series_result"]] \
-    .drop_duplicates() \
-    .groupby("team") \
-    .agg(
-        wins = ("series_result", lambda x: sum(x)), 
-        losses = ("series_result", lambda x: len(x) - sum(x))
-    ) \
-    .reset_index().copy()
+derived.register("vetoes_wide", lambda: load_vetoes("v04\data\\vetoes.xlsx"))
+derived.register("vetoes_df", lambda: pivot_vetoes(derived.vetoes_wide))
 
 # Initialize player props dataframe
-initial_player_props = build_intial_props(rostersDF).copy()
+derived.register("initial_player_props", lambda: build_intial_props(derived.rostersDF))
+startup_checkpoint("register derived data")
+
+# Dataframes the plots are drawn from, sent once to each plot worker & shared with the cache warmer
+# Smaller dataframes, ie. the Maps 1 - 3 totals & vetoes, are sent with each plot, so they stay lazy
+plot_frames = ["cdlDF", "series_score_diffs", "team_summaries_DF"]
+
+# Function to build the dataframes of the plot workers, skipping any that fail to load
+def get_plot_frames():
+    frames = {}
+    for name in plot_frames:
+        try:
+            frames[name] = derived.get(name)
+        except Exception as e:
+            print(f"Could not send {name} to the plot workers ({e})")
+    return frames
+
+# Render plots in worker processes, off the event loop, once a session renders its first plot
+start_render_pool(get_plot_frames)
 
 
 # Define ui
@@ -150,9 +204,9 @@ app_ui = ui.page_navbar(
                 # Inputs
                 ui.input_action_button(id = "scrape", label = "Get PrizePicks Lines", class_ = "btn-info"), 
                 ui.input_select(id = "team_a", label = "Team A", selected = "OpTic Texas",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "team_b", label = "Team B", selected = "Atlanta FaZe",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "map_num_and_gamemode", label = "Map Number", selected = 1,
                                 choices = [
                                     "Map 1 Hardpoint", 
@@ -162,7 +216,7 @@ app_ui = ui.page_navbar(
                                     "Map 5 Search & Destroy"
                                 ]), 
                 ui.input_select(id = "map_name", label = "Map", selected = "All", 
-                                choices = ['All', '6 Star', 'Karachi', 'Rio', 'Sub Base', 'Vista']),
+                                choices = ["All"] + map_pools["Hardpoint"]),
                 ui.input_select(id = "x_axis", label = "Player Card X-Axis", selected = "Time",
                                 choices = ["Time", "Score Differential"]),
 
@@ -356,15 +410,15 @@ app_ui = ui.page_navbar(
                 # Inputs
                 ui.input_action_button(id = "p2_scrape", label = "Get PrizePicks Lines", class_ = "btn-info"), 
                 ui.input_select(id = "p2_team_a", label = "Team A", selected = "Carolina Royal Ravens",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "p2_team_b", label = "Team B", selected = "New York Subliners",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "p2_map_one", label = "Map 1", selected = "All",
-                                choices = ["All", "6 Star", "Karachi", "Rio", "Sub Base", "Vista"]), 
+                                choices = ["All"] + map_pools["Hardpoint"]), 
                 ui.input_select(id = "p2_map_two", label = "Map 2", selected = "All",
-                                choices = ["All", "6 Star", "Highrise", "Invasion", "Karachi", "Rio"]), 
+                                choices = ["All"] + map_pools["Search & Destroy"]), 
                 ui.input_select(id = "p2_map_three", label = "Map 3", selected = "All",
-                                choices = ["All", "Highrise", "Invasion", "Karachi"]), 
+                                choices = ["All"] + map_pools["Control"]), 
                 ui.input_select(id = "p2_x_axis", label = "Player Card X-Axis", selected = "Time",
                                 choices = ["Time", "Mapset", "Hardpoint Map", "SnD Map", "Control Map"]), 
                 ui.input_action_button(id = "p2_reset_maps", label = "Reset maps")
@@ -611,9 +665,9 @@ app_ui = ui.page_navbar(
             ui.sidebar(
                 # Inputs
                 ui.input_select(id = "p4_team_a", label = "Team A", selected = "Toronto Ultra",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "p4_team_b", label = "Team B", selected = "Los Angeles Thieves",
-                                choices = sorted(cdlDF['team'].unique())), 
+                                choices = team_choices), 
                 ui.input_select(id = "p4_gamemode", label = "Gamemode", selected = "New York Subliners",
                                 choices = ["Hardpoint", "Search & Destroy", "Control"]), 
                 ui.input_slider(id = "p4_stage", label = "Stage", min = 1, max = 4, value = [1, 4])
@@ -671,6 +725,41 @@ app_ui = ui.page_navbar(
         )
     ),
 
+    # 5th Page: Best Edges
+    ui.nav_panel("Best Edges",
+
+        # Sidebar Layout
+        ui.layout_sidebar(
+
+            # Sidebar with inputs
+            ui.sidebar(
+                # Inputs
+                ui.input_action_button(id = "p5_scrape", label = "Get PrizePicks Lines", class_ = "btn-info"), 
+                ui.input_select(id = "p5_prop", label = "Prop", selected = "All Props",
+                                choices = list(edge_props)), 
+                ui.input_select(id = "p5_map_name", label = "Map", selected = "All",
+                                choices = ["All"]), 
+                ui.input_numeric(id = "p5_min_sample", label = "Minimum Maps Played", value = 10, min = 1), 
+                ui.input_select(id = "p5_window", label = "Recency", selected = "All Time",
+                                choices = list(recency_windows))
+            ), 
+
+            # Row 1 of 1: Every Prop Ranked by Hit Rate
+            ui.layout_columns(
+                
+                ui.card(ui.card_header("Best Edges"), 
+                    ui.output_data_frame("best_edges"), 
+                    full_screen = True),
+
+                # Column Widths
+                col_widths = [-1, 10, -1],
+
+                # Row Height
+                height = "720px"
+            )
+        )
+    ),
+
     # App Title
     title = "CDL Bets on PrizePicks", 
 
@@ -678,24 +767,39 @@ app_ui = ui.page_navbar(
     inverse = True
 )
 
+# Function to scrape PrizePicks, keeping the scraped lines for the backtest
+# A failed write to the lines history is logged, and never blocks loading the props
+def scrape_and_record_props():
+    scraped_props = scrape_prizepicks()
+    try:
+        record_prizepicks_lines(scraped_props)
+    except OSError as e:
+        print(f"Could not record PrizePicks lines for the backtest ({e})")
+    return scraped_props
+
 # Define server logic
 def server(input, output, session):
 
     # Intialize reactive dataframe of player props
-    player_props_df = reactive.value(initial_player_props)
+    player_props_df = reactive.value(derived.initial_player_props)
+
+    # Prerender the team-level plots into the render cache in the background, once the first session has loaded
+    session.on_flushed(partial(start_plot_warmer, team_a_color, team_b_color), once = True)
 
     # Reactive event to update player props dataframe
     # Displays progress bar while scraping
     @reactive.effect
-    @reactive.event(input.scrape)
+    @reactive.event(input.scrape, input.p5_scrape)
     async def scrape_props():
         with ui.Progress(min = 1, max = 15) as p:
             p.set(message = "Scraping PrizePicks", detail = "Please wait...")
             
+            scraped_props = scrape_and_record_props()
+
             newVal = merge_player_props(
                 player_props_df(), 
-                scrape_prizepicks(), 
-                rostersDF
+                scraped_props, 
+                derived.rostersDF
             )
             player_props_df.set(newVal)
 
@@ -714,10 +818,12 @@ def server(input, output, session):
         with ui.Progress(min = 1, max = 15) as p:
             p.set(message = "Scraping PrizePicks", detail = "Please wait...")
             
+            scraped_props = scrape_and_record_props()
+
             newVal = merge_player_props(
                 player_props_df(), 
-                scrape_prizepicks(), 
-                rostersDF
+                scraped_props, 
+                derived.rostersDF
             )
             player_props_df.set(newVal)
 
@@ -728,6 +834,21 @@ def server(input, output, session):
                     p.set(i, message = "Finished")
                 await asyncio.sleep(0.1)
 
+    # O/U stats & streaks of every prop on the board, evaluated once for every player card
+    # Page 1 props are evaluated on the user-selected map
+    @reactive.calc
+    def props_board():
+        return build_props_board_lookup(evaluate_props_board(
+            player_props_df(), derived.board_index, derived.board_1_thru_3_index, input.map_name()
+        ))
+
+    # Page 2 props are evaluated on every map
+    @reactive.calc
+    def p2_props_board():
+        return build_props_board_lookup(evaluate_props_board(
+            player_props_df(), derived.board_index, derived.board_1_thru_3_index
+        ))
+
     # Reactive calc to get map_num from map_num input
     @reactive.calc
     def map_num():
@@ -741,14 +862,7 @@ def server(input, output, session):
     # Reactive event to update map_name list based on map_num input
     @reactive.effect
     def _():
-        x = map_num()
-
-        if map_num() == 1 or map_num() == 4:
-            map_list = ['All', '6 Star', 'Karachi', 'Rio', 'Sub Base', 'Vista']
-        elif map_num() == 2 or map_num() == 5:
-            map_list = ['All', '6 Star', 'Highrise', 'Invasion', 'Karachi', 'Rio']
-        else:
-            map_list = ['All', 'Highrise', 'Invasion', 'Karachi']
+        map_list = ["All"] + map_pools[gamemode()]
 
         ui.update_select("map_name", choices = map_list, selected = "All")
 
@@ -777,27 +891,27 @@ def server(input, output, session):
     # Date of Last Match
     @render.ui
     def last_match_date():
-        return compute_last_match(cdlDF, input.team_a(), input.team_b())
+        return query_last_match(derived.h2h_cube, input.team_a(), input.team_b())
     
     # Team A Series Record for Major 4 Quals
     @render.ui
     def team_a_standing():
-        wins = current_standings.loc[current_standings['team'] == input.team_a(), 'wins'].reset_index(drop=True)[0]
-        losses = current_standings.loc[current_standings['team'] == input.team_a(), 'losses'].reset_index(drop=True)[0]
+        wins = derived.current_standings.loc[derived.current_standings['team'] == input.team_a(), 'wins'].reset_index(drop=True)[0]
+        losses = derived.current_standings.loc[derived.current_standings['team'] == input.team_a(), 'losses'].reset_index(drop=True)[0]
         return f"{wins} - {losses}"
     
 
     # Team B Series Record for Major 4 Quals
     @render.ui
     def team_b_standing():
-        wins = current_standings.loc[current_standings['team'] == input.team_b(), 'wins'].reset_index(drop=True)[0]
-        losses = current_standings.loc[current_standings['team'] == input.team_b(), 'losses'].reset_index(drop=True)[0]
+        wins = derived.current_standings.loc[derived.current_standings['team'] == input.team_b(), 'wins'].reset_index(drop=True)[0]
+        losses = derived.current_standings.loc[derived.current_standings['team'] == input.team_b(), 'losses'].reset_index(drop=True)[0]
         return f"{wins} - {losses}"
     
     # H2H Series Record for User-Selected Map & Mode Combination
     @render.ui
     def h2h_series_record():
-        return compute_h2h_series_record(cdlDF, input.team_a(), input.team_b())
+        return query_h2h_series_record(derived.h2h_cube, input.team_a(), input.team_b())
     
     # Title for Team A Map Record Value Box
     @render.ui
@@ -824,75 +938,43 @@ def server(input, output, session):
         else:
             return f"{input.map_name()} {gamemode_abbrs[gamemode()]} H2H"
         
+    # Team A Record for User-Selected Map & Mode Combination
+    @reactive.calc
+    def team_a_map_record_stats():
+        return lookup_team_record(derived.team_records, input.team_a(), gamemode(), input.map_name())
+
     # Team A Map Record for User-Selected Map & Mode Combination
     @render.ui
     def team_a_map_record():
-        if input.map_name() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.map_name()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_a()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_a()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_a()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(team_a_map_record_stats())
     
     # Team A Map Win Percentage Icon
     @render.ui
     def team_a_win_percent_icon():
-        map_to_search_for = "Overall" if input.map_name() == "All" else input.map_name()
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_a()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return ICONS["plus"] if win_percentage >= 0.5 else ICONS["minus"]
+        return ICONS["plus"] if team_a_map_record_stats()["win_percentage"] >= 0.5 else ICONS["minus"]
     
 
+    # Team B Record for User-Selected Map & Mode Combination
+    @reactive.calc
+    def team_b_map_record_stats():
+        return lookup_team_record(derived.team_records, input.team_b(), gamemode(), input.map_name())
+
     # Team B Map Record for User-Selected Map & Mode Combination
     @render.ui
     def team_b_map_record():
-        if input.map_name() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.map_name()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_b()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_b()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_b()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(team_b_map_record_stats())
     
     # Team B Map Win Percentage Icon
     @render.ui
     def team_b_win_percent_icon():
-        map_to_search_for = "Overall" if input.map_name() == "All" else input.map_name()
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.team_b()) &
-            (team_summaries_DF['gamemode'] == gamemode()) & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return ICONS["plus"] if win_percentage >= 0.5 else ICONS["minus"]
+        return ICONS["plus"] if team_b_map_record_stats()["win_percentage"] >= 0.5 else ICONS["minus"]
     
 
     # H2H Map Record for User-Selected Map & Mode Combination
     @render.ui
     def h2h_map_record():
-        return compute_h2h_map_record(cdlDF, input.team_a(), input.team_b(), 
-                                      gamemode(), input.map_name())
+        return query_h2h_map_record(derived.h2h_cube, input.team_a(), input.team_b(), 
+                                    gamemode(), input.map_name())
     
     # Title for Team A Win Streak Value Box
     @render.ui
@@ -913,12 +995,12 @@ def server(input, output, session):
     # Compute Team A Win Streak
     @reactive.calc
     def compute_team_a_win_streak():
-        return compute_win_streak(cdlDF, input.team_a(), gamemode(), input.map_name())
+        return query_win_streak(derived.win_streaks, input.team_a(), gamemode(), input.map_name())
     
     # Compute Team B Win Streak
     @reactive.calc
     def compute_team_b_win_streak():
-        return compute_win_streak(cdlDF, input.team_b(), gamemode(), input.map_name())
+        return query_win_streak(derived.win_streaks, input.team_b(), gamemode(), input.map_name())
 
     # Team A Win Streak for User-Selected Map & Mode Combination
     @render.ui
@@ -943,10 +1025,10 @@ def server(input, output, session):
         return ICONS["hot"] if win_streak > 0 else ICONS["cold"]
     
     # Ridgeline Plots of Score Diffs
-    @render.plot
+    @cached_plot
     def score_diffs():
-        return score_diffs_ridge(
-            cdlDF, 
+        return partial(score_diffs_ridge,
+            derived.cdlDF, 
             team_icons[input.team_a()], team_icons[input.team_b()], 
             team_a_color, team_b_color,
             gamemode(), 
@@ -954,17 +1036,17 @@ def server(input, output, session):
         )
     
     # Team A Donut Chart of % Maps Played
-    @render.plot
+    @cached_plot
     def team_a_maps_played():
-        return team_percent_maps_played(
-            team_summaries_DF, input.team_a(), gamemode()
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.team_a(), gamemode()
         )
     
     # Team B Donut Chart of % Maps Played
-    @render.plot
+    @cached_plot
     def team_b_maps_played():
-        return team_percent_maps_played(
-            team_summaries_DF, input.team_b(), gamemode()
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.team_b(), gamemode()
         )
     
     # Team A Name for Maps Played Card Header
@@ -978,10 +1060,10 @@ def server(input, output, session):
         return team_icons[input.team_b()] + " Maps Played"
     
     # Team A Series Differentials Histogram
-    @render.plot
+    @cached_plot
     def series_diffs():
-        return series_diff_ridge(
-            series_score_diffs,
+        return partial(series_diff_ridge,
+            derived.series_score_diffs,
             team_icons[input.team_a()], team_icons[input.team_b()], 
             team_a_color, team_b_color
         )
@@ -992,7 +1074,7 @@ def server(input, output, session):
     def scoreboards():
         return render.DataGrid(
             build_scoreboards(
-                cdlDF, 
+                derived.cdlDF, 
                 input.team_a(),
                 input.team_b(),
                 gamemode(), 
@@ -1004,14 +1086,14 @@ def server(input, output, session):
     
     # Team A Player Cards | Page 1
     [player_card_server_pg1(
-        "p" + str(player_num), cdlDF, rostersDF, player_props_df, input.team_a,
-        player_num, map_num, team_a_color, gamemode, input.map_name, input.x_axis
+        "p" + str(player_num), derived.getter("cdlDF"), derived.getter("rostersDF"), props_board, 
+        player_props_df, input.team_a, player_num, map_num, team_a_color, gamemode, input.map_name, input.x_axis
     ) for player_num in range(1, 5)]
 
     # Team B Player Cards | Page 1
     [player_card_server_pg1(
-        "p" + str(player_num + 4), cdlDF, rostersDF, player_props_df, input.team_b,
-        player_num, map_num, team_b_color, gamemode, input.map_name, input.x_axis
+        "p" + str(player_num + 4), derived.getter("cdlDF"), derived.getter("rostersDF"), props_board, 
+        player_props_df, input.team_b, player_num, map_num, team_b_color, gamemode, input.map_name, input.x_axis
     ) for player_num in range(1, 5)]
 
     # Team A Logo | Page 2
@@ -1031,110 +1113,54 @@ def server(input, output, session):
    # Date of Last Match | Page 2
     @render.ui
     def p2_last_match_date():
-        return compute_last_match(cdlDF, input.p2_team_a(), input.p2_team_b())
+        return query_last_match(derived.h2h_cube, input.p2_team_a(), input.p2_team_b())
     
     # Team A Series Record for Major 4 Quals | Page 2
     @render.ui
     def p2_team_a_standing():
-        wins = current_standings.loc[current_standings['team'] == input.p2_team_a(), 'wins'].reset_index(drop=True)[0]
-        losses = current_standings.loc[current_standings['team'] == input.p2_team_a(), 'losses'].reset_index(drop=True)[0]
+        wins = derived.current_standings.loc[derived.current_standings['team'] == input.p2_team_a(), 'wins'].reset_index(drop=True)[0]
+        losses = derived.current_standings.loc[derived.current_standings['team'] == input.p2_team_a(), 'losses'].reset_index(drop=True)[0]
         return f"{wins} - {losses}"
 
     # Team B Series Record for Major 4 Quals | Page 2
     @render.ui
     def p2_team_b_standing():
-        wins = current_standings.loc[current_standings['team'] == input.p2_team_b(), 'wins'].reset_index(drop=True)[0]
-        losses = current_standings.loc[current_standings['team'] == input.p2_team_b(), 'losses'].reset_index(drop=True)[0]
+        wins = derived.current_standings.loc[derived.current_standings['team'] == input.p2_team_b(), 'wins'].reset_index(drop=True)[0]
+        losses = derived.current_standings.loc[derived.current_standings['team'] == input.p2_team_b(), 'losses'].reset_index(drop=True)[0]
         return f"{wins} - {losses}"
     
     # H2H Series Record for User-Selected Map & Mode Combination | Page 2
     @render.ui
     def p2_h2h_series_record():
-        return compute_h2h_series_record(cdlDF, input.p2_team_a(), input.p2_team_b())
+        return query_h2h_series_record(derived.h2h_cube, input.p2_team_a(), input.p2_team_b())
     
     # Team A HP Record for User-Selected Map | Page 2
     @render.ui
     def team_a_hp_record():
-        if input.p2_map_one() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.p2_map_one()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(
+            lookup_team_record(derived.team_records, input.p2_team_a(), "Hardpoint", input.p2_map_one())
+        )
     
     # Team B HP Record for User-Selected Map | Page 2
     @render.ui
     def team_b_hp_record():
-        if input.p2_map_one() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.p2_map_one()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Hardpoint") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(
+            lookup_team_record(derived.team_records, input.p2_team_b(), "Hardpoint", input.p2_map_one())
+        )
     
     # Team A Control Record for User-Selected Map | Page 2
     @render.ui
     def team_a_ctrl_record():
-        if input.p2_map_three() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.p2_map_three()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_a()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(
+            lookup_team_record(derived.team_records, input.p2_team_a(), "Control", input.p2_map_three())
+        )
     
     # Team B Control Record for User-Selected Map | Page 2
     @render.ui
     def team_b_ctrl_record():
-        if input.p2_map_three() == "All":
-            map_to_search_for = "Overall"
-        else:
-            map_to_search_for = input.p2_map_three()
-        wins = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'wins'].reset_index(drop=True)[0]
-        losses = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'losses'].reset_index(drop=True)[0]
-        win_percentage = team_summaries_DF.loc[
-            (team_summaries_DF['team'] == input.p2_team_b()) &
-            (team_summaries_DF['gamemode'] == "Control") & 
-            (team_summaries_DF['map_name'] == map_to_search_for), 'win_percentage'].reset_index(drop=True)[0]
-        return f"{win_percentage:.0%} ({wins} - {losses})"
+        return format_team_record(
+            lookup_team_record(derived.team_records, input.p2_team_b(), "Control", input.p2_map_three())
+        )
     
     # Title for Team A HP Record Value Box | Page 2 
     @render.ui
@@ -1179,47 +1205,47 @@ def server(input, output, session):
         return team_icons[input.p2_team_b()] + " Maps Played"
         
     # Team A Donut Chart of HPs Played | Page 2
-    @render.plot
+    @cached_plot
     def p2_team_a_hps():
-        return team_percent_maps_played(
-            team_summaries_DF, input.p2_team_a(), "Hardpoint"
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.p2_team_a(), "Hardpoint"
         )
     
     # Team A Donut Chart of Controls Played | Page 2
-    @render.plot
+    @cached_plot
     def p2_team_a_ctrls():
-        return team_percent_maps_played(
-            team_summaries_DF, input.p2_team_a(), "Control"
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.p2_team_a(), "Control"
         )
     
     # Team B Donut Chart of HPs Played | Page 2
-    @render.plot
+    @cached_plot
     def p2_team_b_hps():
-        return team_percent_maps_played(
-            team_summaries_DF, input.p2_team_b(), "Hardpoint"
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.p2_team_b(), "Hardpoint"
         )
     
     # Team B Donut Chart of Controls Played | Page 2
-    @render.plot
+    @cached_plot
     def p2_team_b_ctrls():
-        return team_percent_maps_played(
-            team_summaries_DF, input.p2_team_b(), "Control"
+        return partial(team_percent_maps_played,
+            derived.team_summaries_DF, input.p2_team_b(), "Control"
         )
     
     # Ridgeline Plot of Series Diffs | Page 2
-    @render.plot
+    @cached_plot
     def p2_series_diffs():
-        return series_diff_ridge(
-            series_score_diffs, 
+        return partial(series_diff_ridge,
+            derived.series_score_diffs, 
             team_icons[input.p2_team_a()], team_icons[input.p2_team_b()], 
             team_a_color, team_b_color
             )
     
     # Ridgeline Plot of Hardpoint Score Diffs | Page 2
-    @render.plot
+    @cached_plot
     def p2_hp_score_diffs():
-        return score_diffs_ridge(
-            cdlDF, 
+        return partial(score_diffs_ridge,
+            derived.cdlDF, 
             team_icons[input.p2_team_a()], team_icons[input.p2_team_b()], 
             team_a_color, team_b_color, 
             "Hardpoint", 
@@ -1227,10 +1253,10 @@ def server(input, output, session):
             )
     
     # Ridgeline Plot of Control Score Diffs | Page 2
-    @render.plot
+    @cached_plot
     def p2_ctrl_score_diffs():
-        return score_diffs_ridge(
-            cdlDF, 
+        return partial(score_diffs_ridge,
+            derived.cdlDF, 
             team_icons[input.p2_team_a()], team_icons[input.p2_team_b()], 
             team_a_color, team_b_color, 
             "Control", 
@@ -1243,7 +1269,7 @@ def server(input, output, session):
     def p2_scoreboards():
         return render.DataGrid(
             build_scoreboards(
-                cdlDF, 
+                derived.cdlDF, 
                 input.p2_team_a(),
                 input.p2_team_b()
             ), 
@@ -1253,15 +1279,15 @@ def server(input, output, session):
     
     # Team A Player Cards | Page 2
     [player_card_server_pg2(
-        "p" + str(player_num + 8), cdlDF, adj_1_thru_3_totals, rostersDF, 
-        player_props_df, input.p2_team_a, player_num, team_a_color, 
+        "p" + str(player_num + 8), derived.getter("cdlDF"), derived.getter("adj_1_thru_3_totals"), p2_props_board, 
+        derived.getter("rostersDF"), player_props_df, input.p2_team_a, player_num, team_a_color, 
         input.p2_map_one, input.p2_map_two, input.p2_map_three, input.p2_x_axis
     ) for player_num in range(1, 5)]
 
     # Team B Player Cards | Page 2
     [player_card_server_pg2(
-        "p" + str(player_num + 12), cdlDF, adj_1_thru_3_totals, rostersDF, 
-        player_props_df, input.p2_team_b, player_num, team_b_color, 
+        "p" + str(player_num + 12), derived.getter("cdlDF"), derived.getter("adj_1_thru_3_totals"), p2_props_board, 
+        derived.getter("rostersDF"), player_props_df, input.p2_team_b, player_num, team_b_color, 
         input.p2_map_one, input.p2_map_two, input.p2_map_three, input.p2_x_axis
 
     ) for player_num in range(1, 5)]
@@ -1323,11 +1349,11 @@ def server(input, output, session):
         return cur_match_df().reset_index(drop = True).at[0, "Date"]
     
     # Maps 1 - 5 Summaries | Page 3
-    map_summary_server_p3("m1", og_cdlDF.copy(), cur_match_id, 1, cur_team_a, cur_team_b, number_of_maps)
-    map_summary_server_p3("m2", og_cdlDF.copy(), cur_match_id, 2, cur_team_a, cur_team_b, number_of_maps)
-    map_summary_server_p3("m3", og_cdlDF.copy(), cur_match_id, 3, cur_team_a, cur_team_b, number_of_maps)
-    map_summary_server_p3("m4", og_cdlDF.copy(), cur_match_id, 4, cur_team_a, cur_team_b, number_of_maps)
-    map_summary_server_p3("m5", og_cdlDF.copy(), cur_match_id, 5, cur_team_a, cur_team_b, number_of_maps)
+    map_summary_server_p3("m1", og_cdlDF, cur_match_id, 1, cur_team_a, cur_team_b, number_of_maps)
+    map_summary_server_p3("m2", og_cdlDF, cur_match_id, 2, cur_team_a, cur_team_b, number_of_maps)
+    map_summary_server_p3("m3", og_cdlDF, cur_match_id, 3, cur_team_a, cur_team_b, number_of_maps)
+    map_summary_server_p3("m4", og_cdlDF, cur_match_id, 4, cur_team_a, cur_team_b, number_of_maps)
+    map_summary_server_p3("m5", og_cdlDF, cur_match_id, 5, cur_team_a, cur_team_b, number_of_maps)
 
     # Map 4 Summary | Page 3
     @render.ui
@@ -1370,7 +1396,7 @@ def server(input, output, session):
    # Date of Last Match | Page 4
     @render.ui
     def p4_last_match_date():
-        return compute_last_match(cdlDF, input.p4_team_a(), input.p4_team_b())
+        return query_last_match(derived.h2h_cube, input.p4_team_a(), input.p4_team_b())
     
     # Title for Team A Picks Bar Chart | Page 4
     @render.text
@@ -1397,7 +1423,7 @@ def server(input, output, session):
     def vetoes():
         return render.DataGrid(
             display_vetoes(
-                vetoes_wide, 
+                derived.vetoes_wide, 
                 input.p4_team_a(), input.p4_team_b(), 
                 input.p4_stage()[0], input.p4_stage()[1]
             ), 
@@ -1406,34 +1432,71 @@ def server(input, output, session):
         )
     
     # Function to chart Team A Picks for Selected Gamemode | Page 4 
-    @render.plot
+    @cached_plot
     def team_a_picks():
-        return chart_vetoes(vetoes_df, input.p4_team_a(), "pick", 
+        return partial(chart_vetoes, derived.vetoes_df, input.p4_team_a(), "pick", 
                             input.p4_gamemode(), team_a_color, 
                             input.p4_stage()[0], input.p4_stage()[1])
     
     # Function to chart Team A Bans for Selected Gamemode | Page 4 
-    @render.plot
+    @cached_plot
     def team_a_bans():
-        return chart_vetoes(vetoes_df, input.p4_team_a(), "ban", 
+        return partial(chart_vetoes, derived.vetoes_df, input.p4_team_a(), "ban", 
                             input.p4_gamemode(), team_a_color, 
                             input.p4_stage()[0], input.p4_stage()[1])
     
     # Function to chart Team B Picks for Selected Gamemode | Page 4 
-    @render.plot
+    @cached_plot
     def team_b_picks():
-        return chart_vetoes(vetoes_df, input.p4_team_b(), "pick", 
+        return partial(chart_vetoes, derived.vetoes_df, input.p4_team_b(), "pick", 
                             input.p4_gamemode(), team_b_color, 
                             input.p4_stage()[0], input.p4_stage()[1])
     
     # Function to chart Team B Bans for Selected Gamemode | Page 4 
-    @render.plot
+    @cached_plot
     def team_b_bans():
-        return chart_vetoes(vetoes_df, input.p4_team_b(), "ban", 
+        return partial(chart_vetoes, derived.vetoes_df, input.p4_team_b(), "ban", 
                             input.p4_gamemode(), team_b_color, 
                             input.p4_stage()[0], input.p4_stage()[1])
         
+    # Board & probability indexes of the user-selected recency window | Page 5
+    @reactive.calc
+    def p5_board_indexes():
+        n_recent = recency_windows[input.p5_window()]
+        if n_recent is None:
+            return derived.board_index, derived.board_1_thru_3_index, *derived.probability_indexes
+        return derived.get(f"recent_board_indexes_{n_recent}")
+
+    # Reactive event to update map_name list based on prop input | Page 5
+    @reactive.effect
+    def ___():
+        prop = edge_props[input.p5_prop()]
+        map_list = ["All"] + (map_pools[map_nums_to_gamemode[prop]] if prop else [])
+        ui.update_select("p5_map_name", choices = map_list, selected = "All")
+
+    # Datagrid of Every Prop on the Board, Ranked by Hit Rate | Page 5
+    @render.data_frame
+    def best_edges():
+        return render.DataGrid(
+            rank_edges(
+                player_props_df(), 
+                *p5_board_indexes(), 
+                edge_props[input.p5_prop()], 
+                input.p5_map_name(), 
+                input.p5_min_sample() or 1
+            ), 
+            filters = True, 
+            summary = False
+        )
+        
         
 
 # Run app
-app = App(app_ui, server)
\ No newline at end of file
+app = App(app_ui, server)
+
+# Stop the plot workers when the app shuts down
+app.on_shutdown(plot_pool.shutdown)
+startup_checkpoint("build ui & app")
+
+# Print startup profile, when CDL_PROFILE_STARTUP is set
+report_startup()
\ No newline at end of file
@@ -0,0 +1,68 @@
+# Benchmark: summaries from the full cdl data vs from the database's aggregate tables
+# Run from the v04 folder: python -m benchmarks.aggregate_tables
+
+# Import os & tempfile
+import os
+import tempfile
+
+# Import pandas
+import pandas as pd
+
+# Import setup, aggregates & backends
+from utils.setup.setup import *
+from utils.setup.aggregates import *
+from utils.setup.backends import get_backend, cdl_data_columns
+
+# Import synthetic data generator & benchmark helpers
+from utils.setup.synthetic import generate_cdl_data
+from benchmarks.common import time_function, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Standings start date
+start_date = '2024-05-31'
+
+
+# Current approach: transfer & clean the full cdl data, then compute every summary
+def summaries_from_cdl_data(backend):
+    og_cdlDF = clean_cdl_data(backend.read_sql("SELECT * FROM cdl_data"))
+    cdlDF = filter_maps(og_cdlDF)
+    return build_series_summaries(og_cdlDF), build_team_summaries(cdlDF), build_current_standings(cdlDF, start_date)
+
+# Aggregate approach: transfer the small aggregate tables, then finish the summaries
+def summaries_from_aggregates(backend):
+    aggregates = load_aggregate_tables(backend)
+    return build_series_summaries_from_aggregates(aggregates), \
+        build_team_summaries_from_aggregates(aggregates), \
+        build_current_standings_from_aggregates(aggregates, start_date)
+
+# Function to measure the size of the tables each approach transfers, in megabytes
+def transferred_mb(backend, table_names: list):
+    return sum(
+        backend.read_sql(f"SELECT * FROM {name}").memory_usage(deep = True).sum()
+        for name in table_names
+    ) / 1024 ** 2
+
+
+if __name__ == "__main__":
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_seasons in season_counts:
+
+            # Local DuckDB database with synthetic data & fresh aggregate tables
+            backend = get_backend("duckdb", filepath = os.path.join(tmp_dir, f"cdl_{n_seasons}.duckdb"))
+            backend.write_table(generate_cdl_data(n_seasons), "cdl_data", cdl_data_columns)
+            refresh_aggregate_tables(backend)
+            aggregate_names = [f"{aggregate_prefix}{name}" for name in summary_tables]
+
+            results.append({
+                "seasons": n_seasons,
+                "full_mb": transferred_mb(backend, ["cdl_data"]),
+                "aggregate_mb": transferred_mb(backend, aggregate_names),
+                "full_ms": time_function(summaries_from_cdl_data, backend, repeat = 3),
+                "aggregate_ms": time_function(summaries_from_aggregates, backend, repeat = 3)
+            })
+
+    print_results("Series & team summaries and standings", pd.DataFrame(results))
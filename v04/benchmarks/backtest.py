@@ -0,0 +1,72 @@
+# Benchmark: backtesting stored lines, filtering the data before every line vs the as-of kills index
+# Run from the v04 folder: python -m benchmarks.backtest
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup, datagrids & backtest
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import compute_player_ou, compute_player_1_thru_3_ou
+from utils.backtest import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Lines replayed at each scale
+n_lines = 500
+
+
+# Function to build a lines history: random lines, scraped the day before random series
+def build_benchmark_lines(cdlDF, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    series = cdlDF[["player", "team_abbr", "match_id", "match_date"]] \
+        .drop_duplicates() \
+        .sample(n_lines, random_state = seed)
+    props = rng.integers(0, 4, n_lines)
+    return pd.DataFrame({
+        "scraped_at": series["match_date"].to_numpy() - pd.Timedelta(hours = 20),
+        "player": series["player"].astype(str).to_numpy(),
+        "team_abbr": series["team_abbr"].astype(str).to_numpy(),
+        "prop": props,
+        "line": np.where(props == 0, 50, 20) + rng.integers(-8, 8, n_lines) + 0.5
+    })
+
+# Previous approach: filter the data before every line's series, then compute_player_ou
+def backtest_with_filters(lines_df, cdlDF, adj_1_thru_3_totals):
+    picks = []
+    for player, prop, line, match_date in attach_lines_to_series(lines_df, cdlDF) \
+            [["player", "prop", "line", "match_date"]].itertuples(index = False, name = None):
+        if prop == 0:
+            picks.append(compute_player_1_thru_3_ou(
+                adj_1_thru_3_totals[adj_1_thru_3_totals["match_date"] < match_date], player, line
+            ))
+        else:
+            picks.append(compute_player_ou(
+                cdlDF[cdlDF["match_date"] < match_date], player, map_nums_to_gamemode[prop], line
+            ))
+    return picks
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+        lines_df = build_benchmark_lines(cdlDF)
+
+        results.append({
+            "seasons": n_seasons,
+            "lines": n_lines,
+            "filters_ms": time_function(backtest_with_filters, lines_df, cdlDF, adj_1_thru_3_totals, repeat = 1),
+            "asof_index_ms": time_function(run_backtest, lines_df, cdlDF, adj_1_thru_3_totals, repeat = 3)
+        })
+
+    results = pd.DataFrame(results)
+    results["speedup"] = results["filters_ms"] / results["asof_index_ms"]
+    print_results("Backtest of stored lines", results)
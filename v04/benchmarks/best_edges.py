@@ -0,0 +1,67 @@
+# Benchmark: ranking the whole props board, with compute_player_ou in a loop vs the board indexes
+# Run from the v04 folder: python -m benchmarks.best_edges
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup, datagrids, kills index, streaks, props board & edges
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import compute_player_ou, compute_player_1_thru_3_ou
+from utils.kills_index import build_player_kills_index, build_1_thru_3_kills_index
+from utils.streaks import build_player_ou_streak_index, build_1_thru_3_ou_streak_index
+from utils.props_board import build_board_index, prop_gamemodes
+from utils.probability import build_probability_indexes
+from utils.edges import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+
+# Previous approach: compute_player_ou for every prop, then rank by percentage
+def rank_edges_with_loop(props_df, cdlDF, adj_1_thru_3_totals):
+    rows = []
+    for player, prop, line in props_df[["player", "prop", "line"]].itertuples(index = False, name = None):
+        if prop == 0:
+            pick, percentage, *_ = compute_player_1_thru_3_ou(adj_1_thru_3_totals, player, line)
+        else:
+            pick, percentage, *_ = compute_player_ou(cdlDF, player, prop_gamemodes[prop], line)
+        if pick != "Never Played":
+            rows.append((player, prop, line, pick, int(percentage)))
+    return pd.DataFrame(rows, columns = ["player", "prop", "line", "pick", "percentage"]) \
+        .sort_values("percentage", ascending = False)
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+        data_version = compute_data_version(og_cdlDF)
+        kills_index = build_player_kills_index(cdlDF)
+        kills_1_thru_3_index = build_1_thru_3_kills_index(adj_1_thru_3_totals)
+        board_indexes = (
+            build_board_index(kills_index, build_player_ou_streak_index(cdlDF)),
+            build_board_index(kills_1_thru_3_index, build_1_thru_3_ou_streak_index(adj_1_thru_3_totals)),
+            *build_probability_indexes(kills_index, kills_1_thru_3_index, data_version)
+        )
+
+        # Board of props 0 - 3 for every rostered player, with random lines
+        props_df = build_intial_props(build_rosters(cdlDF))
+        props_df["line"] = np.random.default_rng(0).integers(5, 60, len(props_df)) + 0.5
+
+        results.append({
+            "seasons": n_seasons,
+            "props": len(props_df),
+            "loop_ms": time_function(rank_edges_with_loop, props_df, cdlDF, adj_1_thru_3_totals, repeat = 1),
+            "window_build_ms": time_function(build_recent_board_indexes, cdlDF, adj_1_thru_3_totals, 10, data_version,
+                                             repeat = 1),
+            "rank_edges_ms": time_function(rank_edges, props_df, *board_indexes, repeat = 5)
+        })
+
+    print_results("Best edges for every prop on the board", pd.DataFrame(results))
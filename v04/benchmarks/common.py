@@ -0,0 +1,31 @@
+# Import time
+import time
+
+# Import pandas
+import pandas as pd
+
+# Import setup & synthetic data generator
+from utils.setup.setup import clean_cdl_data
+from utils.setup.synthetic import generate_cdl_data
+
+
+# Function to time a function, returning the best of several runs in milliseconds
+def time_function(func, *args, repeat: int = 5, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+# Function to load cleaned synthetic cdl data for benchmarks
+# 1 season is about today's data volume, so n_seasons is the scale factor
+def load_benchmark_data(n_seasons: int = 1, seed: int = 0):
+    return clean_cdl_data(generate_cdl_data(n_seasons, seed = seed))
+
+# Function to print benchmark results as a table
+def print_results(title: str, results: pd.DataFrame):
+    print("")
+    print(title)
+    print("-" * len(title))
+    print(results.to_string(index = False, float_format = lambda x: f"{x:.2f}"))
@@ -0,0 +1,63 @@
+# Benchmark: head-to-head value boxes for every matchup, filtering cdlDF vs the head-to-head cube
+# Run from the v04 folder: python -m benchmarks.head_to_head
+
+# Import pandas
+import pandas as pd
+
+# Import setup, datagrids & head-to-head cube
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import \
+    compute_last_match, compute_h2h_map_record, compute_h2h_series_record
+from utils.head_to_head import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Gamemode looked up for every matchup
+gamemode = "Hardpoint"
+
+
+# Current approach: filter cdlDF for every value box
+def h2h_with_filters(cdlDF, matchups):
+    return [
+        (compute_last_match(cdlDF, team_x, team_y),
+         compute_h2h_series_record(cdlDF, team_x, team_y),
+         compute_h2h_map_record(cdlDF, team_x, team_y, gamemode))
+        for team_x, team_y in matchups
+    ]
+
+# Cube approach: dictionary reads
+def h2h_with_cube(h2h_cube, matchups):
+    return [
+        (query_last_match(h2h_cube, team_x, team_y),
+         query_h2h_series_record(h2h_cube, team_x, team_y),
+         query_h2h_map_record(h2h_cube, team_x, team_y, gamemode))
+        for team_x, team_y in matchups
+    ]
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        cdlDF = filter_maps(load_benchmark_data(n_seasons))
+        teams = sorted(cdlDF["team"].unique())
+        matchups = [(team_x, team_y) for team_x in teams for team_y in teams if team_x != team_y]
+
+        h2h_cube = build_h2h_cube(cdlDF)
+
+        # Both approaches must agree on every matchup
+        assert h2h_with_filters(cdlDF, matchups) == h2h_with_cube(h2h_cube, matchups)
+
+        results.append({
+            "seasons": n_seasons,
+            "matchups": len(matchups),
+            "cube_build_ms": time_function(build_h2h_cube, cdlDF, repeat = 3),
+            "filters_ms": time_function(h2h_with_filters, cdlDF, matchups, repeat = 3),
+            "cube_ms": time_function(h2h_with_cube, h2h_cube, matchups)
+        })
+
+    print_results("Head-to-head value boxes for every matchup", pd.DataFrame(results))
@@ -0,0 +1,29 @@
+# Benchmark: memory footprint of the long-lived app frames before & after the compact schema
+# Run from the v04 folder: python -m benchmarks.memory_footprint
+
+# Import pandas
+import pandas as pd
+
+# Import setup
+from utils.setup.setup import *
+from utils.setup.schema import report_memory_usage
+
+# Import benchmark helpers
+from benchmarks.common import load_benchmark_data, print_results
+
+# Seasons of data to report
+season_counts = [1, 10]
+
+
+if __name__ == "__main__":
+
+    # Build the frames app.py keeps in memory, from synthetic data
+    for n_seasons in season_counts:
+        scaled_df = load_benchmark_data(n_seasons)
+        frames = {
+            "og_cdlDF": scaled_df,
+            "cdlDF": filter_maps(scaled_df),
+            "adj_1_thru_3_totals": build_1_thru_3_totals(scaled_df),
+            "series_score_diffs": build_series_summaries(scaled_df)
+        }
+        print_results(f"Memory footprint, {n_seasons} season(s)", report_memory_usage(frames))
@@ -0,0 +1,78 @@
+# Benchmark: opponent columns via positional concat vs keyed self-join
+# Run from the v04 folder: python -m benchmarks.opponent_columns
+
+# Import pandas
+import pandas as pd
+
+# Import setup
+from utils.setup.setup import add_opponent_columns
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 5, 10, 25]
+
+
+# Function to strip opponent columns from cleaned synthetic data, to get the pipeline's input
+def get_pipeline_input(n_seasons: int):
+    cdlDF = load_benchmark_data(n_seasons) \
+        .drop(columns = ['opp', 'opp_abbr', 'opp_score', 'total_score', 'score_diff'])
+    cdlDF['player_lower'] = cdlDF['player'].str.lower()
+    return cdlDF
+
+# Previous approach: sort a copy with the team order reversed and concat it side by side
+def add_opponent_columns_concat(cdlDF_input: pd.DataFrame):
+    cdlDF = cdlDF_input.sort_values(by=['match_date', 'match_id', 'map_num', 'team', 'player_lower'])
+    cdlDF.reset_index(drop=True, inplace=True)
+    opps = cdlDF.sort_values(by=['match_date', 'match_id', 'map_num', 'team', 'player_lower'], ascending=[True, True, True, False, True]) \
+                [['team', 'team_abbr', 'team_score']] \
+                .rename(columns={'team': 'opp', 'team_abbr': 'opp_abbr', 'team_score': 'opp_score'})
+    opps.reset_index(drop=True, inplace=True)
+    return pd.concat([cdlDF, opps], axis=1)
+
+# Current approach: sort once, then join team-level opponents on match & map
+def add_opponent_columns_join(cdlDF_input: pd.DataFrame):
+    cdlDF = cdlDF_input.sort_values(by=['match_date', 'match_id', 'map_num', 'team', 'player_lower'])
+    cdlDF.reset_index(drop=True, inplace=True)
+    return add_opponent_columns(cdlDF)
+
+# Function to count rows whose opponent or opponent score differs from the expected frame
+def count_wrong_opponents(cdlDF_input: pd.DataFrame, expected_df: pd.DataFrame):
+    return int((
+        (cdlDF_input['opp'] != expected_df['opp']) | 
+        (cdlDF_input['opp_score'] != expected_df['opp_score'])
+    ).sum())
+
+
+if __name__ == "__main__":
+
+    cdlDF = get_pipeline_input(1)
+
+    # Both approaches agree on complete data
+    pd.testing.assert_frame_equal(
+        add_opponent_columns_concat(cdlDF), add_opponent_columns_join(cdlDF)
+    )
+
+    # Time both approaches as the data grows
+    results = []
+    for n_seasons in season_counts:
+        scaled_df = get_pipeline_input(n_seasons)
+        concat_ms = time_function(add_opponent_columns_concat, scaled_df)
+        join_ms = time_function(add_opponent_columns_join, scaled_df)
+        results.append({
+            "seasons": n_seasons, 
+            "rows": len(scaled_df), 
+            "concat_ms": concat_ms, 
+            "join_ms": join_ms, 
+            "speedup": concat_ms / join_ms
+        })
+    print_results("Opponent columns", pd.DataFrame(results))
+
+    # Drop one player row from the first map: the concat approach shifts every later row
+    expected_df = add_opponent_columns_join(cdlDF).drop(index = 0).reset_index(drop = True)
+    incomplete_df = cdlDF.drop(index = cdlDF.index[0])
+    print("")
+    print(f"Rows with a wrong opponent after dropping one of {len(cdlDF)} player rows")
+    print(f"concat: {count_wrong_opponents(add_opponent_columns_concat(incomplete_df), expected_df)}")
+    print(f"join:   {count_wrong_opponents(add_opponent_columns_join(incomplete_df), expected_df)}")
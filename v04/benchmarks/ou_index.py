@@ -0,0 +1,64 @@
+# Benchmark: O/U for a whole board of player props, scanning cdlDF vs the sorted kills index
+# Run from the v04 folder: python -m benchmarks.ou_index
+
+# Import pandas
+import pandas as pd
+
+# Import setup, datagrids & kills index
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import compute_player_ou, compute_player_1_thru_3_ou
+from utils.kills_index import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Dictionary to map prop (map_num) to gamemode
+props_to_gamemode = {1: "Hardpoint", 2: "Search & Destroy", 3: "Control"}
+
+
+# Current approach: boolean-mask scans of the full frames for every prop
+def evaluate_board_with_scans(cdlDF, adj_1_thru_3_totals, player_props):
+    return [
+        compute_player_1_thru_3_ou(adj_1_thru_3_totals, player, line) if prop == 0 else
+        compute_player_ou(cdlDF, player, props_to_gamemode[prop], line)
+        for player, prop, line in player_props[["player", "prop", "line"]].itertuples(index = False)
+    ]
+
+# Index approach: two binary searches per prop
+def evaluate_board_with_index(kills_index, kills_1_thru_3_index, player_props):
+    return [
+        query_player_1_thru_3_ou(kills_1_thru_3_index, player, line) if prop == 0 else
+        query_player_ou(kills_index, player, props_to_gamemode[prop], line)
+        for player, prop, line in player_props[["player", "prop", "line"]].itertuples(index = False)
+    ]
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+        player_props = build_intial_props(build_rosters(cdlDF))
+
+        kills_index = build_player_kills_index(cdlDF)
+        kills_1_thru_3_index = build_1_thru_3_kills_index(adj_1_thru_3_totals)
+
+        # Both approaches must agree on every prop
+        assert evaluate_board_with_scans(cdlDF, adj_1_thru_3_totals, player_props) == \
+            evaluate_board_with_index(kills_index, kills_1_thru_3_index, player_props)
+
+        results.append({
+            "seasons": n_seasons,
+            "props": len(player_props),
+            "index_build_ms": time_function(build_player_kills_index, cdlDF, repeat = 3) + \
+                time_function(build_1_thru_3_kills_index, adj_1_thru_3_totals, repeat = 3),
+            "scan_board_ms": time_function(evaluate_board_with_scans, cdlDF, adj_1_thru_3_totals, player_props, repeat = 3),
+            "index_board_ms": time_function(evaluate_board_with_index, kills_index, kills_1_thru_3_index, player_props)
+        })
+
+    print_results("O/U for every player prop", pd.DataFrame(results))
@@ -0,0 +1,67 @@
+# Benchmark: over/under probabilities of the whole props board, bootstrapped prop by prop vs the batched engine
+# Run from the v04 folder: python -m benchmarks.probability
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup, kills index, props board & probability engine
+from utils.setup.setup import *
+from utils.kills_index import build_player_kills_index, build_1_thru_3_kills_index, all_maps
+from utils.props_board import prop_gamemodes
+from utils.probability import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+
+# Naive approach: resample every prop's kills with replacement, one prop at a time
+def bootstrap_props_with_loop(props_df, kills_index, kills_1_thru_3_index, seed = 0):
+    rng = np.random.default_rng(seed)
+    p_overs = []
+    for player, prop, line in props_df[["player", "prop", "line"]].itertuples(index = False, name = None):
+        kills = kills_1_thru_3_index.get(player) if prop == 0 \
+            else kills_index.get((player, prop_gamemodes[prop], all_maps))
+        if kills is None or len(kills) == 0:
+            p_overs.append(np.nan)
+            continue
+        p_overs.append((rng.choice(kills, n_samples) > line).mean())
+    return np.array(p_overs)
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        kills_index = build_player_kills_index(cdlDF)
+        kills_1_thru_3_index = build_1_thru_3_kills_index(build_1_thru_3_totals(og_cdlDF))
+        data_version = compute_data_version(og_cdlDF)
+        probability_indexes = build_probability_indexes(kills_index, kills_1_thru_3_index, data_version)
+
+        # Board of props 0 - 3 for every rostered player, with random lines
+        props_df = build_intial_props(build_rosters(cdlDF))
+        props_df["line"] = np.random.default_rng(0).integers(5, 60, len(props_df)) + 0.5
+
+        # Largest gap between the bootstrap & the model, in percentage points
+        p_overs = estimate_props_board(props_df, *probability_indexes)["p_over"].to_numpy()
+        max_gap = np.nanmax(np.abs(bootstrap_props_with_loop(props_df, kills_index, kills_1_thru_3_index) - p_overs))
+
+        results.append({
+            "seasons": n_seasons,
+            "props": len(props_df),
+            "max_gap_pct": max_gap * 100,
+            "loop_ms": time_function(bootstrap_props_with_loop, props_df, kills_index, kills_1_thru_3_index,
+                                     repeat = 3),
+            "index_build_ms": time_function(build_probability_indexes, kills_index, kills_1_thru_3_index,
+                                            data_version, repeat = 1),
+            "batched_ms": time_function(estimate_props_board, props_df, *probability_indexes, repeat = 5)
+        })
+
+    results = pd.DataFrame(results)
+    results["speedup"] = results["loop_ms"] / results["batched_ms"]
+    print_results("Over/under probabilities of the props board", results)
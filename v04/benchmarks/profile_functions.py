@@ -0,0 +1,106 @@
+# Benchmark: profile the setup, datagrid/value box & plot functions at 1x, 10x and 100x today's data
+# Run from the v04 folder: python -m benchmarks.profile_functions
+
+# Import pandas
+import pandas as pd
+
+# Import setup, datagrids & value boxes, and plots
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import *
+from utils.plots import *
+
+# Import synthetic data generator & benchmark helpers
+from utils.setup.synthetic import generate_cdl_data
+from benchmarks.common import time_function, print_results
+
+# Seasons of data to profile, ie. 1x, 10x and 100x today's volume
+season_counts = [1, 10, 100]
+
+# Runs per function at each scale
+repeats = {1: 5, 10: 3, 100: 1}
+
+# Inputs shared by every profiled function
+gamemode = "Hardpoint"
+kills_line = 22.5
+series_line = 60.5
+team_x_color, team_y_color = "#2fa4e7", "#1b6ead"
+
+
+# Function to build the frames app.py builds at startup
+def build_app_frames(raw_df: pd.DataFrame):
+    og_cdlDF = clean_cdl_data(raw_df)
+    cdlDF = filter_maps(og_cdlDF)
+    return {
+        "og_cdlDF": og_cdlDF,
+        "cdlDF": cdlDF,
+        "adj_1_thru_3_totals": build_1_thru_3_totals(og_cdlDF),
+        "series_score_diffs": build_series_summaries(og_cdlDF),
+        "team_summaries_DF": build_team_summaries(cdlDF),
+        "rostersDF": build_rosters(cdlDF)
+    }
+
+# Function to list the profiled calls by module, as (name, function, args)
+def get_profiled_calls(raw_df: pd.DataFrame, frames: dict):
+    cdlDF = frames["cdlDF"]
+    adj_1_thru_3_totals = frames["adj_1_thru_3_totals"]
+    series_score_diffs = frames["series_score_diffs"]
+
+    # Most common matchup, and a player from its first team
+    team_x, team_y = cdlDF[["team", "opp"]].value_counts().index[0]
+    icon_x, icon_y = team_icons[team_x], team_icons[team_y]
+    player = cdlDF[cdlDF["team"] == team_x]["player"].iloc[0]
+
+    return {
+        "setup.py": [
+            ("clean_cdl_data", clean_cdl_data, (raw_df, )),
+            ("filter_maps", filter_maps, (frames["og_cdlDF"], )),
+            ("build_1_thru_3_totals", build_1_thru_3_totals, (frames["og_cdlDF"], )),
+            ("build_series_summaries", build_series_summaries, (frames["og_cdlDF"], )),
+            ("build_team_summaries", build_team_summaries, (cdlDF, )),
+            ("build_rosters", build_rosters, (cdlDF, ))
+        ],
+        "datagrids_and_value_boxes.py": [
+            ("compute_last_match", compute_last_match, (cdlDF, team_x, team_y)),
+            ("build_scoreboards", build_scoreboards, (cdlDF, team_x, team_y)),
+            ("compute_win_streak", compute_win_streak, (cdlDF, team_x, gamemode)),
+            ("compute_h2h_map_record", compute_h2h_map_record, (cdlDF, team_x, team_y, gamemode)),
+            ("compute_h2h_series_record", compute_h2h_series_record, (cdlDF, team_x, team_y)),
+            ("compute_player_ou", compute_player_ou, (cdlDF, player, gamemode, kills_line)),
+            ("compute_player_ou_streak", compute_player_ou_streak, (cdlDF, player, gamemode, kills_line)),
+            ("compute_player_1_thru_3_ou", compute_player_1_thru_3_ou, (adj_1_thru_3_totals, player, series_line)),
+            ("compute_player_1_thru_3_ou_streak", compute_player_1_thru_3_ou_streak, (adj_1_thru_3_totals, player, series_line)),
+            ("display_matches", display_matches, (cdlDF, ))
+        ],
+        "plots.py": [
+            ("team_score_diffs", team_score_diffs, (cdlDF, team_x, team_x_color, gamemode)),
+            ("team_percent_maps_played", team_percent_maps_played, (frames["team_summaries_DF"], team_x, gamemode)),
+            ("team_series_diffs", team_series_diffs, (series_score_diffs, team_x, team_x_color)),
+            ("player_kills_vs_time", player_kills_vs_time, (cdlDF, player, team_x_color, gamemode, kills_line)),
+            ("player_kills_vs_score_diff", player_kills_vs_score_diff, (cdlDF, player, team_x_color, gamemode, kills_line)),
+            ("player_1_thru_3_kills_vs_time", player_1_thru_3_kills_vs_time, (adj_1_thru_3_totals, player, team_x_color, series_line)),
+            ("player_kills_by_map", player_kills_by_map, (cdlDF, player, gamemode, kills_line)),
+            ("player_kills_by_mapset", player_kills_by_mapset, (cdlDF, player)),
+            ("score_diffs_ridge", score_diffs_ridge, (cdlDF, icon_x, icon_y, team_x_color, team_y_color, gamemode)),
+            ("series_diff_ridge", series_diff_ridge, (series_score_diffs, icon_x, icon_y, team_x_color, team_y_color))
+        ]
+    }
+
+
+if __name__ == "__main__":
+
+    # Time every function at every scale, in milliseconds
+    timings = {}
+    for n_seasons in season_counts:
+        raw_df = generate_cdl_data(n_seasons)
+        frames = build_app_frames(raw_df)
+        print(f"{n_seasons}x: {len(raw_df)} rows")
+        for module, calls in get_profiled_calls(raw_df, frames).items():
+            for name, func, args in calls:
+                timings.setdefault(module, {}).setdefault(name, {})[f"{n_seasons}x_ms"] = \
+                    time_function(func, *args, repeat = repeats[n_seasons])
+
+    # One table per module
+    for module, module_timings in timings.items():
+        results = pd.DataFrame.from_dict(module_timings, orient = "index") \
+            .rename_axis("function").reset_index()
+        print_results(module, results)
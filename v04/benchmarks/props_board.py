@@ -0,0 +1,90 @@
+# Benchmark: O/U stats & streaks of every prop on the board, queried card by card vs evaluated in one pass
+# Run from the v04 folder: python -m benchmarks.props_board
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup, datagrids, kills index, streaks & props board
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import \
+    compute_player_ou, compute_player_ou_streak, compute_player_1_thru_3_ou, compute_player_1_thru_3_ou_streak
+from utils.kills_index import *
+from utils.streaks import *
+from utils.props_board import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+
+# Original approach: every player card filters the cdl data for its own row
+def props_by_filters(props_df, cdlDF, adj_1_thru_3_totals):
+    results = []
+    for player, prop, line in props_df[["player", "prop", "line"]].itertuples(index = False, name = None):
+        if prop == 0:
+            results.append((compute_player_1_thru_3_ou(adj_1_thru_3_totals, player, line),
+                            compute_player_1_thru_3_ou_streak(adj_1_thru_3_totals, player, line)))
+        else:
+            results.append((compute_player_ou(cdlDF, player, prop_gamemodes[prop], line),
+                            compute_player_ou_streak(cdlDF, player, prop_gamemodes[prop], line)))
+    return results
+
+# Indexed approach: every player card queries its own row from the kills & streak indexes
+def props_by_card(props_df, kills_index, ou_streak_index, kills_1_thru_3_index, ou_1_thru_3_streak_index):
+    results = []
+    for player, prop, line in props_df[["player", "prop", "line"]].itertuples(index = False, name = None):
+        if prop == 0:
+            results.append((query_player_1_thru_3_ou(kills_1_thru_3_index, player, line),
+                            query_player_1_thru_3_ou_streak(ou_1_thru_3_streak_index, player, line)))
+        else:
+            results.append((query_player_ou(kills_index, player, prop_gamemodes[prop], line),
+                            query_player_ou_streak(ou_streak_index, player, prop_gamemodes[prop], line)))
+    return results
+
+# Props board: one pass over the whole board
+def props_by_board(props_df, board_index, board_1_thru_3_index):
+    return build_props_board_lookup(evaluate_props_board(props_df, board_index, board_1_thru_3_index))
+
+# Function to build both board indexes
+def build_board_indexes(kills_index, ou_streak_index, kills_1_thru_3_index, ou_1_thru_3_streak_index):
+    return build_board_index(kills_index, ou_streak_index), \
+        build_board_index(kills_1_thru_3_index, ou_1_thru_3_streak_index)
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+        indexes = (build_player_kills_index(cdlDF), build_player_ou_streak_index(cdlDF),
+                   build_1_thru_3_kills_index(adj_1_thru_3_totals), build_1_thru_3_ou_streak_index(adj_1_thru_3_totals))
+
+        # Board of props 0 - 3 for every rostered player, with random lines
+        props_df = build_intial_props(build_rosters(cdlDF))
+        props_df["line"] = np.random.default_rng(0).integers(5, 60, len(props_df)) + 0.5
+
+        board_indexes = build_board_indexes(*indexes)
+
+        # Both approaches must agree on every prop
+        board = props_by_board(props_df, *board_indexes)
+        for (player, prop), (ou_stats, ou_streak) in zip(props_df[["player", "prop"]].itertuples(index = False, name = None),
+                                                         props_by_card(props_df, *indexes)):
+            assert query_board_ou(board, player, prop) == ou_stats
+            assert query_board_ou_streak(board, player, prop) == (ou_streak[0], str(ou_streak[1]))
+
+        results.append({
+            "seasons": n_seasons,
+            "props": len(props_df),
+            "filters_ms": time_function(props_by_filters, props_df, cdlDF, adj_1_thru_3_totals, repeat = 1),
+            "by_card_ms": time_function(props_by_card, props_df, *indexes, repeat = 5),
+            "board_index_build_ms": time_function(build_board_indexes, *indexes, repeat = 3),
+            "board_ms": time_function(props_by_board, props_df, *board_indexes, repeat = 5)
+        })
+
+    results = pd.DataFrame(results)
+    print_results("O/U stats & streaks of every prop", results)
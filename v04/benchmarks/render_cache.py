@@ -0,0 +1,73 @@
+# Benchmark: rendering plots with matplotlib vs serving them from the render cache
+# Run from the v04 folder: python -m benchmarks.render_cache
+
+# Import partial
+from functools import partial
+
+# Import pandas
+import pandas as pd
+
+# Import setup, plots & render cache
+from utils.setup.setup import *
+from utils.plots import *
+from utils.render_cache import RenderCache
+from utils.render_pool import render_plot
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Output size of the plots, as (width, height, pixelratio)
+output_size = (400, 300, 1)
+
+# Team colors of the plots
+team_a_color, team_b_color = "#2fa4e7", "#1b6ead"
+
+
+# Function to get a plot from the cache, rendering & caching it on a miss, as cached_plot does
+def get_cached_plot(plot_cache: RenderCache, request):
+    key = plot_cache.make_key(request.func, request.args, request.keywords, output_size)
+    img = plot_cache.get(key)
+    if img is None:
+        img = render_plot(request, output_size[:2], output_size[2])
+        plot_cache.put(key, img)
+    return img
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        series_score_diffs = build_series_summaries(og_cdlDF)
+        team_summaries_DF = build_team_summaries(cdlDF)
+        team_x, team_y = cdlDF[["team", "opp"]].value_counts().index[0]
+        player = cdlDF["player"].value_counts().index[0]
+
+        requests = {
+            "score_diffs_ridge": partial(score_diffs_ridge, cdlDF, team_icons[team_x], team_icons[team_y],
+                                         team_a_color, team_b_color, "Hardpoint"),
+            "series_diff_ridge": partial(series_diff_ridge, series_score_diffs, team_icons[team_x],
+                                         team_icons[team_y], team_a_color, team_b_color),
+            "team_percent_maps_played": partial(team_percent_maps_played, team_summaries_DF, team_x, "Hardpoint"),
+            "player_kills_vs_time": partial(player_kills_vs_time, cdlDF, player, team_a_color, "Hardpoint", 22.5)
+        }
+
+        for name, request in requests.items():
+            plot_cache = RenderCache()
+            plot_cache.set_data_version(compute_data_version(og_cdlDF))
+            get_cached_plot(plot_cache, request)
+            results.append({
+                "seasons": n_seasons,
+                "plot": name,
+                "kb": len(get_cached_plot(plot_cache, request)["src"]) * 3 / 4 / 1024,
+                "render_ms": time_function(render_plot, request, output_size[:2], output_size[2], repeat = 3),
+                "cache_hit_ms": time_function(get_cached_plot, plot_cache, request, repeat = 20)
+            })
+
+    results = pd.DataFrame(results)
+    results["speedup"] = results["render_ms"] / results["cache_hit_ms"]
+    print_results("Plot renders vs render cache hits", results)
@@ -0,0 +1,85 @@
+# Benchmark: rendering plots on the event loop vs in the render pool, while other sessions wait on the loop
+# Run from the v04 folder: python -m benchmarks.render_pool
+
+# Import time, asyncio & partial
+import time
+import asyncio
+from functools import partial
+
+# Import pandas
+import pandas as pd
+
+# Import setup, plots & render pool
+from utils.setup.setup import *
+from utils.plots import *
+from utils.render_pool import RenderPool, render_plot
+
+# Import benchmark helpers
+from benchmarks.common import load_benchmark_data, print_results
+
+# Plots requested at once, as if by that many sessions
+concurrent_counts = [1, 4, 8]
+
+# Worker processes of the render pool
+n_workers = 2
+
+# Output size of the plots, as (width, height, pixelratio)
+output_size = (400, 300, 1)
+
+# Seconds between the ticks of the probe standing in for other sessions' work on the event loop
+tick_s = 0.01
+
+
+# Function to render plots on the event loop, as before the render pool
+async def render_on_loop(request, output_size: tuple, pixelratio: float = 1):
+    return render_plot(request, output_size, pixelratio)
+
+
+# Function to render plots at once with a render function, ie. a render pool's, while a probe ticks on the event loop
+# Returns the seconds until every plot is rendered, and the longest the probe waited past its tick
+async def render_with_probe(render, requests: list):
+    stalls = []
+    rendering = True
+
+    async def probe():
+        while rendering:
+            start = time.perf_counter()
+            await asyncio.sleep(tick_s)
+            stalls.append(time.perf_counter() - start - tick_s)
+
+    probe_task = asyncio.ensure_future(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*[render(request, output_size[:2], output_size[2]) for request in requests])
+    elapsed = time.perf_counter() - start
+    rendering = False
+    await probe_task
+    return elapsed, max(stalls, default = elapsed)
+
+
+if __name__ == "__main__":
+
+    og_cdlDF = load_benchmark_data(1)
+    cdlDF = filter_maps(og_cdlDF)
+    players = cdlDF["player"].value_counts().index
+
+    # Pools that are not started render in threads of the app's process, as while the workers start
+    thread_pool = RenderPool(n_workers = n_workers)
+    worker_pool = RenderPool(n_workers = n_workers)
+    worker_pool.start({"cdlDF": cdlDF})
+
+    async def main():
+        results = []
+        for n_plots in concurrent_counts:
+            requests = [partial(player_kills_vs_score_diff, cdlDF, player, "#2fa4e7", "Hardpoint", 22.5)
+                        for player in players[:n_plots]]
+            for name, render in [("event loop", render_on_loop), ("threads", thread_pool.render),
+                                 ("render pool", worker_pool.render)]:
+                await render_with_probe(render, requests[:1])
+                elapsed, stall = await render_with_probe(render, requests)
+                results.append({"plots": n_plots, "rendered in": name,
+                                "total_ms": elapsed * 1000, "max_stall_ms": stall * 1000})
+        return pd.DataFrame(results)
+
+    results = asyncio.run(main())
+    worker_pool.shutdown()
+    print_results("Player score differential plots, rendered at once", results)
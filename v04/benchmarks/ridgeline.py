@@ -0,0 +1,127 @@
+# Benchmark: ridgeline plots drawn with seaborn's histplot vs bars counted with NumPy
+# Run from the v04 folder: python -m benchmarks.ridgeline
+
+# Import partial
+from functools import partial
+
+# Import pandas
+import pandas as pd
+
+# Import setup, plots & render pool
+from utils.setup.setup import *
+from utils.plots import *
+from utils.render_pool import render_plot
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Output size of the plots, as (width, height, pixelratio)
+output_size = (600, 400, 1)
+
+# Team colors of the plots
+team_a_color, team_b_color = "#2fa4e7", "#1b6ead"
+
+
+# Previous ridgelines, which drew each team's row with seaborn's histplot
+# and binned the score diffs again with pd.cut for the height of the team names
+def score_diffs_ridge_with_histplot(
+        cdlDF_input: pd.DataFrame, team_icon_x: str, team_icon_y: str,
+        x_color: str, y_color: str, gamemode_input: str, map_input = "All"
+):
+    queried_df = cdlDF_input[
+        ((cdlDF_input['team_icon'] == team_icon_x) | (cdlDF_input['team_icon'] == team_icon_y)) &
+        (cdlDF_input['gamemode'] == gamemode_input)
+    ][['match_id', 'team_icon', 'map_name', 'score_diff']].drop_duplicates()
+    teams = [team_icon_x, team_icon_y]
+    colors = [x_color, y_color]
+
+    with plot_style("white", transparent_rc):
+        fig, axs = create_ridge_figure()
+        for ax, team, color in zip(axs, teams, colors):
+            team_df = queried_df[queried_df['team_icon'] == team]
+            if gamemode_input == "Hardpoint":
+                sns.histplot(team_df, x = "score_diff", binwidth = 50, binrange = (-300, 250), 
+                             alpha = 0.9, color = color, ax = ax)
+            else:
+                sns.histplot(team_df, x = "score_diff", discrete = True, 
+                             binrange = gamemode_bin_ranges[gamemode_input], 
+                             alpha = 0.9, color = color, ax = ax)
+            ax.axhline(y = 0, color = color, lw = 2, clip_on = False)
+
+        if gamemode_input == "Hardpoint":
+            queried_df['bin'] = pd.cut(queried_df['score_diff'], bins = range(-250, 300, 50))
+            max_y = max(queried_df[['bin', "team_icon"]].value_counts())
+        else:
+            max_y = 0 if queried_df.empty else max(queried_df[["score_diff", "team_icon"]].value_counts())
+
+        for ax, team, color in zip(axs, teams, colors):
+            ax.text(min_x_values_by_gamemode[gamemode_input], max_y * 0.05, team, family = "Segoe UI", 
+                    fontweight ='bold', fontsize = 15, color = color)
+        for ax in axs:
+            ax.set(yticks = [], ylabel = "", xlabel = "", xticks = gamemode_xticks[gamemode_input])
+            ax.tick_params(labelfontfamily = "Segoe UI")
+        sns.despine(fig = fig, bottom = True, left = True)
+    return fig
+
+def series_diff_ridge_with_histplot(
+        series_score_diffs_input: pd.DataFrame, team_icon_x: str, team_icon_y: str, x_color: str, y_color: str
+):
+    queried_df = series_score_diffs_input[
+        (series_score_diffs_input["team_icon"] == team_icon_x) |
+        (series_score_diffs_input["team_icon"] == team_icon_y)
+    ]
+    min_x = -6.75 if team_icon_x == "TOR" or team_icon_y == "TOR" else -6
+
+    with plot_style("white", transparent_rc):
+        fig, axs = create_ridge_figure()
+        for ax, team, color in zip(axs, [team_icon_x, team_icon_y], [x_color, y_color]):
+            sns.histplot(queried_df[queried_df["team_icon"] == team], x = "series_score_diff", 
+                         discrete = True, binrange = (-5, 3), alpha = 0.9, color = color, ax = ax)
+            ax.axhline(y = 0, color = color, lw = 2, clip_on = False)
+            ax.text(min_x, 0.45, team, family = "Segoe UI", fontweight ='bold', fontsize = 15, color = color)
+        for ax in axs:
+            ax.set(xticks = [-3, 0, 3], yticks = [], ylabel = "", xlabel = "")
+            ax.tick_params(labelfontfamily = "Segoe UI")
+        sns.despine(fig = fig, bottom = True, left = True)
+    return fig
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        series_score_diffs = build_series_summaries(og_cdlDF)
+        team_x, team_y = cdlDF[["team", "opp"]].value_counts().index[0]
+        teams = (team_icons[team_x], team_icons[team_y], team_a_color, team_b_color)
+
+        plots = [
+            (f"score_diffs_ridge ({gamemode})", score_diffs_ridge_with_histplot, score_diffs_ridge,
+             (cdlDF, *teams, gamemode))
+            for gamemode in ["Hardpoint", "Search & Destroy"]
+        ] + [
+            ("series_diff_ridge", series_diff_ridge_with_histplot, series_diff_ridge, (series_score_diffs, *teams))
+        ]
+
+        for name, with_histplot, with_numpy, args in plots:
+
+            # Drawing the figure, then rendering it to a PNG as the app does
+            results.append({
+                "seasons": n_seasons,
+                "plot": name,
+                "histplot_draw_ms": time_function(with_histplot, *args),
+                "numpy_draw_ms": time_function(with_numpy, *args),
+                "histplot_render_ms": time_function(render_plot, partial(with_histplot, *args),
+                                                    output_size[:2], output_size[2], repeat = 3),
+                "numpy_render_ms": time_function(render_plot, partial(with_numpy, *args),
+                                                 output_size[:2], output_size[2], repeat = 3)
+            })
+
+    results = pd.DataFrame(results)
+    results["draw_speedup"] = results["histplot_draw_ms"] / results["numpy_draw_ms"]
+    results["render_speedup"] = results["histplot_render_ms"] / results["numpy_render_ms"]
+    print_results("Ridgeline plots, histplot vs NumPy bars", results)
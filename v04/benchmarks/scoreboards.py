@@ -0,0 +1,84 @@
+# Benchmark: build_scoreboards with the per-match iterrows/concat loop vs the keyed merge
+# Run from the v04 folder: python -m benchmarks.scoreboards
+
+# Import pandas
+import pandas as pd
+
+# Import setup & datagrids
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import build_scoreboards
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10, 100]
+
+# Runs per approach at each scale
+repeats = {1: 5, 10: 3, 100: 1}
+
+# Inputs of the page 1 & page 2 scoreboards
+page_inputs = {"page 1": ("Hardpoint", "All"), "page 2": ("All", "All")}
+
+
+# Previous build_scoreboards, which appended each match's opponent rows with pd.concat in a loop
+# and paired them with the team's rows by position
+def build_scoreboards_with_loop(
+        cdlDF_input: pd.DataFrame, team_x: str, team_y: str, gamemode_input = "All", map_input = "All"
+    ):
+    cdlDF_copy = cdlDF_input.copy()
+    if map_input != "All":
+        cdlDF_copy = cdlDF_copy[cdlDF_copy['map_name'] == map_input]
+    if gamemode_input != "All":
+        cdlDF_copy = cdlDF_copy[cdlDF_copy['gamemode'] == gamemode_input]
+
+    columns = ["match_date", "match_id", "gamemode", "map_name", "map_num",
+               "team_abbr", "player", "kills", "deaths", "score_diff", "opp_abbr"]
+    scoreboards = pd.concat([
+        cdlDF_copy[cdlDF_copy["team"] == team_x][columns],
+        cdlDF_copy[(cdlDF_copy["team"] == team_y) & (cdlDF_copy["opp"] != team_x)][columns]
+    ], axis = 0) \
+        .sort_values(by = ["match_date", "match_id", "map_num"], ascending = [False, False, True]) \
+        .reset_index(drop = True)
+
+    matches = scoreboards[["match_id", "opp_abbr"]].drop_duplicates().reset_index(drop = True)
+    opponents = pd.DataFrame()
+    for index, row in matches.iterrows():
+        opponents = pd.concat([
+            opponents,
+            cdlDF_copy[
+                (cdlDF_copy["match_id"] == row["match_id"]) &
+                (cdlDF_copy["team_abbr"] == row["opp_abbr"])
+            ][["match_date", "match_id", "map_num", "player", "kills", "deaths"]]
+        ], axis = 0)
+    opponents = opponents \
+        .sort_values(by = ["match_date", "match_id", "map_num"], ascending = [False, False, True]) \
+        .reset_index(drop = True) \
+        .rename(columns = {"player": "Player ", "kills": "Kills ", "deaths": "Deaths "})
+
+    return pd.concat([scoreboards, opponents.drop(["match_date", "match_id", "map_num"], axis = 1)], axis = 1)
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        cdlDF = filter_maps(load_benchmark_data(n_seasons))
+
+        # Most common matchup
+        team_x, team_y = cdlDF[["team", "opp"]].value_counts().index[0]
+
+        for page, (gamemode, map_name) in page_inputs.items():
+            results.append({
+                "seasons": n_seasons,
+                "scoreboard": page,
+                "rows": len(build_scoreboards(cdlDF, team_x, team_y, gamemode, map_name)),
+                "loop_ms": time_function(build_scoreboards_with_loop, cdlDF, team_x, team_y, gamemode, map_name,
+                                         repeat = repeats[n_seasons]),
+                "merge_ms": time_function(build_scoreboards, cdlDF, team_x, team_y, gamemode, map_name,
+                                          repeat = repeats[n_seasons])
+            })
+
+    results = pd.DataFrame(results)
+    results["speedup"] = results["loop_ms"] / results["merge_ms"]
+    print_results("Scoreboards", results)
@@ -0,0 +1,67 @@
+# Benchmark: win & O/U streaks for every value box, with row loops vs the run-length streak engine
+# Run from the v04 folder: python -m benchmarks.streaks
+
+# Import pandas
+import pandas as pd
+
+# Import setup, datagrids & streaks
+from utils.setup.setup import *
+from utils.datagrids_and_value_boxes import \
+    compute_win_streak, compute_player_ou_streak, compute_player_1_thru_3_ou_streak
+from utils.streaks import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10]
+
+# Gamemodes & lines looked up for every team & player
+gamemodes = ["Hardpoint", "Search & Destroy", "Control"]
+kills_line = 22.5
+series_line = 60.5
+
+
+# Current approach: filter, sort & loop over rows for every streak
+def streaks_with_loops(cdlDF, adj_1_thru_3_totals, teams, players):
+    return [compute_win_streak(cdlDF, team, gamemode) for team in teams for gamemode in gamemodes] + \
+        [compute_player_ou_streak(cdlDF, player, gamemode, kills_line) for player in players for gamemode in gamemodes] + \
+        [compute_player_1_thru_3_ou_streak(adj_1_thru_3_totals, player, series_line) for player in players]
+
+# Streak engine: dictionary reads & one binary search per O/U streak
+def streaks_with_engine(win_streaks, ou_streak_index, ou_1_thru_3_streak_index, teams, players):
+    return [query_win_streak(win_streaks, team, gamemode) for team in teams for gamemode in gamemodes] + \
+        [query_player_ou_streak(ou_streak_index, player, gamemode, kills_line) for player in players for gamemode in gamemodes] + \
+        [query_player_1_thru_3_ou_streak(ou_1_thru_3_streak_index, player, series_line) for player in players]
+
+# Function to build every streak index
+def build_streak_engine(cdlDF, adj_1_thru_3_totals):
+    return build_win_streaks(cdlDF), build_player_ou_streak_index(cdlDF), \
+        build_1_thru_3_ou_streak_index(adj_1_thru_3_totals)
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+        adj_1_thru_3_totals = build_1_thru_3_totals(og_cdlDF)
+        rostersDF = build_rosters(cdlDF)
+        teams, players = rostersDF["team"].unique(), rostersDF["player"].to_list()
+
+        engine = build_streak_engine(cdlDF, adj_1_thru_3_totals)
+
+        # Both approaches must agree on every streak
+        assert streaks_with_loops(cdlDF, adj_1_thru_3_totals, teams, players) == \
+            streaks_with_engine(*engine, teams, players)
+
+        results.append({
+            "seasons": n_seasons,
+            "streaks": len(teams) * len(gamemodes) + len(players) * (len(gamemodes) + 1),
+            "engine_build_ms": time_function(build_streak_engine, cdlDF, adj_1_thru_3_totals, repeat = 3),
+            "loops_ms": time_function(streaks_with_loops, cdlDF, adj_1_thru_3_totals, teams, players, repeat = 3),
+            "engine_ms": time_function(streaks_with_engine, *engine, teams, players)
+        })
+
+    print_results("Win & O/U streaks for every team & player", pd.DataFrame(results))
@@ -0,0 +1,104 @@
+# Benchmark: team summaries, series summaries & standings with lambda aggregations vs native aggregations
+# Run from the v04 folder: python -m benchmarks.summaries
+
+# Import pandas
+import pandas as pd
+
+# Import setup
+from utils.setup.setup import *
+
+# Import benchmark helpers
+from benchmarks.common import time_function, load_benchmark_data, print_results
+
+# Seasons of data to benchmark
+season_counts = [1, 10, 100]
+
+# Runs per function at each scale
+repeats = {1: 5, 10: 3, 100: 1}
+
+# Standings start date
+start_date = '2024-05-31'
+
+
+# Previous summaries, which aggregated with Python lambdas
+# and built the team, mode & map grid with iterrows
+def count_team_records_with_lambdas(team_maps: pd.DataFrame, keys: list):
+    return team_maps \
+        .groupby(keys, observed = True) \
+        .agg(
+            wins = ("map_result", lambda x: sum(x)),
+            losses = ("map_result", lambda x: len(x) - sum(x)),
+            total = ("map_result", lambda x: len(x)),
+            win_percentage = ("map_result", lambda x: round(sum(x) / len(x), 2))
+        ) \
+        .reset_index()
+
+def build_team_summaries_with_lambdas(cdlDF_input: pd.DataFrame):
+    team_maps = cdlDF_input[["match_id", "team", "team_icon", "map_name", "gamemode", "map_result"]] \
+        .drop_duplicates()
+    top = count_team_records_with_lambdas(team_maps, ["team", "team_icon", "gamemode", "map_name"])
+    bottom = count_team_records_with_lambdas(team_maps, ["team", "team_icon", "gamemode"])
+
+    map_and_mode_combos = top[["gamemode", "map_name"]].drop_duplicates().sort_values(["gamemode", "map_name"]).reset_index(drop = True)
+    all_combinations = pd.DataFrame(
+        [(team, gamemode, map_name) for team in sorted(top['team'].unique()) for _, (gamemode, map_name) in map_and_mode_combos.iterrows()],
+        columns = ['team', 'gamemode', 'map_name']
+    )
+    top = pd.merge(top, all_combinations, on = ['team', 'gamemode', 'map_name'], how = "right") \
+        .fillna({"wins": 0, "losses": 0, "total": 0, "win_percentage": 0})
+    top['team_icon'] = top['team'].map(team_icons)
+    bottom.insert(3, "map_name", "Overall")
+    return pd.concat([top, bottom], ignore_index = True)
+
+def build_series_summaries_with_lambdas(cdlDF_input: pd.DataFrame):
+    series_score_diffs = \
+        cdlDF_input[["match_id", "match_date", "team", "team_icon", "map_num", "gamemode", "map_result"]] \
+        .drop_duplicates() \
+        .groupby(["match_id", "team", "team_icon"], observed = True) \
+        .agg(
+            map_wins = ("map_result", lambda x: sum(x)),
+            map_losses = ("map_result", lambda x: len(x) - sum(x)),
+        ) \
+        .reset_index()
+    series_score_diffs = pd.merge(
+        series_score_diffs, cdlDF_input[["match_date", "match_id"]].drop_duplicates(), how = "left", on = "match_id"
+    )
+    return summarize_series_results(series_score_diffs)
+
+def build_current_standings_with_lambdas(cdlDF_input: pd.DataFrame, start_date: str):
+    return cdlDF_input[(cdlDF_input["match_date"] >= start_date)] \
+        [["match_id", "team", "series_result"]] \
+        .drop_duplicates() \
+        .groupby("team", observed = True) \
+        .agg(
+            wins = ("series_result", lambda x: sum(x)),
+            losses = ("series_result", lambda x: len(x) - sum(x))
+        ) \
+        .reset_index()
+
+
+if __name__ == "__main__":
+
+    results = []
+    for n_seasons in season_counts:
+        og_cdlDF = load_benchmark_data(n_seasons)
+        cdlDF = filter_maps(og_cdlDF)
+
+        # Standings over the last season
+        season_start = str(cdlDF["match_date"].max() - pd.Timedelta(days = 180))
+
+        for name, with_lambdas, native, args in [
+            ("build_team_summaries", build_team_summaries_with_lambdas, build_team_summaries, (cdlDF, )),
+            ("build_series_summaries", build_series_summaries_with_lambdas, build_series_summaries, (og_cdlDF, )),
+            ("build_current_standings", build_current_standings_with_lambdas, build_current_standings, (cdlDF, season_start))
+        ]:
+            results.append({
+                "seasons": n_seasons,
+                "function": name,
+                "lambdas_ms": time_function(with_lambdas, *args, repeat = repeats[n_seasons]),
+                "native_ms": time_function(native, *args, repeat = repeats[n_seasons])
+            })
+
+    results = pd.DataFrame(results)
+    results["speedup"] = results["lambdas_ms"] / results["native_ms"]
+    print_results("Team summaries, series summaries & standings", results)
@@ -1,4 +1,7 @@
 
+# Import partial
+from functools import partial
+
 # Import shiny
 from shiny import module, ui, render, reactive
 
@@ -8,7 +11,9 @@ import faicons as fa
 # Import utils
 from utils.plots import *
 from utils.datagrids_and_value_boxes \
-    import get_line, compute_player_ou, compute_player_ou_streak
+    import get_line
+from utils.props_board import query_board_ou, query_board_ou_streak
+from utils.render_cache import cached_plot
 
 # String containing value for Icon Height in Pixels
 icon_height = "48px"
@@ -49,7 +54,7 @@ def player_card_ui_pg1(player_num: int):
 
 @module.server
 def player_card_server_pg1(
-    input, output, session, cdlDF: pd.DataFrame, rostersDF: pd.DataFrame,
+    input, output, session, cdlDF, rostersDF, props_board,
     propsDF, team_input, player_num: int, map_num, 
     team_color: str, gamemode_input, map_input, x_axis
     ):
@@ -57,7 +62,8 @@ def player_card_server_pg1(
     # Player Name
     @reactive.Calc
     def player():
-        return rostersDF[rostersDF['team'] == team_input()].iloc[player_num - 1]['player']
+        rosters = rostersDF()
+        return rosters[rosters['team'] == team_input()].iloc[player_num - 1]['player']
 
     
     # Player Line
@@ -67,11 +73,11 @@ def player_card_server_pg1(
 
     # Player Plot
     @output
-    @render.plot
+    @cached_plot
     def player_plot():
         if x_axis() == "Time":
-            return player_kills_vs_time(
-                cdlDF, 
+            return partial(player_kills_vs_time,
+                cdlDF(), 
                 player(),
                 team_color,
                 gamemode_input(), 
@@ -79,8 +85,8 @@ def player_card_server_pg1(
                 map_input()
             )
         else:
-            return player_kills_vs_score_diff(
-                cdlDF, 
+            return partial(player_kills_vs_score_diff,
+                cdlDF(), 
                 player(),
                 team_color, 
                 gamemode_input(), 
@@ -91,13 +97,7 @@ def player_card_server_pg1(
     # Player O/U Stats
     @reactive.calc
     def player_ou_stats():
-        return compute_player_ou(
-            cdlDF, 
-            player(),
-            gamemode_input(), 
-            player_line(),
-            map_input()
-            )
+        return query_board_ou(props_board(), player(), map_num())
     
     # Player O/U %
     @output
@@ -119,11 +119,5 @@ def player_card_server_pg1(
     @output
     @render.ui
     def player_ou_streak():
-        ou, streak = compute_player_ou_streak(
-            cdlDF, 
-            player(),
-            gamemode_input(), 
-            player_line(), 
-            map_input()
-        )
+        ou, streak = query_board_ou_streak(props_board(), player(), map_num())
         return f"{ou} {streak}"
\ No newline at end of file
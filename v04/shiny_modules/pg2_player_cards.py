@@ -1,4 +1,7 @@
 
+# Import partial
+from functools import partial
+
 # Import shiny
 from shiny import module, ui, render, reactive
 
@@ -8,7 +11,9 @@ import faicons as fa
 # Import utils
 from utils.plots import *
 from utils.datagrids_and_value_boxes \
-    import get_line, compute_player_1_thru_3_ou, compute_player_1_thru_3_ou_streak
+    import get_line
+from utils.props_board import query_board_ou, query_board_ou_streak
+from utils.render_cache import cached_plot
 
 # String containing value for Icon Height in Pixels
 icon_height = "48px"
@@ -49,15 +54,16 @@ def player_card_ui_pg2(player_num: int):
 
 @module.server
 def player_card_server_pg2(
-    input, output, session, cdlDF: pd.DataFrame, maps_1_thru_3_df: pd.DataFrame,
-    rostersDF: pd.DataFrame, propsDF, team_input, player_num: int, 
+    input, output, session, cdlDF, maps_1_thru_3_df, props_board,
+    rostersDF, propsDF, team_input, player_num: int, 
     team_color: str, map_one, map_two, map_three, x_axis
     ):
 
     # Player Name
     @reactive.Calc
     def player():
-        return rostersDF[rostersDF['team'] == team_input()].iloc[player_num - 1]['player']
+        rosters = rostersDF()
+        return rosters[rosters['team'] == team_input()].iloc[player_num - 1]['player']
 
     
     # Player Maps 1 - 3 Line
@@ -82,39 +88,39 @@ def player_card_server_pg2(
 
     # Player Plot
     @output
-    @render.plot
+    @cached_plot
     def player_plot_pg2():
         if x_axis() == "Time":
-            return player_1_thru_3_kills_vs_time(
-                maps_1_thru_3_df,
+            return partial(player_1_thru_3_kills_vs_time,
+                maps_1_thru_3_df(),
                 player(),
                 team_color,
                 player_line()
             )
         elif x_axis() == "Hardpoint Map":
-            return player_kills_by_map(
-                cdlDF, 
+            return partial(player_kills_by_map,
+                cdlDF(), 
                 player(),
                 "Hardpoint",
                 map_1_line()
             )
         elif x_axis() == "SnD Map":
-            return player_kills_by_map(
-                cdlDF, 
+            return partial(player_kills_by_map,
+                cdlDF(), 
                 player(),
                 "Search & Destroy",
                 map_2_line()
             )
         elif x_axis() == "Control Map":
-            return player_kills_by_map(
-                cdlDF, 
+            return partial(player_kills_by_map,
+                cdlDF(), 
                 player(),
                 "Control",
                 map_3_line()
             )
         else:
-            return player_kills_by_mapset(
-                cdlDF, 
+            return partial(player_kills_by_mapset,
+                cdlDF(), 
                 player(),
                 map_one(),
                 map_two(),
@@ -124,11 +130,7 @@ def player_card_server_pg2(
     # Player Maps 1 - 3 O/U Stats
     @reactive.calc
     def player_ou_stats_pg2():
-        return compute_player_1_thru_3_ou(
-            maps_1_thru_3_df, 
-            player(),
-            player_line()
-            )
+        return query_board_ou(props_board(), player(), 0)
     
     # Player Maps 1 - 3 O/U %
     @output
@@ -150,9 +152,5 @@ def player_card_server_pg2(
     @output
     @render.ui
     def player_ou_streak_pg2():
-        ou, streak = compute_player_1_thru_3_ou_streak(
-            maps_1_thru_3_df, 
-            player(),
-            player_line()
-        )
+        ou, streak = query_board_ou_streak(props_board(), player(), 0)
         return f"{ou} {streak}"
\ No newline at end of file
@@ -8,6 +8,9 @@ import faicons as fa
 # Import pandas
 import pandas as pd
 
+# Import setup
+from utils.setup.setup import map_nums_to_gamemode
+
 # String containing value for Icon Height in Pixels
 icon_height = "48px"
 
@@ -20,15 +23,6 @@ map_num_icons = {
     5: fa.icon_svg("bomb", height = icon_height)
 }
 
-# Dictionary to map map_num to gamemode
-map_nums_to_gamemode = {
-    1: "Hardpoint", 
-    2: "Search & Destroy", 
-    3: "Control", 
-    4: "Hardpoint", 
-    5: "Search & Destroy"
-}
-
 # Dictionary of gamemode abbreviations for value box titles
 gamemode_abbrs = {
     "Hardpoint": "HP", 
@@ -0,0 +1,231 @@
+# Import os, argparse & comb
+import os
+import argparse
+from math import comb
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup, snapshot paths & props board
+from utils.setup.config import lines_history_path
+from utils.setup.snapshot import get_snapshot_file
+from utils.props_board import prop_gamemodes, recommend_ou
+
+# Columns of the lines history
+lines_history_columns = ["scraped_at", "player", "team_abbr", "prop", "line"]
+
+# Lower bounds of the calibration buckets, by recommended percentage
+confidence_buckets = [50, 55, 60, 65, 70, 75, 80, 90]
+
+# Payouts of PrizePicks entry types, by number of correct picks
+entry_payouts = {
+    "2-Pick Power": {2: 3.0},
+    "3-Pick Power": {3: 5.0},
+    "4-Pick Power": {4: 10.0},
+    "3-Pick Flex": {3: 2.25, 2: 1.25},
+    "4-Pick Flex": {4: 5.0, 3: 1.5},
+    "5-Pick Flex": {5: 10.0, 4: 2.0, 3: 0.4},
+    "6-Pick Flex": {6: 25.0, 5: 2.0, 4: 0.4}
+}
+
+
+# Function to append scraped lines to the lines history, with the time of the scrape
+def record_prizepicks_lines(props_df: pd.DataFrame, filepath: str = None):
+    if props_df is None or props_df.empty:
+        return
+    filepath = filepath or get_snapshot_file(lines_history_path)
+    lines_df = props_df.assign(scraped_at = pd.Timestamp.now().floor("s"))[lines_history_columns]
+    os.makedirs(os.path.dirname(filepath), exist_ok = True)
+    lines_df.to_csv(filepath, mode = "a", header = not os.path.exists(filepath), index = False)
+
+# Function to load the lines history
+def load_prizepicks_lines(filepath: str = None):
+    filepath = filepath or get_snapshot_file(lines_history_path)
+    if not os.path.exists(filepath):
+        return pd.DataFrame(columns = lines_history_columns)
+    return pd.read_csv(filepath, parse_dates = ["scraped_at"])
+
+# Function to convert dates to day numbers
+def to_days(dates):
+    return pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]").astype("int64")
+
+# Function to build an as-of kills index: for every key, the number of maps with kills <= each value,
+# after each map played in chronological order, so any line can be counted as of any date
+# Rows of "cum_counts" are the maps of each key, after a leading row of zeros;
+# the last column counts NaN kills, which count as maps played but never as overs, unders or hooks
+def build_asof_kills_index(kills_df: pd.DataFrame, keys: list):
+    sorted_df = kills_df.sort_values(keys + ["match_date"], ignore_index = True)
+    group_ids = sorted_df.groupby(keys, observed = True, sort = False).ngroup().to_numpy()
+    group_starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]]) if len(group_ids) > 0 \
+        else np.empty(0, dtype = "int64")
+    group_keys = list(sorted_df.iloc[group_starts][keys].itertuples(index = False, name = None))
+    if len(keys) == 1:
+        group_keys = [key[0] for key in group_keys]
+
+    # One-hot kills, one row per map after each key's row of zeros
+    kills = sorted_df["kills"].to_numpy(dtype = "float64")
+    max_kills = int(np.nanmax(kills)) if np.isfinite(kills).any() else 0
+    rows = np.arange(len(sorted_df)) + group_ids + 1
+    columns = np.where(np.isnan(kills), max_kills + 1, np.nan_to_num(kills)).astype("int64")
+    cum_counts = np.zeros((len(sorted_df) + len(group_starts), max_kills + 2), dtype = "int32")
+    cum_counts[rows, columns] = 1
+
+    # Counts of kills <= each value, expanding over each key's maps
+    cum_counts = np.cumsum(np.cumsum(cum_counts, axis = 1, dtype = "int32"), axis = 0, dtype = "int32")
+    zero_rows = group_starts + np.arange(len(group_starts))
+    cum_counts -= np.repeat(cum_counts[zero_rows], np.diff(np.r_[zero_rows, len(cum_counts)]), axis = 0)
+
+    # Match days of each key's maps, offset by key so they form one sorted array
+    days = to_days(sorted_df["match_date"])
+    day_low = days.min() if len(days) > 0 else 0
+    day_span = (days.max() - day_low + 2) if len(days) > 0 else 2
+    return {
+        "keys": {key: group_id for group_id, key in enumerate(group_keys)},
+        "day_keys": group_ids * day_span + (days - day_low),
+        "day_low": day_low,
+        "day_span": day_span,
+        "group_starts": group_starts,
+        "zero_rows": zero_rows,
+        "cum_counts": cum_counts
+    }
+
+# Function to count overs, unders & hooks of lines as of dates, with only earlier match days visible
+# Same counts as compute_player_ou on the maps played before each date
+def count_asof_ou(asof_index: dict, key_ids: np.ndarray, days: np.ndarray, lines: np.ndarray):
+    day_low, day_span, cum_counts = asof_index["day_low"], asof_index["day_span"], asof_index["cum_counts"]
+    queries = key_ids * day_span + np.clip(days - day_low, 0, day_span - 1)
+    n_maps = np.searchsorted(asof_index["day_keys"], queries, side = "left") - asof_index["group_starts"][key_ids]
+    rows = asof_index["zero_rows"][key_ids] + n_maps
+
+    # Kills are whole numbers: kills < line is kills <= ceil(line) - 1, kills <= line is kills <= floor(line)
+    last_value = cum_counts.shape[1] - 2
+    below = np.where(np.ceil(lines) - 1 < 0, 0,
+                     cum_counts[rows, np.clip(np.ceil(lines) - 1, 0, last_value).astype("int64")])
+    at_or_below = np.where(np.floor(lines) < 0, 0,
+                           cum_counts[rows, np.clip(np.floor(lines), 0, last_value).astype("int64")])
+    overs = cum_counts[rows, last_value] - at_or_below
+    return overs, below, at_or_below - below, n_maps
+
+# Function to attach every line to the series it was set for: the player's first series
+# on or after the day of the scrape, unless the line already has a match_id
+def attach_lines_to_series(lines_df: pd.DataFrame, cdlDF_input: pd.DataFrame):
+    series_df = cdlDF_input[["player", "match_id", "match_date"]] \
+        .drop_duplicates() \
+        .astype({"player": str}) \
+        .sort_values("match_date")
+    if "match_id" in lines_df.columns:
+        return pd.merge(lines_df, series_df, on = ["player", "match_id"], how = "inner")
+    lines_df = lines_df \
+        .assign(line_date = pd.to_datetime(lines_df["scraped_at"]).dt.floor("D"), player = lines_df["player"].astype(str)) \
+        .sort_values("line_date")
+    return pd.merge_asof(
+        lines_df, series_df, left_on = "line_date", right_on = "match_date",
+        by = "player", direction = "forward"
+    ) \
+        .dropna(subset = ["match_id"]) \
+        .drop("line_date", axis = 1) \
+        .astype({"match_id": series_df["match_id"].dtype}) \
+        .drop_duplicates(["player", "prop", "match_id"], keep = "last")
+
+# Function to replay lines against the actual results of their series
+# Recommends the Over or Under as compute_player_ou would have on the morning of the series,
+# on the player's gamemode history for props 1 - 3, and Maps 1 - 3 history for prop 0
+def run_backtest(lines_df: pd.DataFrame, cdlDF_input: pd.DataFrame, maps_1_thru_3_DF_input: pd.DataFrame):
+    lines_df = attach_lines_to_series(lines_df, cdlDF_input).reset_index(drop = True)
+    lines_df["prop"] = lines_df["prop"].astype(int)
+
+    # Actual kills of every line: the prop's map, or Maps 1 - 3
+    map_kills = cdlDF_input[["match_id", "player", "map_num", "kills"]] \
+        .astype({"player": str, "map_num": int}) \
+        .rename(columns = {"map_num": "prop"})
+    totals = maps_1_thru_3_DF_input[["match_id", "player", "kills"]].astype({"player": str}).assign(prop = 0)
+    lines_df = pd.merge(lines_df, pd.concat([map_kills, totals]), on = ["match_id", "player", "prop"], how = "inner")
+
+    # As-of counts of every line, with history before the series' match day
+    kills_df = cdlDF_input[["player", "gamemode", "match_date", "kills"]].astype({"player": str, "gamemode": str})
+    asof_indexes = {
+        False: build_asof_kills_index(kills_df, ["player", "gamemode"]),
+        True: build_asof_kills_index(
+            maps_1_thru_3_DF_input[["player", "match_date", "kills"]].astype({"player": str}), ["player"]
+        )
+    }
+    counts = np.zeros((4, len(lines_df)), dtype = "int64")
+    days, lines = to_days(lines_df["match_date"]), lines_df["line"].to_numpy(dtype = "float64")
+    for is_1_thru_3, asof_index in asof_indexes.items():
+        rows = np.flatnonzero((lines_df["prop"] == 0).to_numpy() == is_1_thru_3)
+        key_ids = np.array([
+            asof_index["keys"].get(player if is_1_thru_3 else (player, prop_gamemodes.get(prop)), -1)
+            for player, prop in zip(lines_df["player"].to_numpy()[rows], lines_df["prop"].to_numpy()[rows])
+        ], dtype = "int64")
+        rows, key_ids = rows[key_ids >= 0], key_ids[key_ids >= 0]
+        counts[:, rows] = count_asof_ou(asof_index, key_ids, days[rows], lines[rows])
+    overs, unders, hooks, n_maps = counts
+
+    # Recommended bet & actual result of every line the player had history for
+    is_over, percentage = recommend_ou(overs, unders, n_maps)
+    kills = lines_df["kills"].to_numpy(dtype = "float64")
+    results = lines_df.assign(
+        pick = np.where(is_over, "Over", "Under"),
+        percentage = percentage,
+        n_maps = n_maps,
+        result = np.select([kills > lines, kills < lines], ["Over", "Under"], "Push")
+    )
+    results["hit"] = results["pick"] == results["result"]
+    return results[results["n_maps"] > 0].reset_index(drop = True)
+
+# Function to compute the expected return of an entry type from the hit rate of its picks
+# Picks are treated as independent, and pushes are left out, as PrizePicks drops pushed picks
+def compute_entry_roi(hit_rate: float, payouts: dict):
+    n_picks = max(payouts)
+    return sum(
+        comb(n_picks, n_hits) * hit_rate ** n_hits * (1 - hit_rate) ** (n_picks - n_hits) * payout
+        for n_hits, payout in payouts.items()
+    ) - 1
+
+# Function to summarize a backtest: hit rate, calibration by confidence bucket & ROI per entry type
+def summarize_backtest(results: pd.DataFrame):
+    decided = results[results["result"] != "Push"]
+    hit_rate = decided["hit"].mean() if len(decided) > 0 else np.nan
+
+    overall = pd.DataFrame([{
+        "picks": len(results),
+        "pushes": len(results) - len(decided),
+        "hits": int(decided["hit"].sum()),
+        "hit_rate": hit_rate
+    }])
+
+    # Recommended percentage vs actual hit rate of every confidence bucket
+    buckets = pd.cut(decided["percentage"], confidence_buckets + [101], right = False,
+                     labels = [f"{low}%+" for low in confidence_buckets])
+    calibration = decided \
+        .groupby(buckets, observed = False) \
+        .agg(picks = ("hit", "size"), predicted = ("percentage", "mean"), hit_rate = ("hit", "mean")) \
+        .reset_index(names = "confidence")
+    calibration["predicted"] = calibration["predicted"] / 100
+
+    roi = pd.DataFrame([
+        {"entry_type": entry_type, "roi": compute_entry_roi(hit_rate, payouts) if len(decided) > 0 else np.nan}
+        for entry_type, payouts in entry_payouts.items()
+    ])
+    return {"overall": overall, "calibration": calibration, "roi": roi}
+
+
+# Backtest the lines history from the command line, from the v04 folder:
+# python -m utils.backtest
+if __name__ == "__main__":
+    from utils.setup.setup import filter_maps
+    from utils.setup.snapshot import load_cdl_data, load_1_thru_3_totals
+
+    parser = argparse.ArgumentParser(description = "Backtest the O/U recommendations on the lines history")
+    parser.add_argument("--lines", default = None, help = "lines history csv, defaults to the config path")
+    args = parser.parse_args()
+
+    og_cdlDF = load_cdl_data()
+    summary = summarize_backtest(
+        run_backtest(load_prizepicks_lines(args.lines), filter_maps(og_cdlDF), load_1_thru_3_totals(og_cdlDF))
+    )
+    for name, table in summary.items():
+        print("")
+        print(name)
+        print(table.to_string(index = False))
@@ -3,110 +3,66 @@ import pandas as pd
 
 # Function to compute date of last match
 def compute_last_match(cdlDF_input: pd.DataFrame, team_x: str, team_y: str):
-    return cdlDF_input[
+    last_match_date = cdlDF_input.loc[
         (cdlDF_input['team'] == team_x) & 
-        (cdlDF_input['opp'] == team_y)
-    ].iloc[-1, 1].strftime("%b %d %Y")
+        (cdlDF_input['opp'] == team_y), 
+        'match_date'
+    ].max()
+    if pd.isna(last_match_date):
+        return "Never Played"
+    return last_match_date.strftime("%b %d %Y")
 
 # Function to create dataframe of kills for user-selected team & gamemode
 def build_scoreboards(
         cdlDF_input: pd.DataFrame, team_x: str, team_y: str, gamemode_input = "All", map_input = "All"
     ):
 
-    # Get maps to include based on user input
-    selected_maps = []
-    if map_input == "All":
-        selected_maps = sorted(cdlDF_input['map_name'].unique())
-    else:
-        selected_maps.append(map_input)
-
-    # Create a copy of cdlDF_input
-    cdlDF_copy = cdlDF_input.copy()
-
-    # Create a boolean Series indicating rows containing maps within selected_maps
-    mask = cdlDF_copy['map_name'].isin(selected_maps)
-
-    # Reindex the boolean Series to match the DataFrame's index
-    mask = mask.reindex(cdlDF_copy.index)
-
-    # Filter cdlDF for maps in selected_maps
-    cdlDF_copy = cdlDF_copy[mask]
+    # Filter for map
+    cdlDF_copy = cdlDF_input
+    if map_input != "All":
+        cdlDF_copy = cdlDF_copy[cdlDF_copy['map_name'] == map_input]
 
     # Filter for gamemode
     if gamemode_input != "All":
         cdlDF_copy = cdlDF_copy[cdlDF_copy['gamemode'] == gamemode_input]
+
+    # Number each team's players within each map, to pair them with the opposing team's players
+    cdlDF_copy = cdlDF_copy.assign(
+        player_num = cdlDF_copy.groupby(["match_id", "map_num", "team_abbr"], observed = True).cumcount()
+    )
     
     # Get team_x scoreboards
     team_x_scoreboard = \
         cdlDF_copy[cdlDF_copy["team"] == team_x] \
             [["match_date", "match_id", "gamemode", "map_name", "map_num", 
-              "team_abbr", "player", "kills", "deaths", "score_diff", "opp_abbr"]]
+              "team_abbr", "player", "kills", "deaths", "score_diff", "opp_abbr", "player_num"]]
 
     # Get team_y scoreboards
     team_y_scoreboard = \
         cdlDF_copy[(cdlDF_copy["team"] == team_y) & 
                     (cdlDF_copy["opp"] != team_x)] \
             [["match_date", "match_id", "gamemode", "map_name", "map_num", 
-              "team_abbr", "player", "kills", "deaths", "score_diff", "opp_abbr"]]
+              "team_abbr", "player", "kills", "deaths", "score_diff", "opp_abbr", "player_num"]]
     
     # Combine scoreboards
     scoreboards = pd.concat([team_x_scoreboard, team_y_scoreboard], axis=0)
 
-    # Arrange by match_date, match_id, and map_num for later concatenation
+    # Arrange by match_date, match_id, and map_num
     scoreboards = scoreboards.sort_values(by = ["match_date", "match_id", "map_num"], ascending = [False, False, True]).reset_index(drop=True)
 
-    # Add player data for opposing teams
+    # Add player data for opposing teams,
+    # joining each player to the opposing player with the same number on the same map
+    opponents = cdlDF_copy[["match_id", "map_num", "team_abbr", "player_num", "player", "kills", "deaths"]] \
+        .rename(columns = {
+            "team_abbr": "opp_abbr",
+            "player": "Player ",
+            "kills": "Kills ", 
+            "deaths": "Deaths ", 
+        })
+    scoreboards = scoreboards.merge(opponents, how = "left", on = ["match_id", "map_num", "opp_abbr", "player_num"])
 
-    # Build dataframe of unique match_ids and opponents
-    matches = scoreboards[["match_id", "opp_abbr"]].drop_duplicates().reset_index(drop=True).copy()
-
-    # Initialize opponents dataframe
-    opponents = pd.DataFrame()
-
-    # Loop through matches and append player data  
-    if gamemode_input != "All":
-        for index, row in matches.iterrows():
-            opponents = pd.concat([
-                opponents, 
-                cdlDF_copy[
-                    (cdlDF_copy["match_id"] == row["match_id"]) &
-                    (cdlDF_copy["team_abbr"] == row["opp_abbr"]) &
-                    (cdlDF_copy["gamemode"] == gamemode_input)
-                ] \
-                    [["match_date", "match_id", "map_num", "player", "kills", 
-                    "deaths"]]
-            ], 
-            axis=0)
-    else:
-        for index, row in matches.iterrows():
-            opponents = pd.concat([
-                opponents, 
-                cdlDF_copy[
-                    (cdlDF_copy["match_id"] == row["match_id"]) &
-                    (cdlDF_copy["team_abbr"] == row["opp_abbr"])
-                ] \
-                    [["match_date", "match_id", "map_num", "player", "kills", 
-                    "deaths"]]
-            ], 
-            axis=0)
-
-    # Arrange by match_date, match_id, and map_num for later concatenation
-    opponents = opponents.sort_values(by = ["match_date", "match_id", "map_num"], ascending = [False, False, True]).reset_index(drop=True)
-
-    # Rename opponent columns
-    opponents = opponents.rename(columns = {
-        "player": "Player ",
-        "kills": "Kills ", 
-        "deaths": "Deaths ", 
-    })
-
-    # # Concatenate scoreboards & opponents 
-    scoreboards = pd.concat(
-        [
-            scoreboards, 
-            opponents.drop(["match_date", "match_id", "map_num"], axis = 1).reset_index(drop=True)
-        ], 
-        axis=1)
+    # Drop player_num
+    scoreboards = scoreboards.drop("player_num", axis = 1)
 
     # Drop map_num & match_id
     scoreboards = scoreboards.drop(["map_num", "match_id"], axis = 1)
@@ -200,6 +156,19 @@ def compute_win_streak(
     
     return streak
 
+# Record for team, mode & map combinations missing from the team record lookup
+empty_team_record = {"wins": 0, "losses": 0, "win_percentage": 0.0}
+
+# Function to get a team's record for a mode & map from the team record lookup,
+# with map_input "All" for every map of the mode
+def lookup_team_record(team_record_lookup: dict, team_input: str, gamemode_input: str, map_input = "All"):
+    map_to_search_for = "Overall" if map_input == "All" else map_input
+    return team_record_lookup.get((team_input, gamemode_input, map_to_search_for), empty_team_record)
+
+# Function to format a team record for the Map Record Value Boxes
+def format_team_record(team_record: dict):
+    return f"{team_record['win_percentage']:.0%} ({team_record['wins']} - {team_record['losses']})"
+
 # Function to compute Map H2H Win - Loss Record for Map H2H Value Box
 def compute_h2h_map_record(
         cdlDF_input: pd.DataFrame, team_x: str, team_y: str, 
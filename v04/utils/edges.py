@@ -0,0 +1,101 @@
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import kills index, streaks & props board
+from utils.kills_index import build_kills_index, all_maps
+from utils.streaks import sort_by_recency, build_ou_streak_index, map_recency, series_recency
+from utils.props_board import build_board_index, count_props_board, recommend_ou
+from utils.probability import build_probability_indexes, estimate_props_board
+
+# Prop filters of the best edges page
+edge_props = {
+    "All Props": None, 
+    "Map 1 Hardpoint": 1, 
+    "Map 2 Search & Destroy": 2, 
+    "Map 3 Control": 3, 
+    "Maps 1 - 3": 0
+}
+
+# Prop names of the best edges datagrid
+edge_prop_names = {1: "Map 1 HP", 2: "Map 2 SnD", 3: "Map 3 Control", 0: "Maps 1 - 3"}
+
+# Recency windows of the best edges page: number of most recent maps, or series for Maps 1 - 3
+recency_windows = {
+    "All Time": None, 
+    "Last 10": 10, 
+    "Last 25": 25, 
+    "Last 50": 50
+}
+
+
+# Function to keep the n_recent most recent rows of every group
+def keep_recent(df: pd.DataFrame, keys: list, recency: list, n_recent: int):
+    return sort_by_recency(df, keys, recency) \
+        .groupby(keys, observed = True, sort = False) \
+        .head(n_recent)
+
+# Function to build the board indexes of a recency window
+# Every player, gamemode & map keeps its n_recent most recent maps, and every player & gamemode
+# its n_recent most recent maps for "All"; Maps 1 - 3 keep each player's n_recent most recent series
+# Returns the board & probability indexes of the maps & Maps 1 - 3
+def build_recent_board_indexes(
+        cdlDF_input: pd.DataFrame, maps_1_thru_3_DF_input: pd.DataFrame, n_recent: int, data_version: str
+):
+    kills_df = cdlDF_input[["player", "gamemode", "map_name", "kills"] + map_recency]
+    kills_index, ou_streak_index = {}, {}
+    for keys, fill_keys in [(["player", "gamemode", "map_name"], ()), (["player", "gamemode"], (all_maps, ))]:
+        recent_df = keep_recent(kills_df, keys, map_recency, n_recent)
+        kills_index.update({
+            key + fill_keys: kills for key, kills in build_kills_index(recent_df, keys).items()
+        })
+        ou_streak_index.update({
+            key + fill_keys: entry for key, entry in build_ou_streak_index(recent_df, keys, map_recency).items()
+        })
+
+    totals_df = keep_recent(
+        maps_1_thru_3_DF_input[["player", "kills"] + series_recency], ["player"], series_recency, n_recent
+    )
+    kills_1_thru_3_index = build_kills_index(totals_df, ["player"])
+    return build_board_index(kills_index, ou_streak_index), \
+        build_board_index(kills_1_thru_3_index, build_ou_streak_index(totals_df, ["player"], series_recency)), \
+        *build_probability_indexes(kills_index, kills_1_thru_3_index, data_version)
+
+# Function to rank every prop on the board by historical hit rate against its current line
+# The hit rate is the percentage of maps on the recommended side, as in the O/U value boxes,
+# and the model % the simulated probability of the recommended side
+# prop_input limits the board to one prop, evaluated on map_input, and props with fewer
+# than min_sample maps played are dropped, as are props without a line or a model probability
+def rank_edges(
+        props_df: pd.DataFrame, board_index: dict, board_1_thru_3_index: dict,
+        probability_index: dict, probability_1_thru_3_index: dict, prop_input = None, map_input = "All", min_sample = 1
+):
+    props_df = props_df[props_df["line"].notna()]
+    if prop_input is not None:
+        props_df = props_df[props_df["prop"] == prop_input]
+    counts = count_props_board(props_df, board_index, board_1_thru_3_index, map_input)
+    counts = counts[counts["n_maps"] >= max(min_sample, 1)]
+    is_over, percentage = recommend_ou(counts["overs"].to_numpy(), counts["unders"].to_numpy(), counts["n_maps"].to_numpy())
+    probabilities = estimate_props_board(counts, probability_index, probability_1_thru_3_index, map_input)
+    model_percentage = np.where(is_over, probabilities["p_over"], probabilities["p_under"]) * 100
+
+    # Drop props the model has no probability for
+    has_model = ~np.isnan(model_percentage)
+    counts, is_over, percentage, model_percentage = \
+        counts[has_model], is_over[has_model], percentage[has_model], model_percentage[has_model]
+
+    edges = pd.DataFrame({
+        "Player": counts["player"], 
+        "Team": counts["team_abbr"], 
+        "Prop": counts["prop"].map(edge_prop_names), 
+        "Line": counts["line"], 
+        "Pick": np.where(is_over, "Over", "Under"), 
+        "Hit %": percentage, 
+        "Model %": np.round(model_percentage).astype("int64"), 
+        "O - U - H": counts["overs"].astype(str) + " - " + counts["unders"].astype(str) + " - " + counts["hooks"].astype(str), 
+        "Maps": counts["n_maps"], 
+        "Streak": np.where(counts["is_streak_over"], "Over ", "Under ") + counts["streak"].astype(str)
+    })
+    return edges \
+        .sort_values(["Hit %", "Maps"], ascending = False, kind = "stable") \
+        .reset_index(drop = True)
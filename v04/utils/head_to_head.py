@@ -0,0 +1,71 @@
+# Import pandas
+import pandas as pd
+
+# Key for records across every gamemode or map
+all_maps = "All"
+
+# Date format of the last match value boxes
+last_match_format = "%b %d %Y"
+
+
+# Function to count wins & losses and the last match date of every group of results
+def summarize_h2h_results(results_df: pd.DataFrame, keys: list, result_column: str):
+    return results_df \
+        .groupby(keys, observed = True) \
+        .agg(
+            wins = (result_column, "sum"),
+            total = (result_column, "size"),
+            last_match_date = ("match_date", "max")
+        ) \
+        .assign(losses = lambda x: x["total"] - x["wins"]) \
+        [["wins", "losses", "last_match_date"]]
+
+# Function to build the head-to-head cube: wins, losses & last match date of every team against every opp
+# Keys are (team, opp, gamemode, map_name), with map_name "All" for every map of the gamemode,
+# and (team, opp, "All", "All") for series records
+# Map results are deduplicated as in compute_h2h_map_record, and series results as in compute_h2h_series_record
+def build_h2h_cube(cdlDF_input: pd.DataFrame):
+
+    # One row per match, team & map, and per match & team
+    map_results = cdlDF_input[["match_id", "match_date", "team", "map_name", "gamemode", "map_result", "opp"]] \
+        .drop_duplicates()
+    series_results = cdlDF_input[["match_id", "match_date", "team", "opp", "series_result"]] \
+        .drop_duplicates()
+
+    # Map records by map & mode, by mode, and series records
+    map_records = summarize_h2h_results(map_results, ["team", "opp", "gamemode", "map_name"], "map_result")
+    mode_records = summarize_h2h_results(map_results, ["team", "opp", "gamemode"], "map_result")
+    series_records = summarize_h2h_results(series_results, ["team", "opp"], "series_result")
+
+    h2h_cube = {}
+    for records, fill_keys in [(map_records, ()), (mode_records, (all_maps, )), (series_records, (all_maps, all_maps))]:
+        h2h_cube.update({
+            key + fill_keys: {
+                "wins": int(record["wins"]),
+                "losses": int(record["losses"]),
+                "last_match_date": record["last_match_date"]
+            }
+            for key, record in records.to_dict("index").items()
+        })
+    return h2h_cube
+
+# Function to get the date of the last match between two teams from the head-to-head cube
+# Same output as compute_last_match
+def query_last_match(h2h_cube: dict, team_x: str, team_y: str):
+    record = h2h_cube.get((team_x, team_y, all_maps, all_maps))
+    if record is None:
+        return "Never Played"
+    return record["last_match_date"].strftime(last_match_format)
+
+# Function to get the Map H2H Win - Loss Record from the head-to-head cube
+# Same output as compute_h2h_map_record
+def query_h2h_map_record(h2h_cube: dict, team_x: str, team_y: str, gamemode_input: str, map_input = "All"):
+    record = h2h_cube.get((team_x, team_y, gamemode_input, map_input))
+    if record is None:
+        return "0 - 0"
+    return f"{record['wins']} - {record['losses']}"
+
+# Function to get the Series H2H Win - Loss Record from the head-to-head cube
+# Same output as compute_h2h_series_record
+def query_h2h_series_record(h2h_cube: dict, team_x: str, team_y: str):
+    return query_h2h_map_record(h2h_cube, team_x, team_y, all_maps, all_maps)
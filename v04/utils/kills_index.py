@@ -0,0 +1,76 @@
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Key for a player's kills across every map of a gamemode
+all_maps = "All"
+
+
+# Function to build a kills index: a dictionary of sorted kills arrays, keyed by the given columns
+# NaN kills are sorted to the end of each array, so they count as maps played, as in compute_player_ou
+def build_kills_index(kills_df: pd.DataFrame, keys: list):
+    sorted_df = kills_df.sort_values(keys + ["kills"], na_position = "last")
+    kills = sorted_df["kills"].to_numpy(dtype = "float64")
+    groups = sorted_df.groupby(keys, observed = True, sort = False).indices
+    return {key: kills[positions] for key, positions in groups.items()}
+
+# Function to build the kills index of every player, gamemode & map, for compute_player_ou
+# Keys are (player, gamemode, map_name), with map_name "All" for every map of the gamemode
+def build_player_kills_index(cdlDF_input: pd.DataFrame):
+    kills_df = cdlDF_input[["player", "gamemode", "map_name", "kills"]]
+    kills_index = build_kills_index(kills_df, ["player", "gamemode", "map_name"])
+    kills_index.update({
+        (player, gamemode, all_maps): kills
+        for (player, gamemode), kills in build_kills_index(kills_df, ["player", "gamemode"]).items()
+    })
+    return kills_index
+
+# Function to build the Maps 1 - 3 kills index, keyed by player, for compute_player_1_thru_3_ou
+def build_1_thru_3_kills_index(maps_1_thru_3_DF_input: pd.DataFrame):
+    return build_kills_index(maps_1_thru_3_DF_input[["player", "kills"]], ["player"])
+
+# Function to count overs, unders & hooks in a sorted kills array with two binary searches
+# cur_line can be a single line or an array of lines
+def count_ou(kills_sorted: np.ndarray, cur_line):
+    n_valid = np.searchsorted(kills_sorted, np.inf, side = "right")
+    below = np.searchsorted(kills_sorted, cur_line, side = "left")
+    at_or_below = np.searchsorted(kills_sorted, cur_line, side = "right")
+    return n_valid - at_or_below, below, at_or_below - below
+
+# Function to summarize overs, unders & hooks as compute_player_ou does
+def summarize_ou(overs: int, unders: int, hooks: int, n_maps: int):
+
+    # Compute over & under percentages
+    over_percentage = int(round((overs / n_maps * 100), 0))
+    under_percentage = int(round((unders / n_maps * 100), 0))
+
+    # Return recommended bet based on percentages
+    if over_percentage >= under_percentage:
+        return "Over", str(over_percentage), str(overs), str(unders), str(hooks)
+    else:
+        return "Under", str(under_percentage), str(overs), str(unders), str(hooks)
+
+# Function to compute player kills over/under % from the kills index
+# Same output as compute_player_ou
+def query_player_ou(
+        kills_index: dict, player_input: str,
+        gamemode_input: str, cur_line: float, map_input = "All"
+):
+    kills_sorted = kills_index.get((player_input, gamemode_input, map_input))
+
+    # If the player never played the map & mode, return "Never Played"
+    if kills_sorted is None:
+        return "Never Played", "", "", "", ""
+
+    return summarize_ou(*count_ou(kills_sorted, cur_line), len(kills_sorted))
+
+# Function to compute player maps 1 - 3 kills over/under % from the Maps 1 - 3 kills index
+# Same output as compute_player_1_thru_3_ou
+def query_player_1_thru_3_ou(kills_1_thru_3_index: dict, player_input: str, cur_line: float):
+    kills_sorted = kills_1_thru_3_index.get(player_input)
+
+    # If the player never played, return "Never Played"
+    if kills_sorted is None:
+        return "Never Played", "", "", "", ""
+
+    return summarize_ou(*count_ou(kills_sorted, cur_line), len(kills_sorted))
@@ -0,0 +1,212 @@
+# Import os, argparse, threading & deque
+import os
+import argparse
+import threading
+from collections import deque
+from functools import partial
+from itertools import permutations
+
+# Import pandas
+import pandas as pd
+
+# Import setup, plots, render pool & render cache
+from utils.setup.setup import team_icons, map_pools
+from utils.setup.config import warm_plot_cache, warm_output_sizes, warm_map_combinations, render_pool_workers
+from utils.plots import score_diffs_ridge, series_diff_ridge, team_percent_maps_played
+from utils.render_pool import RenderPool, plot_pool
+from utils.render_cache import plot_cache
+
+# Plots rendered per task sent to a worker
+plots_per_task = 4
+
+# Dataframes of the team-level plots, the only ones the warmer needs in the render pool's workers
+warm_plot_frames = ["cdlDF", "series_score_diffs", "team_summaries_DF"]
+
+# Environment variable to turn the warmer on or off, ie. CDL_WARM_PLOTS=0
+warm_env_var = "CDL_WARM_PLOTS"
+
+
+# Function to build every team-level plot of the app, as the partials its outputs render
+# Ridgelines cover every ordered pair of teams, since team A & team B have their own colors
+# Map ridgelines are only built with warm_map_combinations, as there are 10x more of them
+def build_team_plot_requests(
+        cdlDF_input: pd.DataFrame, series_score_diffs_input: pd.DataFrame, team_summaries_input: pd.DataFrame,
+        team_a_color: str, team_b_color: str, include_maps: bool = warm_map_combinations
+):
+    teams = sorted(cdlDF_input["team"].unique())
+    pairs = list(permutations(teams, 2))
+    return {
+        team_percent_maps_played: [
+            partial(team_percent_maps_played, team_summaries_input, team, gamemode)
+            for team in teams for gamemode in map_pools
+        ],
+        series_diff_ridge: [
+            partial(series_diff_ridge, series_score_diffs_input, team_icons[team_x], team_icons[team_y],
+                    team_a_color, team_b_color)
+            for team_x, team_y in pairs
+        ],
+        score_diffs_ridge: [
+            partial(score_diffs_ridge, cdlDF_input, team_icons[team_x], team_icons[team_y],
+                    team_a_color, team_b_color, gamemode, map_name)
+            for gamemode in map_pools
+            for map_name in ["All"] + (map_pools[gamemode] if include_maps else [])
+            for team_x, team_y in pairs
+        ]
+    }
+
+
+# Prerenders the team-level plots in the render pool's workers, and stores them in the render cache
+# Plots are warmed at warm_output_sizes, and at every size the app has rendered them at,
+# ie. warmer.warm_all() after a data refresh, then again as sessions report new sizes
+# One batch per worker is in the pool at once, so sessions' own renders are never queued behind many batches
+class PlotWarmer:
+
+    def __init__(self, requests: dict, pool: RenderPool = plot_pool, n_workers: int = render_pool_workers):
+        self._requests = requests
+        self._pool = pool
+        self._warmed = set()
+        self._queue = deque()
+        self._n_running = 0
+        self._max_running = max(n_workers, 1)
+        self._n_batches = 0
+        self._done = threading.Condition()
+
+    # Function to warm every plot function at its recorded output sizes & warm_output_sizes
+    def warm_all(self):
+        for plot_function in self._requests:
+            for output_size in warm_output_sizes + plot_cache.output_sizes(plot_function):
+                self.warm(plot_function, tuple(output_size))
+
+    # Function to queue every plot of one plot function at one output size, skipping plots already cached
+    def warm(self, plot_function, output_size: tuple):
+        if plot_function not in self._requests:
+            return
+        with self._done:
+            if (plot_function, output_size) in self._warmed:
+                return
+            self._warmed.add((plot_function, output_size))
+
+        keys, batch = [], []
+        for request in self._requests[plot_function]:
+            key = plot_cache.make_key(plot_function, request.args, request.keywords, output_size, {"alt": None})
+            if not plot_cache.contains(key):
+                keys.append(key)
+                batch.append(request)
+
+        with self._done:
+            for start in range(0, len(keys), plots_per_task):
+                self._queue.append((plot_function, batch[start:start + plots_per_task],
+                                    output_size, keys[start:start + plots_per_task]))
+        self._submit()
+
+    # Function to send queued batches to the workers
+    # Only a few batches are in the pool at once, so the app can exit without waiting for the whole queue
+    # If the render pool stops, the plots not sent yet are dropped
+    def _submit(self):
+        with self._done:
+            while self._queue and self._n_running < self._max_running:
+                plot_function, batch, output_size, keys = self._queue.popleft()
+                try:
+                    future = self._pool.submit_batch(plot_function, batch, output_size[:2], output_size[2])
+                except RuntimeError:
+                    future = None
+                if future is None:
+                    self._queue.clear()
+                    break
+                self._n_running += 1
+                self._n_batches += 1
+                future.add_done_callback(partial(self._store, keys))
+            self._done.notify_all()
+
+    # Function to store a finished batch in the render cache, and send the next one
+    def _store(self, keys: list, future):
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Could not prerender plots ({future.exception()})")
+        elif not future.cancelled():
+            for key, img in zip(keys, future.result()):
+                if img is not None:
+                    plot_cache.put(key, img)
+        with self._done:
+            self._n_running -= 1
+        self._submit()
+
+    # Function to wait for every queued plot, returning the number of batches rendered
+    def wait(self):
+        with self._done:
+            self._done.wait_for(lambda: not self._queue and self._n_running == 0)
+            return self._n_batches
+
+    # Function to drop the plots not sent to the workers yet
+    def shutdown(self):
+        with self._done:
+            self._queue.clear()
+
+
+# Whether the warmer has been started, as it is started by the first session only
+_warmer_started = threading.Event()
+
+
+# Function to start warming the team-level plots in the background, ie. once the first session has loaded
+# The warmer shares the render pool's workers & the dataframes they hold, starting the pool if it is not running,
+# and plots are warmed again whenever a session renders them at a new size
+def start_plot_warmer(team_a_color: str, team_b_color: str):
+    if os.environ.get(warm_env_var, "1" if warm_plot_cache else "0") != "1" or _warmer_started.is_set():
+        return
+    _warmer_started.set()
+
+    def start():
+        frames = plot_pool.ensure_started()
+        if frames is None or any(name not in frames for name in warm_plot_frames):
+            print("Could not prerender plots, as the render pool is not running with the team-level dataframes")
+            return
+        warmer = PlotWarmer(build_team_plot_requests(
+            frames["cdlDF"], frames["series_score_diffs"], frames["team_summaries_DF"], team_a_color, team_b_color
+        ))
+        plot_cache.on_new_output_size = warmer.warm
+        warmer.warm_all()
+
+    threading.Thread(target = start, name = "plot-warmer", daemon = True).start()
+
+
+# Prerender the team-level plots into the render cache's disk tier after a data refresh, from the v04 folder:
+# python -m utils.plot_warmer --size 600 400 1
+if __name__ == "__main__":
+    from utils.setup.setup import filter_maps, build_series_summaries, build_team_summaries, compute_data_version
+    from utils.setup.schema import apply_cdl_schema
+    from utils.setup.snapshot import load_cdl_data
+    from utils.setup.aggregates import \
+        load_aggregate_tables, build_series_summaries_from_aggregates, build_team_summaries_from_aggregates
+    from utils.setup.config import use_aggregate_tables, use_render_cache_disk
+
+    parser = argparse.ArgumentParser(description = "Prerender the team-level plots into the render cache")
+    parser.add_argument("--size", nargs = 3, type = float, action = "append", default = [],
+                        metavar = ("WIDTH", "HEIGHT", "PIXELRATIO"), help = "output size to prerender")
+    parser.add_argument("--team-a-color", default = "#2fa4e7")
+    parser.add_argument("--team-b-color", default = "#1b6ead")
+    args = parser.parse_args()
+    if not use_render_cache_disk:
+        parser.error("prerendered plots are only kept with use_render_cache_disk = True in config")
+
+    # Dataframes of the plots, built as the app builds them
+    og_cdlDF = load_cdl_data()
+    plot_cache.set_data_version(compute_data_version(og_cdlDF))
+    cdlDF = filter_maps(og_cdlDF)
+    if use_aggregate_tables:
+        aggregates = load_aggregate_tables()
+        series_score_diffs = apply_cdl_schema(build_series_summaries_from_aggregates(aggregates))
+        team_summaries_DF = build_team_summaries_from_aggregates(aggregates)
+    else:
+        series_score_diffs = apply_cdl_schema(build_series_summaries(og_cdlDF))
+        team_summaries_DF = build_team_summaries(cdlDF)
+    plot_pool.start({"cdlDF": cdlDF, "series_score_diffs": series_score_diffs, "team_summaries_DF": team_summaries_DF})
+
+    warmer = PlotWarmer(build_team_plot_requests(
+        cdlDF, series_score_diffs, team_summaries_DF, args.team_a_color, args.team_b_color
+    ))
+    for size in args.size:
+        for plot_function in [team_percent_maps_played, series_diff_ridge, score_diffs_ridge]:
+            warmer.warm(plot_function, tuple(int(x) if x.is_integer() else x for x in size))
+    warmer.warm_all()
+    n_batches = warmer.wait()
+    plot_pool.shutdown()
+    print(f"Prerendered {n_batches} batches of plots, {plot_cache.stats()['plots']} plots cached")
@@ -1,12 +1,25 @@
 
 # Imports
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib import cycler
+from matplotlib.colors import to_rgba
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.layout_engine import PlaceHolderLayoutEngine
+from matplotlib.patches import Circle
+from matplotlib.collections import PolyCollection
 from matplotlib.ticker import MultipleLocator
 import matplotlib.dates as mdates
 import math
+import threading
 import datetime as dt
+from contextlib import contextmanager
+
+# Import seaborn lazily, on the first plot render
+from utils.startup_profiler import lazy_import
+sns = lazy_import("seaborn")
 
 # Dictionary of color palettes by gamemode
 palettes = {
@@ -57,6 +70,90 @@ team_colors = {
 # PrizePicks Color Variable
 prizepicks_color = "purple"
 
+# Seaborn plotting context of every plot, ie. its font sizes
+plot_context = "notebook"
+
+# Seaborn theme of the ridgeline & veto plots: white, with transparent axes so ridges can overlap
+transparent_rc = {"axes.facecolor": (0, 0, 0, 0)}
+
+# Figure size & subplot layout of the ridgeline plots, with the team rows overlapping
+ridge_figsize = (7.48, 4.4)
+ridge_layout = dict(left = 0.0989, right = 0.9759, bottom = 0.1591, top = 0.9083, hspace = -0.4)
+
+# Opacity of the ridgeline bars
+ridge_alpha = 0.9
+
+
+# Lock between drawing plots in their styles & saving them, since matplotlib's rcParams are shared by every thread
+# Plots are drawn one at a time, and saved in parallel in the plotting context they were drawn in,
+# as tick spacing & tight layouts read font sizes when figures are saved
+class StyleLock:
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._drawing = False
+        self._n_waiting = 0
+        self._n_saving = 0
+        self._saved_params = {}
+
+    # Context manager to draw a plot, once no other plot is being drawn or saved
+    @contextmanager
+    def drawing(self):
+        with self._condition:
+            self._n_waiting += 1
+            self._condition.wait_for(lambda: not self._drawing and self._n_saving == 0)
+            self._n_waiting -= 1
+            self._drawing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._drawing = False
+                self._condition.notify_all()
+
+    # Context manager to save a plot, once no plot is being drawn or waiting to be drawn
+    # The first plot saving applies the plotting context, and the last one restores rcParams
+    @contextmanager
+    def saving(self):
+        with self._condition:
+            self._condition.wait_for(lambda: not self._drawing and self._n_waiting == 0)
+            if self._n_saving == 0:
+                params = sns.plotting_context(plot_context)
+                self._saved_params = {key: mpl.rcParams[key] for key in params}
+                mpl.rcParams.update(params)
+            self._n_saving += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._n_saving -= 1
+                if self._n_saving == 0:
+                    mpl.rcParams.update(self._saved_params)
+                    self._condition.notify_all()
+
+# Style lock shared by every plot, ie. with style_lock.saving(): fig.savefig(...)
+style_lock = StyleLock()
+
+
+# Context manager to draw a plot in a seaborn theme, as sns.set_theme(style = style, rc = rc) would,
+# but only until the plot is drawn, so themes never bleed into other plots
+@contextmanager
+def plot_style(style: str, rc: dict = None):
+    params = {
+        **sns.plotting_context(plot_context),
+        **sns.axes_style(style, {"font.family": "sans-serif"}),
+        "axes.prop_cycle": cycler("color", sns.color_palette("deep")),
+        **(rc or {})
+    }
+    with style_lock.drawing(), mpl.rc_context(params):
+        yield
+
+
+# Function to create a figure & its axes in the current plot style, ie. fig, axs = create_figure(1, 2)
+def create_figure(*args, **kwargs):
+    fig = Figure()
+    return fig, fig.subplots(*args, **kwargs)
+
 
 # Function to adjust score diff ticks based on gamemode and current range
 def adjust_score_diff_ticks(gamemode: str, min_x: int, max_x: int):
@@ -107,43 +204,46 @@ def team_score_diffs(
             ][['match_id', 'map_name', 'score_diff']].drop_duplicates()
         
 
-    # Create the figure
-    fig, ax = plt.subplots()
+    # Create the figure, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, ax = create_figure()
 
-    # Histogram for Hardpoint
-    if gamemode_input == "Hardpoint":
+        # Histogram for Hardpoint
+        if gamemode_input == "Hardpoint":
           
-        # Plot the histogram
-        sns.histplot(data = queried_df, x = "score_diff", binwidth = 50, 
-                     binrange = (-250, 250), color = team_color)
+            # Plot the histogram
+            sns.histplot(data = queried_df, x = "score_diff", binwidth = 50, 
+                         binrange = (-250, 250), color = team_color, ax = ax)
 
-        # Get max y
-        queried_df['bin'] = pd.cut(queried_df['score_diff'], bins = range(-250, 300, 50))
-        max_y = max(queried_df['bin'].value_counts())
+            # Get max y
+            queried_df['bin'] = pd.cut(queried_df['score_diff'], bins = range(-250, 300, 50))
+            max_y = max(queried_df['bin'].value_counts())
 
-    # Bar chart for SnD & Control
-    else:
+        # Bar chart for SnD & Control
+        else:
         
-        # Plot the bar chart
-        sns.histplot(data = queried_df, x = "score_diff", discrete = True, 
-             binrange = gamemode_bin_ranges[gamemode_input], 
-             color = team_color)
+            # Plot the bar chart
+            sns.histplot(data = queried_df, x = "score_diff", discrete = True, 
+                 binrange = gamemode_bin_ranges[gamemode_input], 
+                 color = team_color, ax = ax)
         
-        # Get max y
-        max_y = 0 if queried_df.empty else max(queried_df["score_diff"].value_counts())
+            # Get max y
+            max_y = 0 if queried_df.empty else max(queried_df["score_diff"].value_counts())
         
-    # Set y-axis to integer values only
-    step_y = 1 if max_y < 6 else 2
-    y_axis_ticks = range(0, max_y + 1, step_y)
-    plt.yticks(y_axis_ticks)
+        # Set y-axis to integer values only
+        step_y = 1 if max_y < 6 else 2
+        y_axis_ticks = range(0, max_y + 1, step_y)
+        ax.set_yticks(y_axis_ticks)
         
-    # Styling
-    ax.set_xlabel("")
-    ax.set_ylabel("")
+        # Styling
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+
+        # Set ticks for Search & Destroy
+        if gamemode_input == "Search & Destroy":
+            ax.set_xticks([-6, -3, 0, 3, 6])
 
-    # Set ticks for Search & Destroy
-    if gamemode_input == "Search & Destroy":
-        plt.xticks([-6, -3, 0, 3, 6])
+    return fig
 
 
 # Team % of Maps Played by Mode
@@ -160,9 +260,6 @@ def team_percent_maps_played(
         (team_summaries_input["total"] != 0)
     ]
 
-    # Create figure
-    fig, ax = plt.subplots()
-
     # Create chart labels
     total = queried_df['total'].sum()
     chart_labels = []
@@ -171,17 +268,23 @@ def team_percent_maps_played(
             f"{row['map_name']}\n{row['total'] * 100 / total:.0f}%"
         )
 
-    # Pie Chart
-    ax.pie(queried_df["total"], labels = chart_labels,
-           labeldistance = 1.25, colors = palettes[gamemode_input], 
-           textprops = dict(family = "Segoe UI"))
-    
-    # Create donut by adding white inner circle with smaller radius
-    my_circle = plt.Circle( (0,0), 0.65, color = 'white')
-    ax.add_artist(my_circle)
-    
-    # Margins
-    plt.margins(0.05)
+    # Create figure, in the theme of the ridgelines beside it
+    with plot_style("white", transparent_rc):
+        fig, ax = create_figure()
+
+        # Pie Chart
+        ax.pie(queried_df["total"], labels = chart_labels,
+               labeldistance = 1.25, colors = palettes[gamemode_input], 
+               textprops = dict(family = "Segoe UI"))
+        
+        # Create donut by adding white inner circle with smaller radius
+        my_circle = Circle( (0,0), 0.65, color = 'white')
+        ax.add_artist(my_circle)
+        
+        # Margins
+        ax.margins(0.05)
+
+    return fig
 
 
 # Team Distribution of Series Differentials
@@ -193,19 +296,22 @@ def team_series_diffs(series_score_diffs_input: pd.DataFrame,
         series_score_diffs_input["team"] == team_input
     ]
 
-    # Create figure
-    fig, ax = plt.subplots()
+    # Create figure, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, ax = create_figure()
 
-    # Bar chart
-    sns.histplot(data = queried_df, x = "series_score_diff", 
-                 discrete = True, color = team_color)
+        # Bar chart
+        sns.histplot(data = queried_df, x = "series_score_diff", 
+                     discrete = True, color = team_color, ax = ax)
 
-    # Styling
-    ax.set_xlabel("")
-    ax.set_ylabel("")
+        # Styling
+        ax.set_xlabel("")
+        ax.set_ylabel("")
 
-    # Set margins
-    plt.margins(0.05)
+        # Set margins
+        ax.margins(0.05)
+
+    return fig
 
 
 # Player Kills vs Time by Map & Mode
@@ -214,9 +320,6 @@ def player_kills_vs_time(
         gamemode_input: str, cur_line: float, map_input = "All"
 ):
     
-    # Set seaborn theme
-    sns.set_theme(style = "darkgrid")
-
     # If user selected all maps
     if map_input == "All":
         
@@ -236,34 +339,37 @@ def player_kills_vs_time(
             (cdlDF_input["map_name"] == map_input)
             ]
     
-    # Create figure with gridspec
-    f, axs = plt.subplots(1, 2, sharey = True, gridspec_kw = 
-                          dict(width_ratios=[2, 0.4], wspace = 0.05))
+    # Create figure with gridspec, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, axs = create_figure(1, 2, sharey = True, gridspec_kw = 
+                           dict(width_ratios=[2, 0.4], wspace = 0.05))
 
-    # Scatterplot
-    sns.scatterplot(queried_df, x = "match_date", y = "kills", ax=axs[0], 
-                    color = team_color)
-    axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
-
-    # Boxplot
-    sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
-                color = team_color, showfliers = False)
-    sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], color = team_color)
-    axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
-
-    # X- & Y-Axis Labels
-    axs[0].set_ylabel("Kills", family = "Segoe UI")
-    axs[1].set_ylabel("")
-    axs[1].set_xticks([])
-
-    # Date Ticks
-    formatter = mdates.DateFormatter('%b %d')
-    axs[0].xaxis.set_major_formatter(formatter)
-
-    # Scale and style
-    min_x = scale_time_axis(queried_df, axs[0])
-    y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
-    style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
+        # Scatterplot
+        sns.scatterplot(queried_df, x = "match_date", y = "kills", ax=axs[0], 
+                        color = team_color)
+        axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+
+        # Boxplot
+        sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
+                    color = team_color, showfliers = False)
+        sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], color = team_color)
+        axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+
+        # X- & Y-Axis Labels
+        axs[0].set_ylabel("Kills", family = "Segoe UI")
+        axs[1].set_ylabel("")
+        axs[1].set_xticks([])
+
+        # Date Ticks
+        formatter = mdates.DateFormatter('%b %d')
+        axs[0].xaxis.set_major_formatter(formatter)
+
+        # Scale and style
+        min_x = scale_time_axis(queried_df, axs[0])
+        y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
+        style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
+
+    return fig
     
 
 # Player Kills vs Score Differential by Map & Mode
@@ -272,9 +378,6 @@ def player_kills_vs_score_diff(
         gamemode_input: str, cur_line: float, map_input = "All"
 ):
     
-    # Set seaborn theme
-    sns.set_theme(style = "darkgrid")
-
     # If user selected all maps
     if map_input == "All":
         
@@ -294,33 +397,36 @@ def player_kills_vs_score_diff(
             (cdlDF_input["map_name"] == map_input)
             ]
         
-    # Create figure with gridspec
-    f, axs = plt.subplots(1, 2, gridspec_kw = dict(width_ratios=[2, 0.4], wspace = 0.05), sharey = True)
-
-    # Scatterplot
-    sns.scatterplot(queried_df, x = "score_diff", y = "kills", ax=axs[0], 
+    # Create figure with gridspec, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, axs = create_figure(1, 2, gridspec_kw = dict(width_ratios=[2, 0.4], wspace = 0.05), sharey = True)
+
+        # Scatterplot
+        sns.scatterplot(queried_df, x = "score_diff", y = "kills", ax=axs[0], 
+                        color = team_color)
+        sns.regplot(queried_df, x = "score_diff", y = "kills", lowess = True, ax=axs[0], 
                     color = team_color)
-    sns.regplot(queried_df, x = "score_diff", y = "kills", lowess = True, ax=axs[0], 
-                color = team_color)
-    axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
-    # axs[0].axvline(x = 0, color = "orange", linestyle = '--')
+        axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+        # axs[0].axvline(x = 0, color = "orange", linestyle = '--')
 
-    # Boxplot
-    sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
-                color = team_color, showfliers = False)
-    sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], 
-                  color = team_color)
-    axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+        # Boxplot
+        sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
+                    color = team_color, showfliers = False)
+        sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], 
+                      color = team_color)
+        axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
 
-    # X- & Y-Axis Label
-    axs[0].set_ylabel("Kills", family = "Segoe UI")
-    axs[1].set_ylabel("")
-    axs[1].set_xticks([])
+        # X- & Y-Axis Label
+        axs[0].set_ylabel("Kills", family = "Segoe UI")
+        axs[1].set_ylabel("")
+        axs[1].set_xticks([])
 
-    # Scale and style
-    min_x = scale_score_diff_axis(queried_df, axs[0], gamemode_input)
-    y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
-    style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
+        # Scale and style
+        min_x = scale_score_diff_axis(queried_df, axs[0], gamemode_input)
+        y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
+        style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
+
+    return fig
 
 
 # Player Maps 1 - 3 Kills vs Time
@@ -329,42 +435,42 @@ def player_1_thru_3_kills_vs_time(
         team_color: str, cur_line: float
 ):
     
-    # Set seaborn theme
-    sns.set_theme(style = "darkgrid")
-    
     # Filter data for selected player
     queried_df = map_1_thru_3_totals_df_input[(map_1_thru_3_totals_df_input["player"] == player_input)]
 
     # Convert match_date column to dt.datetime
 
-    # Create figure with gridspec
-    f, axs = plt.subplots(1, 2, sharey = True, gridspec_kw = 
-                          dict(width_ratios=[2, 0.4], wspace = 0.05))
+    # Create figure with gridspec, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, axs = create_figure(1, 2, sharey = True, gridspec_kw = 
+                           dict(width_ratios=[2, 0.4], wspace = 0.05))
     
-    # Scatterplot
-    sns.scatterplot(queried_df, x = "match_date", y = "kills", ax=axs[0], 
-                    color = team_color)
-    axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+        # Scatterplot
+        sns.scatterplot(queried_df, x = "match_date", y = "kills", ax=axs[0], 
+                        color = team_color)
+        axs[0].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+
+        # Boxplot
+        sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
+                    color = team_color, showfliers = False)
+        sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], color = team_color)
+        axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
 
-    # Boxplot
-    sns.boxplot(queried_df, y =  "kills", fill = False, ax=axs[1], 
-                color = team_color, showfliers = False)
-    sns.stripplot(queried_df, y = "kills", jitter = 0.05, ax=axs[1], color = team_color)
-    axs[1].axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+        # X- & Y-Axis Labels
+        axs[1].set_ylabel("Maps 1 - 3 Kills", labelpad = 6, family = "Segoe UI")
+        axs[1].set_xticks([])
+        axs[1].set_ylabel("")
 
-    # X- & Y-Axis Labels
-    axs[1].set_ylabel("Maps 1 - 3 Kills", labelpad = 6, family = "Segoe UI")
-    axs[1].set_xticks([])
-    axs[1].set_ylabel("")
+        # Date Ticks
+        formatter = mdates.DateFormatter('%b %d')
+        axs[0].xaxis.set_major_formatter(formatter)
 
-    # Date Ticks
-    formatter = mdates.DateFormatter('%b %d')
-    axs[0].xaxis.set_major_formatter(formatter)
+        # Scale and style
+        min_x = scale_time_axis(queried_df, axs[0])
+        y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
+        style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
 
-    # Scale and style
-    min_x = scale_time_axis(queried_df, axs[0])
-    y_pad = scale_kills_axis(queried_df, axs[0], cur_line)
-    style_player_plot(axs[0], min_x, y_pad, player_input, cur_line)
+    return fig
 
 
 # Player Kills by Map & Mode
@@ -372,34 +478,35 @@ def player_kills_by_map(
         cdlDF_input: pd.DataFrame, player_input: str, 
         gamemode_input: str, cur_line: float):
     
-    # Set seaborn theme
-    sns.set_theme(style = "darkgrid")
-    
     # Filter data & sort by map name
     queried_df = cdlDF_input[
         (cdlDF_input["player"] == player_input) &
         (cdlDF_input["gamemode"] == gamemode_input)] \
-        .sort_values("map_name")
-
-    # Create figure with gridspec
-    f, ax = plt.subplots()
-
-    # Boxplots
-    sns.boxplot(queried_df, x = "map_name", y =  "kills", 
-                hue = "map_name", showfliers = False, fill = False,
-                palette = palettes[gamemode_input])
-    sns.stripplot(queried_df, x = "map_name", y =  "kills", 
-                  hue = "map_name", jitter = 0.05, 
-                  palette = palettes[gamemode_input])
-    ax.axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
-
-    # Y-Axis Label
-    ax.set_ylabel("Kills", family = "Segoe UI")
-
-    # Scale and style
-    min_x = ax.get_xlim()[0] + ((ax.get_xlim()[1] - ax.get_xlim()[0]) * 0.02)
-    y_pad = scale_kills_axis(queried_df, ax, cur_line)
-    style_player_plot(ax, min_x, y_pad, player_input, cur_line)
+        .sort_values("map_name") \
+        .astype({"map_name": str})
+
+    # Create figure with gridspec, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, ax = create_figure()
+
+        # Boxplots
+        sns.boxplot(queried_df, x = "map_name", y =  "kills", 
+                    hue = "map_name", showfliers = False, fill = False,
+                    palette = palettes[gamemode_input], ax = ax)
+        sns.stripplot(queried_df, x = "map_name", y =  "kills", 
+                      hue = "map_name", jitter = 0.05, 
+                      palette = palettes[gamemode_input], ax = ax)
+        ax.axhline(y = cur_line, color = prizepicks_color, linestyle = '--')
+
+        # Y-Axis Label
+        ax.set_ylabel("Kills", family = "Segoe UI")
+
+        # Scale and style
+        min_x = ax.get_xlim()[0] + ((ax.get_xlim()[1] - ax.get_xlim()[0]) * 0.02)
+        y_pad = scale_kills_axis(queried_df, ax, cur_line)
+        style_player_plot(ax, min_x, y_pad, player_input, cur_line)
+
+    return fig
     
     
 # Player Kills by Mapset
@@ -407,9 +514,6 @@ def player_kills_by_mapset(
         cdlDF_input: pd.DataFrame, player_input: str, 
         map_1_input = "All", map_2_input = "All", map_3_input = "All"):
     
-    # Set seaborn theme
-    sns.set_theme(style = "darkgrid")
-
     # Get map lists for filtering
     if map_1_input == "All":
         hp_maps = ["All", "6 Star", "Highrise", "Invasion", "Karachi", "Rio"]
@@ -435,40 +539,99 @@ def player_kills_by_mapset(
         (cdlDF_input['player'] == player_input)
     ].sort_values('map_name', ignore_index = True)
 
-    # Create figure
-    fig, ax = plt.subplots()
+    # Create figure, in seaborn's darkgrid theme
+    with plot_style("darkgrid"):
+        fig, ax = create_figure()
+
+        # Boxplots
+        sns.boxplot(queried_df, x = 'gamemode', y = 'kills', showfliers = False,
+                    fill = False, hue = 'gamemode',
+                    palette = palettes["Control"], ax = ax)
+        sns.stripplot(queried_df, x = "gamemode", y =  "kills", 
+                      hue = "gamemode", jitter = 0.05, 
+                      palette = palettes["Control"], ax = ax)
+    
+        # Get X Tick Labels
+        label_1 = f'{map_1_input} HP' if map_1_input != "All" else "Hardpoint"
+        label_2 = f'{map_2_input} SnD' if map_2_input != "All" else "Search & Destroy"
+        label_3 = f'{map_3_input} Ctrl' if map_3_input != "All" else "Control"
+
+        # X Ticks & Y-Axis Label
+        ax.set_xticks(ticks = ['Hardpoint', 'Search & Destroy', 'Control'],
+                      labels = [label_1, label_2, label_3])
+        ax.set_ylabel("Kills", family = "Segoe UI")
+
+        # Scale and style
+        y_pad = scale_kills_axis(queried_df, ax, 0)
+        style_player_plot(ax, 0, y_pad, player_input, 0)
+
+    return fig
+    
+    
+# Function to create the figure of a ridgeline plot, with one row per team
+# The rows overlap, so the figure keeps ridge_layout when it is saved, rather than a tight layout
+def create_ridge_figure():
+    fig = Figure(figsize = ridge_figsize)
+    fig.set_layout_engine(PlaceHolderLayoutEngine(adjust_compatible = True, colorbar_gridspec = True))
+    axs = fig.subplots(2, 1, sharex = True, sharey = True)
+    fig.subplots_adjust(**ridge_layout)
+    return fig, axs
+
+
+# Function to get the bin edges of a ridgeline histogram, as seaborn's histplot bins it
+# Discrete bins are centered on each whole number in bin_range, and other bins are binwidth wide
+def ridge_bin_edges(bin_range: tuple, binwidth: float = None):
+    if binwidth is None:
+        return np.arange(bin_range[0] - 0.5, bin_range[1] + 1.5)
+    return np.arange(bin_range[0], bin_range[1] + binwidth, binwidth)
+
+
+# Function to get the values of a ridgeline plot & the row of each value, with team_icon_x's values on top
+def ridge_rows(queried_df: pd.DataFrame, column: str, team_icon_y: str):
+    values = queried_df[column].to_numpy(dtype = float, na_value = np.nan)
+    rows = (queried_df["team_icon"] == team_icon_y).to_numpy(dtype = int)
+    return values, rows
+
+
+# Function to count the values of both ridgeline rows into bins in one pass
+# rows is 0 for values of the top row & 1 for the bottom row, and values outside the edges are dropped,
+# so each row is counted as np.histogram would count it
+# Returns the counts, with one row per team, and the number of values in each row
+def ridge_counts(values: np.ndarray, rows: np.ndarray, bin_edges: np.ndarray):
+    n_bins = len(bin_edges) - 1
+    bins = np.searchsorted(bin_edges, values, side = "right") - 1
+    bins[values == bin_edges[-1]] = n_bins - 1
+    in_range = (bins >= 0) & (bins < n_bins)
+    counts = np.bincount(rows[in_range] * n_bins + bins[in_range], minlength = 2 * n_bins).reshape(2, n_bins)
+    return counts, np.bincount(rows[~np.isnan(values)], minlength = 2)
+
+
+# Function to draw the rows of a ridgeline plot as bars on their axes, styled as seaborn's histplot draws them
+# Each row's bars are one collection, rather than a patch per bin, and rows without values are left empty,
+# as histplot leaves them, with only the line at their bottom
+def draw_ridge_rows(axs, counts: np.ndarray, row_sizes: np.ndarray, bin_edges: np.ndarray, colors: list):
+    widths = np.diff(bin_edges)
+    for ax, row_counts, row_size, color in zip(axs, counts, row_sizes, colors):
+        if row_size > 0:
+            bars = PolyCollection(
+                [[(left, 0), (left, height), (left + width, height), (left + width, 0)]
+                 for left, width, height in zip(bin_edges[:-1], widths, row_counts)],
+                facecolors = to_rgba(color, ridge_alpha), edgecolors = mpl.rcParams["patch.edgecolor"],
+                linewidths = mpl.rcParams["patch.linewidth"]
+            )
+            bars.sticky_edges.y.append(0)
+            ax.add_collection(bars)
+            ax.autoscale_view()
+
+        # Add a horizontal line to the bottom of the row
+        ax.axhline(y = 0, color = color, lw = 2, clip_on = False)
+
 
-    # Boxplots
-    sns.boxplot(queried_df, x = 'gamemode', y = 'kills', showfliers = False,
-                fill = False, hue = 'gamemode',
-                palette = palettes["Control"])
-    sns.stripplot(queried_df, x = "gamemode", y =  "kills", 
-                  hue = "gamemode", jitter = 0.05, 
-                  palette = palettes["Control"])
-    
-    # Get X Tick Labels
-    label_1 = f'{map_1_input} HP' if map_1_input != "All" else "Hardpoint"
-    label_2 = f'{map_2_input} SnD' if map_2_input != "All" else "Search & Destroy"
-    label_3 = f'{map_3_input} Ctrl' if map_3_input != "All" else "Control"
-
-    # X Ticks & Y-Axis Label
-    ax.set_xticks(ticks = ['Hardpoint', 'Search & Destroy', 'Control'],
-                  labels = [label_1, label_2, label_3])
-    ax.set_ylabel("Kills", family = "Segoe UI")
-
-    # Scale and style
-    y_pad = scale_kills_axis(queried_df, ax, 0)
-    style_player_plot(ax, 0, y_pad, player_input, 0)
-    
-    
 # Ridgeline Plot of Team Score Diffs
 def score_diffs_ridge(        
         cdlDF_input: pd.DataFrame, team_icon_x: str, team_icon_y: str,
         x_color: str, y_color: str, gamemode_input: str, map_input = "All"
 ):
-    
-    # Set seaborn theme
-    sns.set_theme(style="white", rc={"axes.facecolor": (0, 0, 0, 0)})
 
     # If user selected all maps    
     if map_input == "All":
@@ -490,62 +653,46 @@ def score_diffs_ridge(
             (cdlDF_input['map_name'] == map_input)
         ][['match_id', 'team_icon', 'map_name', 'score_diff']].drop_duplicates()
 
-    # Reorder team factor levels for graphing
-    queried_df['team_icon'] = pd.Categorical(
-        queried_df['team_icon'], 
-        categories = [team_icon_x, team_icon_y]
-        )
+    # Get teams & colors for each row
+    teams = [team_icon_x, team_icon_y]
+    colors = [x_color, y_color]
 
-    # Initialize the FacetGrid object
-    g = sns.FacetGrid(queried_df, row = "team_icon", hue = "team_icon", 
-                      aspect = 3.4, height = 2.2, palette = [x_color, y_color])
-    
-    # Histogram for Hardpoint
+    # Bins of 50 for Hardpoint, and one bin per round or point for SnD & Control
     if gamemode_input == "Hardpoint":
-
-        # Plot the histogram
-        g.map_dataframe(sns.histplot, x = "score_diff", binwidth = 50, 
-                        binrange = (-300, 250), alpha = 0.9)
-        
-        # Get max y
-        queried_df['bin'] = pd.cut(queried_df['score_diff'], bins = range(-250, 300, 50))
-        max_y = max(queried_df[['bin', "team_icon"]].value_counts())
-        
-    # Bar chart for SnD & Control
+        bin_edges = ridge_bin_edges((-300, 250), binwidth = 50)
     else:
+        bin_edges = ridge_bin_edges(gamemode_bin_ranges[gamemode_input])
 
-        # Plot the bar chart
-        g.map_dataframe(sns.histplot, x = "score_diff", discrete = True, 
-                        binrange = gamemode_bin_ranges[gamemode_input], 
-                        alpha = 0.9)
-        
-        # Get max y
-        max_y = 0 if queried_df.empty else max(queried_df[["score_diff", "team_icon"]].value_counts())
-        
-    # Add a horizontal line to the bottom of each plot
-    g.map(plt.axhline, y = 0, lw = 2, clip_on = False)
+    # Count both teams' score diffs into the bins
+    values, rows = ridge_rows(queried_df, "score_diff", team_icon_y)
+    counts, row_sizes = ridge_counts(values, rows, bin_edges)
 
-    # Get teams for labeling
-    teams = [team_icon_x, team_icon_y]
+    # Get max y, from the tallest bar of either team
+    max_y = counts.max()
 
-    # Use min_x value for labels
-    min_x = min_x_values_by_gamemode[gamemode_input]
+    # Create the figure with one row per team, in seaborn's white theme with transparent axes
+    with plot_style("white", transparent_rc):
+        fig, axs = create_ridge_figure()
 
-    # Add team name to each axs and change font
-    for i, ax in enumerate(g.axes.flat):
-        ax.text(min_x, max_y * 0.05, teams[i], family = "Segoe UI", 
-                fontweight ='bold', fontsize = 15, 
-                color = ax.lines[-1].get_color())
-        
-    # Overlap subplots
-    g.figure.subplots_adjust(hspace = -0.4)
+        # Plot each team's row
+        draw_ridge_rows(axs, counts, row_sizes, bin_edges, colors)
 
-    # Styling
-    g.set_titles("")
-    g.set(yticks = [], ylabel = "", xlabel = "", 
-          xticks = gamemode_xticks[gamemode_input])
-    g.despine(bottom = True, left = True)
-    g.tick_params(labelfontfamily = "Segoe UI")
+        # Use min_x value for labels
+        min_x = min_x_values_by_gamemode[gamemode_input]
+
+        # Add team name to each row and change font
+        for ax, team, color in zip(axs, teams, colors):
+            ax.text(min_x, max_y * 0.05, team, family = "Segoe UI", 
+                    fontweight ='bold', fontsize = 15, color = color)
+
+        # Styling
+        for ax in axs:
+            ax.set(yticks = [], ylabel = "", xlabel = "", 
+                   xticks = gamemode_xticks[gamemode_input])
+            ax.tick_params(labelfontfamily = "Segoe UI")
+        sns.despine(fig = fig, bottom = True, left = True)
+
+    return fig
 
 
 # Ridgeline Plot of Team Series Diffs
@@ -559,30 +706,11 @@ def series_diff_ridge(
     queried_df = series_score_diffs_input[
         (series_score_diffs_input["team_icon"] == team_icon_x) |
         (series_score_diffs_input["team_icon"] == team_icon_y)
-    ].copy()
-
-    # Reorder team factor levels for graphing
-    queried_df['team_icon'] = pd.Categorical(
-        queried_df['team_icon'], 
-        categories = [team_icon_x, team_icon_y]
-        )
-    
-    # Set seaborn theme
-    sns.set_theme(style="white", rc={"axes.facecolor": (0, 0, 0, 0)})
-
-    # Initialize the FacetGrid object
-    g = sns.FacetGrid(queried_df, row = "team_icon", hue = "team_icon", 
-                      aspect = 3.4, height = 2.2, palette = [x_color, y_color])
-    
-    # Plot the bar chart
-    g.map_dataframe(sns.histplot, x = "series_score_diff", discrete = True, 
-                    binrange = (-5, 3), alpha = 0.9)
-    
-    # Add a horizontal line to the bottom of each plot
-    g.map(plt.axhline, y = 0, lw = 2, clip_on = False)
+    ]
 
-    # Get teams for labeling
+    # Get teams & colors for each row
     teams = [team_icon_x, team_icon_y]
+    colors = [x_color, y_color]
 
     # Get min_x
     if team_icon_x == "TOR" or team_icon_y == "TOR":
@@ -590,24 +718,34 @@ def series_diff_ridge(
     else:
         min_x = -6
 
-    # Add team name to each axs
-    for i, ax in enumerate(g.axes.flat):
-        ax.text(min_x, 0.45, teams[i], family = "Segoe UI", 
-                fontweight ='bold', fontsize = 15,
-                color = ax.lines[-1].get_color())
-        
-    # Overlap subplots
-    g.figure.subplots_adjust(hspace = -0.4)
+    # Count both teams' series diffs, with one bin per map
+    bin_edges = ridge_bin_edges((-5, 3))
+    values, rows = ridge_rows(queried_df, "series_score_diff", team_icon_y)
+    counts, row_sizes = ridge_counts(values, rows, bin_edges)
 
-    # Styling
-    g.set_titles("")
-    g.set(xticks = [-3, 0, 3], yticks = [], ylabel = "", xlabel = "")
-    g.despine(bottom = True, left = True)
-    g.tick_params(labelfontfamily = "Segoe UI")
+    # Create the figure with one row per team, in seaborn's white theme with transparent axes
+    with plot_style("white", transparent_rc):
+        fig, axs = create_ridge_figure()
+
+        # Plot each team's row
+        draw_ridge_rows(axs, counts, row_sizes, bin_edges, colors)
+
+        # Add team name to each row
+        for ax, team, color in zip(axs, teams, colors):
+            ax.text(min_x, 0.45, team, family = "Segoe UI", 
+                    fontweight ='bold', fontsize = 15, color = color)
+
+        # Styling
+        for ax in axs:
+            ax.set(xticks = [-3, 0, 3], yticks = [], ylabel = "", xlabel = "")
+            ax.tick_params(labelfontfamily = "Segoe UI")
+        sns.despine(fig = fig, bottom = True, left = True)
+
+    return fig
 
 
 # Helper function to scale time axis of player plots
-def scale_time_axis(queried_df: pd.DataFrame, ax: plt.axes):
+def scale_time_axis(queried_df: pd.DataFrame, ax: Axes):
         
     # Set & Scale X-Axis, if necessary
     match_dates = queried_df["match_date"].to_list()
@@ -644,7 +782,7 @@ def scale_time_axis(queried_df: pd.DataFrame, ax: plt.axes):
 
 
 # Helper function to scale score_diff axis of player plots
-def scale_score_diff_axis(queried_df: pd.DataFrame, ax: plt.axes, gamemode_input: str):
+def scale_score_diff_axis(queried_df: pd.DataFrame, ax: Axes, gamemode_input: str):
     
     # Get min_x and x_range
     score_diffs = queried_df["score_diff"].to_list()
@@ -678,7 +816,7 @@ def scale_score_diff_axis(queried_df: pd.DataFrame, ax: plt.axes, gamemode_input
 
 
 # Helper function to scale kills axis of player plots
-def scale_kills_axis(queried_df: pd.DataFrame, ax: plt.axes, cur_line: float):
+def scale_kills_axis(queried_df: pd.DataFrame, ax: Axes, cur_line: float):
     
     # Get y_range and y_pad for cur_line
     kills = queried_df["kills"].to_list()
@@ -726,7 +864,7 @@ def scale_kills_axis(queried_df: pd.DataFrame, ax: plt.axes, cur_line: float):
 
 # Helper function to style player plots
 def style_player_plot(
-        ax: plt.axes, min_x: float, y_pad: float,
+        ax: Axes, min_x: float, y_pad: float,
         player_input: str, cur_line: float
         ):
     
@@ -741,21 +879,17 @@ def style_player_plot(
 
     # Label current line from PrizePicks
     if cur_line != 0:
-        plt.sca(ax)
         bbox = {'facecolor': prizepicks_color, 'alpha': 0.5, 
                 'pad': 0.4, 'boxstyle': 'round'}
-        plt.text(min_x, cur_line + y_pad, "Line: " + str(cur_line), bbox = bbox, color = "white")
+        ax.text(min_x, cur_line + y_pad, "Line: " + str(cur_line), bbox = bbox, color = "white")
 
     # Set margins
-    plt.margins(0.05)
+    ax.margins(0.05)
 
 
 # Function to create bar chart of vetoes based on user inputs
 def chart_vetoes(vetoes_input: pd.DataFrame, team_input: str, select_input: str, gamemode_input: str, team_color: str, stage_min = 1, stage_max = 4):
 
-    # Set seaborn theme
-    sns.set_theme(style="white", rc={"axes.facecolor": (0, 0, 0, 0)})
-
     # Query vetoes
     queried_df = vetoes_input[
         (vetoes_input["team"] == team_input) &
@@ -765,31 +899,34 @@ def chart_vetoes(vetoes_input: pd.DataFrame, team_input: str, select_input: str,
         (vetoes_input["stage"] <= stage_max))
     ]
 
-    # Create the figure
-    fig, ax = plt.subplots()
+    # Create the figure, in seaborn's white theme with transparent axes
+    with plot_style("white", transparent_rc):
+        fig, ax = create_figure()
 
-    # Get order
-    bar_order = queried_df.map_name.value_counts().to_frame() \
-        .reset_index().sort_values(["count", "map_name"], ascending = [False, True]).map_name
+        # Get order
+        bar_order = queried_df.map_name.value_counts().to_frame() \
+            .reset_index().sort_values(["count", "map_name"], ascending = [False, True]).map_name
 
-    # Plot the bar chart
-    sns.countplot(data = queried_df, y = "map_name", color = team_color, 
-                    order = bar_order)
-
-    # Add counts
-    ax.bar_label(ax.containers[0], padding = 4, family = "Segoe UI")
-
-    # Color bars
-    total = queried_df["map_name"].value_counts().sum()
-    threshold = 1 / len(queried_df["map_name"].value_counts())
-    for i in range(len(ax.containers[0])):
-        if ax.containers[0].datavalues[i] / total < threshold:
-            ax.containers[0][i].set_color("#ced4da")
+        # Plot the bar chart
+        sns.countplot(data = queried_df, y = "map_name", color = team_color, 
+                        order = bar_order, ax = ax)
+
+        # Add counts
+        ax.bar_label(ax.containers[0], padding = 4, family = "Segoe UI")
+
+        # Color bars
+        total = queried_df["map_name"].value_counts().sum()
+        threshold = 1 / len(queried_df["map_name"].value_counts())
+        for i in range(len(ax.containers[0])):
+            if ax.containers[0].datavalues[i] / total < threshold:
+                ax.containers[0][i].set_color("#ced4da")
         
-    # Styling
-    plt.xticks([])
-    plt.xlabel("")
-    plt.ylabel("")
-    plt.yticks(family = "Segoe UI")
-    sns.despine(bottom = True, left = True)
-    plt.margins(0.05)
\ No newline at end of file
+        # Styling
+        ax.set_xticks([])
+        ax.set_xlabel("")
+        ax.set_ylabel("")
+        ax.tick_params(axis = "y", labelfontfamily = "Segoe UI")
+        sns.despine(ax = ax, bottom = True, left = True)
+        ax.margins(0.05)
+
+    return fig
\ No newline at end of file
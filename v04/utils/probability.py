@@ -0,0 +1,92 @@
+# Import zlib
+import zlib
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import kills index & props board
+from utils.kills_index import all_maps
+from utils.props_board import flatten_sorted_arrays, search_flat_arrays, find_board_rows
+
+# Simulated kills per index key
+n_samples = 2000
+
+# Weight of a gamemode's mean kills in each player's kill rate, in maps
+prior_maps = 3
+
+
+# Function to get the random seed of a data version, so every process simulates the same kills
+def seed_from_version(data_version: str):
+    return zlib.crc32(str(data_version).encode())
+
+# Function to simulate kills of every key, from its number of maps & total kills
+# Kills are Poisson, with a rate drawn from a Gamma posterior: the key's kills per map,
+# shrunk towards prior_means by prior_maps maps, so thin samples stay smooth
+# The Gamma - Poisson mixture is sampled in one draw, as a negative binomial
+# Returns an array of sorted simulated kills per key
+def simulate_kills(n_maps: np.ndarray, total_kills: np.ndarray, prior_means: np.ndarray,
+                   rng: np.random.Generator, n_samples: int = n_samples):
+    shape = np.maximum(prior_maps * prior_means + total_kills, 1e-6)
+    rate = prior_maps + n_maps
+    kills = rng.negative_binomial(shape[:, None], (rate / (rate + 1))[:, None], size = (len(n_maps), n_samples))
+    return np.sort(kills, axis = 1)
+
+# Function to build a probability index: the sorted simulated kills of every key of a kills index
+# group_of maps a key to its prior group, ie. gamemode, and is_group_key marks the keys whose maps
+# make up the group's mean kills per map
+def build_probability_index(kills_index: dict, group_of, is_group_key, seed: int, n_samples: int = n_samples):
+    keys = list(kills_index)
+
+    # Maps & total kills of every key, leaving out NaN kills
+    n_valid = np.array([np.searchsorted(kills_index[key], np.inf, side = "right") for key in keys], dtype = "int64")
+    total_kills = np.array([kills_index[key][:n].sum() for key, n in zip(keys, n_valid)], dtype = "float64")
+
+    # Mean kills per map of every group
+    keys_df = pd.DataFrame({"group": [group_of(key) for key in keys], "n_maps": n_valid, "kills": total_kills})
+    group_sums = keys_df[[is_group_key(key) for key in keys]].groupby("group").sum()
+    group_means = (group_sums["kills"] / group_sums["n_maps"].clip(lower = 1)) \
+        .reindex(keys_df["group"]) \
+        .fillna(0) \
+        .to_numpy()
+
+    samples = simulate_kills(n_valid, total_kills, group_means, np.random.default_rng(seed), n_samples)
+    span = (samples.max() if samples.size > 0 else 0) + 2
+    return {
+        "keys": {key: segment_id for segment_id, key in enumerate(keys)},
+        "span": span,
+        "n_samples": n_samples,
+        "samples": flatten_sorted_arrays(list(samples), 0, span)
+    }
+
+# Function to build the probability indexes of the maps & Maps 1 - 3 kills indexes
+# Map keys are shrunk towards their gamemode's mean, Maps 1 - 3 keys towards the mean of every player
+def build_probability_indexes(kills_index: dict, kills_1_thru_3_index: dict, data_version: str):
+    seed = seed_from_version(data_version)
+    return build_probability_index(kills_index, lambda key: key[1], lambda key: key[2] == all_maps, seed), \
+        build_probability_index(kills_1_thru_3_index, lambda key: 0, lambda key: True, seed + 1)
+
+# Function to estimate the probabilities of the Over, Under & a push for lines of many keys at once
+# NaN lines have NaN probabilities
+def estimate_ou_probabilities(probability_index: dict, segment_ids: np.ndarray, lines: np.ndarray):
+    span, samples = probability_index["span"], probability_index["samples"]
+    below = search_flat_arrays(samples, segment_ids, lines, 0, span, "left")
+    at_or_below = search_flat_arrays(samples, segment_ids, lines, 0, span, "right")
+    n = probability_index["n_samples"]
+    probabilities = np.vstack([n - at_or_below, below, at_or_below - below]) / n
+    return np.where(np.isnan(lines), np.nan, probabilities)
+
+# Function to estimate the probabilities of every prop on the board in one pass
+# Props the player never played have NaN probabilities
+def estimate_props_board(props_df: pd.DataFrame, probability_index: dict, probability_1_thru_3_index: dict,
+                         map_input = "All"):
+    lines = props_df["line"].to_numpy(dtype = "float64")
+
+    probabilities = np.full((3, len(props_df)), np.nan)
+    for is_1_thru_3, index in [(True, probability_1_thru_3_index), (False, probability_index)]:
+        rows, segment_ids = find_board_rows(props_df, index["keys"], is_1_thru_3, map_input)
+        probabilities[:, rows] = estimate_ou_probabilities(index, segment_ids, lines[rows])
+
+    board = props_df.copy()
+    board["p_over"], board["p_under"], board["p_push"] = probabilities
+    return board
@@ -0,0 +1,156 @@
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import setup
+from utils.setup.setup import map_nums_to_gamemode
+
+# Gamemodes of props 1 - 3; prop 0 is Maps 1 - 3 Kills
+prop_gamemodes = {prop: map_nums_to_gamemode[prop] for prop in [1, 2, 3]}
+
+# Columns added to the props by evaluate_props_board
+board_columns = ["over_under", "percentage", "overs", "unders", "hooks", "ou_streak_result", "ou_streak"]
+
+
+# Function to flatten sorted arrays, one per index key, into one sorted array
+# Array i is offset by i * span, so the lines of every key are searched with one np.searchsorted
+def flatten_sorted_arrays(arrays: list, low: float, span: float):
+    lengths = np.array([len(array) for array in arrays], dtype = "int64")
+    offsets = np.arange(len(arrays)) * span
+    values = np.repeat(offsets, lengths) + (np.concatenate(arrays + [np.empty(0)]) - low)
+    return values, np.r_[0, np.cumsum(lengths)][:-1], lengths
+
+# Function to search lines in the flattened arrays of their index keys
+# Same positions as np.searchsorted on each key's array, with NaN lines sorted past every value
+def search_flat_arrays(flat: tuple, segment_ids: np.ndarray, lines: np.ndarray, low: float, span: float, side: str):
+    values, starts, lengths = flat
+    queries = segment_ids * span + np.clip(lines - low, -0.5, span - 1.5)
+    positions = np.searchsorted(values, queries, side = side) - starts[segment_ids]
+    return np.minimum(positions, lengths[segment_ids])
+
+# Function to build a board index from a kills index & its O/U streak index, for evaluate_props_board
+# Flattens the sorted kills, and the running mins & maxes of the streak entries, of every key
+def build_board_index(kills_index: dict, ou_streak_index: dict):
+    keys = list(kills_index)
+    kills_arrays = [kills_index[key] for key in keys]
+    streak_entries = [ou_streak_index[key] for key in keys]
+
+    # NaN kills are sorted to the end of each array, and count as maps played
+    n_valid = [np.searchsorted(kills, np.inf, side = "right") for kills in kills_arrays]
+    valid_kills = [kills[:n] for kills, n in zip(kills_arrays, n_valid)]
+
+    # Every value lies in [low, high]: kills, and negated running mins
+    high = max(np.concatenate(valid_kills + [np.zeros(1)]).max(), 0)
+    low = -high
+    span = high - low + 2
+
+    # Running mins & maxes stay ascending within each key, skipping NaN kills
+    running_arrays = {}
+    for name, position in [("neg_running_min", 1), ("running_max", 2)]:
+        values, starts, lengths = flatten_sorted_arrays(
+            [np.nan_to_num(entry[position], nan = low) for entry in streak_entries], low, span
+        )
+        running_arrays[name] = (np.maximum.accumulate(values) if len(values) > 0 else values, starts, lengths)
+
+    return {
+        "keys": {key: segment_id for segment_id, key in enumerate(keys)},
+        "low": low,
+        "span": span,
+        "n_maps": np.array([len(kills) for kills in kills_arrays], dtype = "int64"),
+        "kills": flatten_sorted_arrays(valid_kills, low, span),
+        "last_kills": np.array([entry[0] for entry in streak_entries], dtype = "float64"),
+        **running_arrays
+    }
+
+# Function to count overs, unders & hooks, and the current O/U streak, for lines of many keys at once
+# Same results as count_ou & count_ou_streak for each key & line
+def count_board_ou(board_index: dict, segment_ids: np.ndarray, lines: np.ndarray):
+    low, span = board_index["low"], board_index["span"]
+    n_maps = board_index["n_maps"][segment_ids]
+    n_valid = board_index["kills"][2][segment_ids]
+
+    # A NaN line is past every valid kill, and at or below every NaN kill
+    below = search_flat_arrays(board_index["kills"], segment_ids, lines, low, span, "left")
+    at_or_below = np.where(
+        np.isnan(lines), n_maps, search_flat_arrays(board_index["kills"], segment_ids, lines, low, span, "right")
+    )
+
+    # Over streaks last while kills >= line, Under streaks while kills <= line
+    is_streak_over = board_index["last_kills"][segment_ids] - lines >= 0
+    streaks = np.where(
+        is_streak_over,
+        search_flat_arrays(board_index["neg_running_min"], segment_ids, -lines, low, span, "right"),
+        search_flat_arrays(board_index["running_max"], segment_ids, lines, low, span, "right")
+    )
+    return n_valid - at_or_below, below, at_or_below - below, n_maps, is_streak_over, streaks
+
+# Function to find the props of a board index, and their segments in it
+# Keys are the player for Maps 1 - 3 props, and (player, gamemode, map_input) for props 1 - 3
+def find_board_rows(props_df: pd.DataFrame, index_keys: dict, is_1_thru_3: bool, map_input = "All"):
+    props = props_df["prop"].to_numpy()
+    rows = np.flatnonzero((props == 0) == is_1_thru_3)
+    segment_ids = np.array([
+        index_keys.get(player if is_1_thru_3 else (player, prop_gamemodes.get(prop), map_input), -1)
+        for player, prop in zip(props_df["player"].to_numpy()[rows], props[rows])
+    ], dtype = "int64")
+    return rows[segment_ids >= 0], segment_ids[segment_ids >= 0]
+
+# Function to count overs, unders, hooks & maps played, and the current O/U streak, of every prop in one pass
+# Props 1 - 3 are counted on their map's gamemode & map_input, prop 0 on Maps 1 - 3 Kills
+# Rows the player never played have 0 maps
+def count_props_board(props_df: pd.DataFrame, board_index: dict, board_1_thru_3_index: dict, map_input = "All"):
+    lines = props_df["line"].to_numpy(dtype = "float64")
+
+    counts = np.zeros((6, len(props_df)), dtype = "int64")
+    for is_1_thru_3, index in [(True, board_1_thru_3_index), (False, board_index)]:
+        rows, segment_ids = find_board_rows(props_df, index["keys"], is_1_thru_3, map_input)
+        counts[:, rows] = count_board_ou(index, segment_ids, lines[rows])
+
+    board = props_df.copy()
+    for column, values in zip(["overs", "unders", "hooks", "n_maps", "is_streak_over", "streak"], counts):
+        board[column] = values
+    board["is_streak_over"] = board["is_streak_over"].astype(bool)
+    return board
+
+# Function to recommend a bet from overs & unders, as summarize_ou does
+# Returns whether the recommendation is the Over, and its rounded percentage
+def recommend_ou(overs: np.ndarray, unders: np.ndarray, n_maps: np.ndarray):
+    over_percentage = np.round(overs / np.maximum(n_maps, 1) * 100).astype("int64")
+    under_percentage = np.round(unders / np.maximum(n_maps, 1) * 100).astype("int64")
+    is_over = over_percentage >= under_percentage
+    return is_over, np.where(is_over, over_percentage, under_percentage)
+
+# Function to evaluate every prop on the board in one pass: O/U stats & O/U streak of every row
+# Columns match query_player_ou & query_player_ou_streak, or their Maps 1 - 3 versions
+def evaluate_props_board(props_df: pd.DataFrame, board_index: dict, board_1_thru_3_index: dict, map_input = "All"):
+    counts = count_props_board(props_df, board_index, board_1_thru_3_index, map_input)
+    played = counts["n_maps"].to_numpy() > 0
+    is_over, percentage = recommend_ou(counts["overs"].to_numpy(), counts["unders"].to_numpy(), counts["n_maps"].to_numpy())
+
+    board = props_df.copy()
+    board["over_under"] = np.where(played, np.where(is_over, "Over", "Under"), "Never Played")
+    for column, values in [("percentage", percentage), ("overs", counts["overs"]), 
+                           ("unders", counts["unders"]), ("hooks", counts["hooks"])]:
+        board[column] = np.where(played, np.asarray(values).astype(str), "")
+    board["ou_streak_result"] = np.where(played, np.where(counts["is_streak_over"], "Over", "Under"), "Never Played")
+    board["ou_streak"] = np.where(played, counts["streak"].to_numpy().astype(str), " ")
+    return board
+
+# Function to build a lookup of the evaluated props, keyed by (player, prop)
+# Keeps the first row of a player & prop, as get_line does
+def build_props_board_lookup(board: pd.DataFrame):
+    board_lookup = {}
+    for key, *values in zip(zip(board["player"], board["prop"]), *(board[column] for column in board_columns)):
+        board_lookup.setdefault(key, dict(zip(board_columns, values)))
+    return board_lookup
+
+# Function to get a player's O/U stats from the props board lookup
+# Same output as query_player_ou & query_player_1_thru_3_ou
+def query_board_ou(board_lookup: dict, player_input: str, prop: int):
+    row = board_lookup[(player_input, prop)]
+    return row["over_under"], row["percentage"], row["overs"], row["unders"], row["hooks"]
+
+# Function to get a player's O/U streak from the props board lookup
+def query_board_ou_streak(board_lookup: dict, player_input: str, prop: int):
+    row = board_lookup[(player_input, prop)]
+    return row["ou_streak_result"], row["ou_streak"]
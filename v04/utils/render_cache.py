@@ -0,0 +1,303 @@
+# Import os, json, base64, hashlib, inspect, shutil, asyncio, threading & weakref
+import os
+import json
+import base64
+import hashlib
+import inspect
+import shutil
+import asyncio
+import threading
+import weakref
+from collections import OrderedDict
+
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Import shiny
+# cached_plot builds on render.plot's internals & shiny's private ResolvedId,
+# so shiny is pinned to an exact version in requirements.txt
+from shiny import render
+from shiny.session import require_active_session
+from shiny.types import MISSING
+from shiny._namespaces import ResolvedId
+
+# Import render pool
+from utils.render_pool import plot_pool
+
+# Import render cache settings from config
+from utils.setup.config import render_cache_max_mb, render_cache_path, use_render_cache_disk
+from utils.setup.snapshot import get_snapshot_file
+
+
+# Function to hash the contents of a dataframe, series or array
+def hash_array_like(value):
+    digest = hashlib.sha1()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        digest.update(repr((type(value).__name__, frame.shape, list(frame.columns),
+                            [str(dtype) for dtype in frame.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index = True).to_numpy().tobytes())
+    else:
+        digest.update(repr((value.shape, str(value.dtype))).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    return digest.hexdigest()
+
+
+# Cache of rendered plots, keyed by plot function, arguments, data version & output size
+# PNG bytes are kept in an LRU bounded by max_mb, and optionally written to a disk tier,
+# ie. plot_cache.get(key) after plot_cache.put(key, img)
+class RenderCache:
+
+    def __init__(self, max_mb: float = render_cache_max_mb, disk_path: str = None):
+        self._entries = OrderedDict()
+        self._n_bytes = 0
+        self._max_bytes = max_mb * 1024 * 1024
+        self._disk_path = disk_path
+        self._data_version = None
+        self._frame_hashes = {}
+        self._output_sizes = self._read_output_sizes()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+        # Called with the plot function & output size the first time a plot is rendered at a new size,
+        # ie. by the cache warmer
+        self.on_new_output_size = None
+
+    # Function to set the data version of cached plots
+    # Plots of another data version are dropped from memory & disk
+    def set_data_version(self, data_version: str):
+        with self._lock:
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+            self.clear()
+            if self._disk_path is not None and os.path.isdir(self._disk_path):
+                for folder in os.listdir(self._disk_path):
+                    if folder != self._disk_folder() and os.path.isdir(os.path.join(self._disk_path, folder)):
+                        shutil.rmtree(os.path.join(self._disk_path, folder), ignore_errors = True)
+
+    # Function to drop every plot kept in memory
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._n_bytes = 0
+
+    # Function to normalize a plot argument into a string for the cache key
+    # Dataframes, series & arrays are hashed by content, and their hashes memoized while they are alive
+    def normalize_argument(self, value):
+        if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+            memo = self._frame_hashes.get(id(value))
+            if memo is None or memo[0]() is not value:
+                memo = (weakref.ref(value), hash_array_like(value))
+                self._frame_hashes[id(value)] = memo
+                weakref.finalize(value, self._frame_hashes.pop, id(value), None)
+            return memo[1]
+        if isinstance(value, (list, tuple)):
+            return "(" + ", ".join(self.normalize_argument(item) for item in value) + ")"
+        if isinstance(value, dict):
+            return "{" + ", ".join(
+                f"{key!r}: {self.normalize_argument(item)}" for key, item in sorted(value.items(), key = repr)
+            ) + "}"
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return repr(value)
+
+    # Function to build the cache key of a plot: the plot function, its arguments bound to its signature
+    # with defaults filled in, the data version, and the output width, height, pixel ratio, alt text & save options
+    def make_key(self, plot_function, args: tuple, kwargs: dict, output_size: tuple, save_kwargs: dict = None):
+        bound = inspect.signature(plot_function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = repr((
+            plot_function.__module__, plot_function.__qualname__,
+            [(name, self.normalize_argument(value)) for name, value in bound.arguments.items()],
+            self._data_version, output_size, self.normalize_argument(save_kwargs or {})
+        ))
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    # Function to check whether a plot is cached, in memory or on disk
+    def contains(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self._disk_path is not None and \
+            os.path.exists(os.path.join(self._disk_path, self._disk_folder(), key + ".json"))
+
+    # Function to get a cached plot as image data, from memory or else from disk
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._keep(key, entry)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        png, attributes = entry
+        return {"src": "data:image/png;base64," + base64.b64encode(png).decode("utf-8"), **attributes}
+
+    # Function to cache the image data of a rendered plot
+    def put(self, key: str, img: dict):
+        png = base64.b64decode(img["src"].split(",", 1)[1])
+        attributes = {name: value for name, value in img.items() if name != "src"}
+        self._keep(key, (png, attributes))
+        self._write_disk(key, (png, attributes))
+
+    # Function to keep a plot in memory, evicting the least recently used plots over max_mb
+    def _keep(self, key: str, entry: tuple):
+        with self._lock:
+            if key in self._entries:
+                self._n_bytes -= len(self._entries.pop(key)[0])
+            self._entries[key] = entry
+            self._n_bytes += len(entry[0])
+            while self._n_bytes > self._max_bytes and len(self._entries) > 1:
+                self._n_bytes -= len(self._entries.popitem(last = False)[1][0])
+
+    # Function to get the name of a plot function, as its output sizes are stored
+    def _plot_name(self, plot_function):
+        return f"{plot_function.__module__}.{plot_function.__qualname__}"
+
+    # Function to record the output size of a rendered plot, as (width, height, pixelratio)
+    # Sizes are kept with the disk tier, so they are known again after a restart
+    def record_output_size(self, plot_function, output_size: tuple):
+        with self._lock:
+            sizes = self._output_sizes.setdefault(self._plot_name(plot_function), [])
+            if output_size in sizes:
+                return
+            sizes.append(output_size)
+            self._write_output_sizes()
+        if self.on_new_output_size is not None:
+            self.on_new_output_size(plot_function, output_size)
+
+    # Function to get the output sizes a plot function has been rendered at
+    def output_sizes(self, plot_function):
+        with self._lock:
+            return list(self._output_sizes.get(self._plot_name(plot_function), []))
+
+    # Function to read the recorded output sizes from the disk tier
+    def _read_output_sizes(self):
+        if self._disk_path is None:
+            return {}
+        try:
+            with open(os.path.join(self._disk_path, "output_sizes.json")) as f:
+                return {name: [tuple(size) for size in sizes] for name, sizes in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    # Function to write the recorded output sizes to the disk tier
+    def _write_output_sizes(self):
+        if self._disk_path is None:
+            return
+        filepath = os.path.join(self._disk_path, "output_sizes.json")
+        try:
+            os.makedirs(self._disk_path, exist_ok = True)
+            with open(filepath + ".tmp", "w") as f:
+                json.dump(self._output_sizes, f)
+            os.replace(filepath + ".tmp", filepath)
+        except OSError as e:
+            print(f"Could not write output sizes to the render cache ({e})")
+
+    # Function to get the disk tier folder of the current data version
+    def _disk_folder(self):
+        return hashlib.sha1(str(self._data_version).encode()).hexdigest()[:16]
+
+    # Function to read a plot from the disk tier: the PNG, and its image attributes beside it
+    def _read_disk(self, key: str):
+        if self._disk_path is None:
+            return None
+        filepath = os.path.join(self._disk_path, self._disk_folder(), key)
+        try:
+            with open(filepath + ".png", "rb") as f:
+                png = f.read()
+            with open(filepath + ".json") as f:
+                attributes = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return png, attributes
+
+    # Function to write a plot to the disk tier, through temporary files so readers never see half a plot
+    # The attributes are written last, as they mark the plot as complete
+    def _write_disk(self, key: str, entry: tuple):
+        if self._disk_path is None:
+            return
+        filepath = os.path.join(self._disk_path, self._disk_folder(), key)
+        png, attributes = entry
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok = True)
+            for extension, mode, content in [(".png", "wb", png), (".json", "w", json.dumps(attributes))]:
+                tmp_filepath = f"{filepath}{extension}.{threading.get_ident()}.tmp"
+                with open(tmp_filepath, mode) as f:
+                    f.write(content)
+                os.replace(tmp_filepath, filepath + extension)
+        except OSError as e:
+            print(f"Could not write plot to the render cache ({e})")
+
+    # Function to get the number of plots & megabytes kept in memory, and the hits & misses so far
+    def stats(self):
+        with self._lock:
+            return {"plots": len(self._entries), "mb": self._n_bytes / 1024 / 1024,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Render cache shared by every session
+plot_cache = RenderCache(disk_path = get_snapshot_file(render_cache_path) if use_render_cache_disk else None)
+
+# Plots being rendered, by cache key, so sessions asking for the same plot at once share one render
+_rendering = {}
+
+
+# Renderer for plots served from the render cache, used in place of @render.plot
+# The decorated function returns the plot to render as a partial, ie. partial(score_diffs_ridge, cdlDF, ...),
+# and the plot function only runs when the same plot, at the same size, is not cached yet
+# Plots are rendered in the render pool, and sessions asking for a plot that is already rendering await it
+# This overrides render.plot's render method and reads the output size from the session's clientdata inputs,
+# by their resolved ids, as render.plot does in shiny 0.10.2, so check both when upgrading shiny
+class cached_plot(render.plot):
+
+    async def render(self):
+        session = require_active_session(None)
+        inputs = session.root_scope().input
+        name = session.ns(self.output_id)
+        pixelratio = inputs[ResolvedId(".clientdata_pixelratio")]()
+
+        request = await self.fn()
+        if request is None:
+            return None
+
+        # Output size from the decorator, or else from the output container, as in @render.plot
+        user_size = tuple(size if size is not MISSING else None for size in (self.width, self.height))
+        output_size = tuple(
+            size if size is not None else inputs[ResolvedId(f".clientdata_output_{name}_{dimension}")]()
+            for size, dimension in zip(user_size, ["width", "height"])
+        )
+        key = plot_cache.make_key(request.func, request.args, request.keywords,
+                                  output_size + (pixelratio, ), {"alt": self.alt, **self.kwargs})
+        img = plot_cache.get(key)
+        if img is not None:
+            return img
+
+        task = _rendering.get(key)
+        if task is None:
+            task = asyncio.ensure_future(render_and_cache(key, request, output_size, pixelratio, user_size,
+                                                          self.alt, **self.kwargs))
+            _rendering[key] = task
+            task.add_done_callback(lambda _: _rendering.pop(key, None))
+        return await asyncio.shield(task)
+
+
+# Function to render a plot off the event loop, in the render pool, and store it in the render cache
+async def render_and_cache(key: str, request, output_size: tuple, pixelratio: float, user_size: tuple,
+                           alt: str = None, **kwargs):
+    img = await plot_pool.render(request, output_size, pixelratio, user_size, alt, **kwargs)
+    if img is not None:
+        plot_cache.put(key, img)
+        plot_cache.record_output_size(request.func, output_size + (pixelratio, ))
+    return img
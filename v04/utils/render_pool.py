@@ -0,0 +1,237 @@
+# Import os, time, asyncio, threading & multiprocessing
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+# Import shiny
+# PlotSizeInfo & try_render_matplotlib are the helpers @render.plot saves figures with,
+# so plots rendered here are sized & encoded exactly like @render.plot's
+# They are shiny internals, so shiny is pinned to an exact version in requirements.txt
+from shiny.render._try_render_plot import PlotSizeInfo, try_render_matplotlib
+
+# Import style lock
+from utils.plots import style_lock
+
+# Import render pool settings from config
+from utils.setup.config import render_pool_workers, render_pool_max_running
+
+# Dataframes the plots are drawn from, set in each worker process by init_worker
+_worker_frames = {}
+
+
+# Name of a dataframe argument, sent to workers in place of the dataframe itself
+class FrameName:
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+# Function to render a plot request to image data, as @render.plot does
+# output_size is the image size in pixels, and user_size the width & height given to the decorator, if any
+# Figures are saved under the style lock, so renders in other threads never save them in a plot's style
+def render_plot(request, output_size: tuple, pixelratio: float = 1, user_size: tuple = (None, None),
+                alt: str = None, **kwargs):
+    fig = request()
+    with style_lock.saving():
+        ok, img = try_render_matplotlib(
+            fig,
+            plot_size_info = PlotSizeInfo(
+                container_size_px_fn = (lambda: output_size[0], lambda: output_size[1]),
+                user_specified_size_px = user_size,
+                pixelratio = pixelratio
+            ),
+            allow_global = True,
+            alt = alt,
+            **kwargs
+        )
+    if not ok:
+        raise TypeError(f"{request.func.__name__} did not draw a matplotlib figure")
+    return None if img is None else dict(img)
+
+# Function to set up a worker process: render off-screen, and keep the dataframes the plots are drawn from
+# Workers exit on their own once the app's process is gone, ie. when it was killed before shutting them down
+def init_worker(frames: dict, parent_pid: int = None):
+    import matplotlib
+    matplotlib.use("Agg")
+    _worker_frames.update(frames)
+    if parent_pid is not None:
+        threading.Thread(target = exit_with_parent, args = (parent_pid, ), daemon = True).start()
+
+# Function to stop a worker process once its parent, the app's process, has exited
+def exit_with_parent(parent_pid: int, interval_s: float = 1):
+    while os.getppid() == parent_pid:
+        time.sleep(interval_s)
+    os._exit(0)
+
+# Function to render a batch of plots of one plot function in a worker process
+# Each plot is (args, keywords), with dataframe arguments as their names in the worker's frames
+def render_batch(plot_function, batch: list, output_size: tuple, pixelratio: float = 1,
+                 user_size: tuple = (None, None), alt: str = None, save_kwargs: dict = None):
+    imgs = []
+    for args, keywords in batch:
+        args = [_worker_frames[arg.name] if isinstance(arg, FrameName) else arg for arg in args]
+        keywords = {name: _worker_frames[arg.name] if isinstance(arg, FrameName) else arg
+                    for name, arg in keywords.items()}
+        imgs.append(render_plot(partial(plot_function, *args, **keywords), output_size, pixelratio, user_size,
+                                alt, **(save_kwargs or {})))
+    return imgs
+
+# Function to do nothing in a worker process, to start it
+def start_worker():
+    return None
+
+# Function to start a process pool of plot workers, which get the dataframes once, when they start
+# Spawned workers only start when tasks are submitted to them, so every worker is started here,
+# and the first plots submitted never wait on them, ie. from the event loop
+# Returns the pool, and the name to send in place of each dataframe
+def start_worker_pool(frames: dict, n_workers: int):
+    executor = ProcessPoolExecutor(
+        max_workers = n_workers,
+        mp_context = multiprocessing.get_context("spawn"),
+        initializer = init_worker,
+        initargs = (frames, os.getpid())
+    )
+    for future in [executor.submit(start_worker) for _ in range(n_workers)]:
+        future.result()
+    return executor, {id(frame): FrameName(name) for name, frame in frames.items()}
+
+# Function to swap the dataframes of a plot request for their names in the workers' frames
+# Dataframes the workers do not have, ie. small filtered ones, are sent as they are
+def pack_request(request, frame_names: dict):
+    return [frame_names.get(id(arg), arg) for arg in request.args], \
+        {name: frame_names.get(id(arg), arg) for name, arg in request.keywords.items()}
+
+
+# Renders plots in worker processes, so matplotlib never blocks the event loop that serves every session
+# At most max_running plots are in the pool at once, and later requests wait their turn without blocking
+# Until the pool is started, or if a worker crashes, plots are rendered in threads of the app's process
+# Pools given a get_frames function start themselves in the background on their first render
+class RenderPool:
+
+    def __init__(self, n_workers: int = render_pool_workers, max_running: int = render_pool_max_running):
+        self._n_workers = n_workers
+        self._executor = None
+        self._frames = None
+        self._frame_names = {}
+        self._get_frames = None
+        self._starting = False
+        self._slots = asyncio.Semaphore(max_running)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+    # Function to start the worker processes with the dataframes the plots are drawn from
+    # The pool is only used once every worker has started
+    def start(self, frames: dict):
+        with self._start_lock:
+            self._publish(frames, *start_worker_pool(frames, self._n_workers))
+
+    # Function to swap in a started pool of workers, stopping the previous one
+    def _publish(self, frames: dict, executor: ProcessPoolExecutor, frame_names: dict):
+        with self._lock:
+            previous = self._executor
+            self._frames, self._frame_names = frames, frame_names
+            self._executor = executor
+        if previous is not None:
+            previous.shutdown(wait = False, cancel_futures = True)
+
+    # Function to start the worker processes on first use, with the dataframes returned by get_frames
+    # Nothing is built or copied into workers until then
+    def start_on_first_use(self, get_frames):
+        self._get_frames = get_frames
+
+    # Function to start the worker processes now, if they are not running, ie. from the cache warmer's thread
+    # Returns the dataframes the workers hold
+    def ensure_started(self):
+        with self._start_lock:
+            if self._executor is None and self._get_frames is not None:
+                frames = self._get_frames()
+                self._publish(frames, *start_worker_pool(frames, self._n_workers))
+        return self._frames
+
+    # Function to start the worker processes in a background thread, once
+    def _start_in_background(self):
+        with self._lock:
+            if self._starting or self._get_frames is None:
+                return
+            self._starting = True
+
+        def start():
+            try:
+                self.ensure_started()
+            finally:
+                with self._lock:
+                    self._starting = False
+
+        threading.Thread(target = start, name = "render-pool", daemon = True).start()
+
+    # Function to send a batch of plot requests of one plot function to the workers, from any thread
+    # Returns a future of the batch's image data, or None if the workers are not running
+    def submit_batch(self, plot_function, requests: list, output_size: tuple, pixelratio: float = 1):
+        with self._lock:
+            executor, frame_names = self._executor, self._frame_names
+        if executor is None:
+            return None
+        batch = [pack_request(request, frame_names) for request in requests]
+        return executor.submit(render_batch, plot_function, batch, output_size, pixelratio)
+
+    # Function to render a plot request to image data in a worker process
+    async def render(self, request, output_size: tuple, pixelratio: float = 1, user_size: tuple = (None, None),
+                     alt: str = None, **kwargs):
+        executor, frame_names = self._executor, self._frame_names
+        if executor is None:
+            self._start_in_background()
+            return await self._render_in_thread(request, output_size, pixelratio, user_size, alt, **kwargs)
+
+        try:
+            async with self._slots:
+                imgs = await asyncio.get_running_loop().run_in_executor(
+                    executor, render_batch, request.func, [pack_request(request, frame_names)],
+                    output_size, pixelratio, user_size, alt, kwargs
+                )
+            return imgs[0]
+        except BrokenProcessPool:
+            print("A plot worker stopped, restarting the render pool")
+            with self._lock:
+                restart = self._executor is executor
+                if restart:
+                    self._executor = None
+            if restart and self._get_frames is not None:
+                self._start_in_background()
+            elif restart:
+                threading.Thread(target = self.start, args = (self._frames, ), daemon = True).start()
+            return await self._render_in_thread(request, output_size, pixelratio, user_size, alt, **kwargs)
+
+    # Function to render a plot request in a thread of the app's process, so the event loop is never blocked
+    # Figures are drawn & saved under the style lock, so renders in threads never mix their styles
+    async def _render_in_thread(self, request, output_size: tuple, pixelratio: float = 1,
+                                user_size: tuple = (None, None), alt: str = None, **kwargs):
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, partial(render_plot, request, output_size, pixelratio, user_size, alt, **kwargs)
+            )
+
+    # Function to stop the worker processes, waiting for them to exit, ie. when the app shuts down
+    # Plots not sent to the workers yet are dropped
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait = wait, cancel_futures = True)
+
+
+# Render pool shared by every session
+plot_pool = RenderPool()
+
+
+# Function to start the render pool on first use, when a session renders its first plot
+# The workers then start in the background with the dataframes from get_frames,
+# and plots are rendered in the app's process until they are ready
+def start_render_pool(get_frames):
+    if render_pool_workers < 1:
+        return
+    plot_pool.start_on_first_use(get_frames)
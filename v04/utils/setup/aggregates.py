@@ -0,0 +1,161 @@
+# Import argparse
+import argparse
+
+# Import pandas
+import pandas as pd
+
+# Import setup
+from utils.setup.setup import \
+    team_icons, removed_map_modes, fetch_data_version, format_data_version, \
+    summarize_series_results, summarize_team_records, count_wins_and_losses, compute_win_percentages
+
+# Import backends
+from utils.setup.backends import get_backend
+
+# Prefix of the aggregate tables in the database
+aggregate_prefix = "agg_"
+
+# SQL filter for map & mode combos removed from the map pool, as in filter_maps
+removed_map_modes_sql = " AND ".join(
+    f"NOT (gamemode = '{gamemode}' AND map_name = '{map_name}')"
+    for gamemode, map_name in removed_map_modes
+)
+
+# Aggregate tables, built in order, each one from the cdl_data table or an earlier aggregate
+# Plain tables rebuilt with CREATE TABLE AS, rather than materialized views, so the same SQL
+# runs on Postgres, SQLite and DuckDB
+aggregate_queries = {
+    # One row per match, map & team
+    "map_results": """
+        SELECT DISTINCT match_id, match_date, map_num, map_name, gamemode, team,
+            team_score, map_result, series_result
+        FROM cdl_data
+    """,
+
+    # One row per match & team, as in build_series_summaries
+    "series_results": f"""
+        SELECT match_id, match_date, team,
+            CAST(SUM(map_result) AS INTEGER) AS map_wins,
+            CAST(COUNT(*) - SUM(map_result) AS INTEGER) AS map_losses,
+            CAST(MAX(series_result) AS INTEGER) AS series_result
+        FROM {aggregate_prefix}map_results
+        GROUP BY match_id, match_date, team
+    """,
+
+    # Records by team, mode & map, over the current map pool, as in build_team_summaries
+    "team_map_records": f"""
+        SELECT team, gamemode, map_name,
+            CAST(SUM(map_result) AS INTEGER) AS wins,
+            CAST(COUNT(*) - SUM(map_result) AS INTEGER) AS losses,
+            CAST(COUNT(*) AS INTEGER) AS total
+        FROM (
+            SELECT DISTINCT match_id, team, map_name, gamemode, map_result
+            FROM {aggregate_prefix}map_results
+            WHERE {removed_map_modes_sql}
+        ) maps
+        GROUP BY team, gamemode, map_name
+    """,
+
+    # Records by team & mode, over the current map pool
+    "team_mode_records": f"""
+        SELECT team, gamemode,
+            CAST(SUM(map_result) AS INTEGER) AS wins,
+            CAST(COUNT(*) - SUM(map_result) AS INTEGER) AS losses,
+            CAST(COUNT(*) AS INTEGER) AS total
+        FROM (
+            SELECT DISTINCT match_id, team, map_name, gamemode, map_result
+            FROM {aggregate_prefix}map_results
+            WHERE {removed_map_modes_sql}
+        ) maps
+        GROUP BY team, gamemode
+    """,
+
+    # Data version the aggregates were built from, kept last
+    "metadata": """
+        SELECT COUNT(*) AS n_rows, MAX(match_id) AS max_match_id, MAX(match_date) AS max_match_date
+        FROM cdl_data
+    """
+}
+
+# Aggregate tables loaded for the app's summaries
+summary_tables = ["series_results", "team_map_records", "team_mode_records"]
+
+
+# Function to create or rebuild every aggregate table from cdl_data
+def refresh_aggregate_tables(backend = None):
+    backend = backend or get_backend()
+    for name, query in aggregate_queries.items():
+        backend.execute(
+            f"DROP TABLE IF EXISTS {aggregate_prefix}{name}",
+            f"CREATE TABLE {aggregate_prefix}{name} AS {query}"
+        )
+
+# Function to read the data version the aggregate tables were built from
+def read_aggregate_version(backend):
+    try:
+        version_df = backend.read_sql(f"SELECT * FROM {aggregate_prefix}metadata")
+    except Exception:
+        return None
+    return format_data_version(*version_df.iloc[0])
+
+# Function to clean an aggregate table like clean_cdl_data cleans the raw data
+def clean_aggregate_table(aggregate_df: pd.DataFrame):
+    aggregate_df = aggregate_df.replace("Minnesota RØKKR", "Minnesota ROKKR")
+    if "match_date" in aggregate_df.columns:
+        aggregate_df["match_date"] = pd.to_datetime(aggregate_df["match_date"])
+    if "team" in aggregate_df.columns:
+        aggregate_df.insert(aggregate_df.columns.get_loc("team") + 1, "team_icon",
+                            aggregate_df["team"].map(team_icons))
+    return aggregate_df
+
+# Function to load aggregate tables, rebuilding them first if they are missing,
+# or were built from an older version of cdl_data
+def load_aggregate_tables(backend = None, refresh = False, names: list = summary_tables):
+    backend = backend or get_backend()
+    if refresh or read_aggregate_version(backend) != fetch_data_version(backend):
+        refresh_aggregate_tables(backend)
+    return {
+        name: clean_aggregate_table(backend.read_sql(f"SELECT * FROM {aggregate_prefix}{name}"))
+        for name in names
+    }
+
+# Function to build series summaries from the series_results aggregate
+# Same output as build_series_summaries on the full cdl data
+def build_series_summaries_from_aggregates(aggregates: dict):
+    series_results = aggregates["series_results"] \
+        [["match_id", "team", "team_icon", "map_wins", "map_losses", "match_date"]] \
+        .sort_values(["match_id", "team"], ignore_index = True)
+    return summarize_series_results(series_results)
+
+# Function to build team summaries from the team record aggregates
+# Same output as build_team_summaries on the filtered cdl data
+def build_team_summaries_from_aggregates(aggregates: dict):
+    team_records = []
+    for name, keys in [("team_map_records", ["team", "team_icon", "gamemode", "map_name"]),
+                       ("team_mode_records", ["team", "team_icon", "gamemode"])]:
+        records = aggregates[name].copy()
+        records["gamemode"] = \
+            pd.Categorical(records["gamemode"], categories = ['Hardpoint', 'Search & Destroy', 'Control'])
+        records = records.sort_values(keys, ignore_index = True)[keys + ["wins", "losses", "total"]]
+        records["win_percentage"] = compute_win_percentages(records["wins"], records["total"])
+        team_records.append(records)
+    return summarize_team_records(*team_records)
+
+# Function to compute CDL standings from the series_results aggregate
+# Same output as build_current_standings
+def build_current_standings_from_aggregates(aggregates: dict, start_date: str):
+    series_results = aggregates["series_results"]
+    return count_wins_and_losses(series_results[series_results["match_date"] >= start_date], "team", "series_result")
+
+
+# Rebuild the aggregate tables from the command line, from the v04 folder:
+# python -m utils.setup.aggregates
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Rebuild the cdl aggregate tables")
+    parser.add_argument("--backend", default = None, help = "backend name, defaults to config")
+    args = parser.parse_args()
+
+    backend = get_backend(args.backend)
+    aggregate_names = [name for name in aggregate_queries if name != "metadata"]
+    for name, aggregate_df in load_aggregate_tables(backend, refresh = True, names = aggregate_names).items():
+        print(f"{aggregate_prefix}{name}: {len(aggregate_df)} rows")
@@ -0,0 +1,263 @@
+# Import os, re, sqlite3, argparse, and abc
+import os
+import re
+import sqlite3
+import argparse
+from abc import ABC, abstractmethod
+
+# Import pandas
+import pandas as pd
+
+# Import database settings from config
+from utils.setup.config import db_backend, db_password, db_file_paths
+
+# Environment variable to override the backend in config, ie. CDL_DB_BACKEND=duckdb
+backend_env_var = "CDL_DB_BACKEND"
+
+# Schema of the raw cdl_data table, shared by every backend
+cdl_data_columns = {
+    "match_id": "INTEGER",
+    "match_date": "DATE",
+    "match_day": "TEXT",
+    "player": "TEXT",
+    "team": "TEXT",
+    "map_num": "INTEGER",
+    "map_name": "TEXT",
+    "gamemode": "TEXT",
+    "kills": "INTEGER",
+    "deaths": "INTEGER",
+    "kd": "REAL",
+    "plus_minus": "INTEGER",
+    "dmg": "INTEGER",
+    "team_score": "INTEGER",
+    "map_result": "INTEGER",
+    "series_result": "INTEGER"
+}
+
+# Named parameters in queries, written as :name in every backend
+param_pattern = re.compile(r"(?<!:):(\w+)")
+
+
+# Base class for cdl database backends
+# Queries are written once, with :name parameters, and each backend
+# translates them to its own placeholder style
+# Backends must implement connect, so an incomplete backend fails when it is created
+class CDLBackend(ABC):
+
+    name = None
+
+    # Positional placeholder used when inserting rows
+    placeholder = "?"
+
+    # Function to open a connection to the database
+    @abstractmethod
+    def connect(self):
+        pass
+
+    # Function to translate :name parameters to the backend's placeholder style
+    def format_query(self, query: str):
+        return query
+
+    # Function to run a query and return the result as a pandas dataframe
+    def read_sql(self, query: str, params: dict = None):
+        conn = self.connect()
+        try:
+            return pd.read_sql_query(self.format_query(query), conn, params = params)
+        finally:
+            conn.close()
+
+    # Function to run statements that return nothing, ie. CREATE TABLE
+    def execute(self, *statements: str):
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Function to open a connection for writing, ie. creating the database file first
+    def connect_for_write(self):
+        return self.connect()
+
+    # Function to replace a table with the contents of a dataframe
+    def write_table(self, df: pd.DataFrame, table_name: str, columns: dict = None):
+        columns = columns or infer_column_types(df)
+        conn = self.connect_for_write()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+            cursor.execute(self.create_table_sql(table_name, columns))
+            placeholders = ", ".join([self.placeholder] * len(columns))
+            cursor.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+                to_records(df[list(columns)])
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # Function to build a CREATE TABLE statement from a dict of column types
+    def create_table_sql(self, table_name: str, columns: dict):
+        column_sql = ", ".join(f"{col} {col_type}" for col, col_type in columns.items())
+        return f"CREATE TABLE {table_name} ({column_sql})"
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+# Production backend: the PostgreSQL cdl_db
+class PostgresBackend(CDLBackend):
+
+    name = "postgres"
+    placeholder = "%s"
+
+    def __init__(self, database = "cdl_db", user = "postgres", password = db_password,
+                 host = "127.0.0.1", port = "5433"):
+        self.connect_kwargs = {
+            "database": database, "user": user, "password": password, "host": host, "port": port
+        }
+
+    def connect(self):
+        import psycopg2
+        return psycopg2.connect(**self.connect_kwargs)
+
+    def format_query(self, query: str):
+        return param_pattern.sub(r"%(\1)s", query)
+
+
+# Local file backend: a SQLite database, no server needed
+class SQLiteBackend(CDLBackend):
+
+    name = "sqlite"
+
+    def __init__(self, filepath = db_file_paths["sqlite"]):
+        self.filepath = resolve_path(filepath)
+
+    def connect(self):
+        return sqlite3.connect(self.filepath)
+
+    def connect_for_write(self):
+        os.makedirs(os.path.dirname(self.filepath), exist_ok = True)
+        return self.connect()
+
+    def __repr__(self):
+        return f"SQLiteBackend({self.filepath!r})"
+
+
+# Local file backend: a DuckDB database, which also runs the aggregations quickly
+class DuckDBBackend(CDLBackend):
+
+    name = "duckdb"
+
+    def __init__(self, filepath = db_file_paths["duckdb"]):
+        self.filepath = resolve_path(filepath)
+
+    def connect(self):
+        import duckdb
+        return duckdb.connect(self.filepath)
+
+    def format_query(self, query: str):
+        return param_pattern.sub(r"$\1", query)
+
+    # DuckDB returns dataframes natively, so skip the DB-API layer
+    def read_sql(self, query: str, params: dict = None):
+        conn = self.connect()
+        try:
+            return conn.execute(self.format_query(query), params).df()
+        finally:
+            conn.close()
+
+    def execute(self, *statements: str):
+        conn = self.connect()
+        try:
+            for statement in statements:
+                conn.execute(statement)
+        finally:
+            conn.close()
+
+    def connect_for_write(self):
+        os.makedirs(os.path.dirname(self.filepath), exist_ok = True)
+        return self.connect()
+
+    # Insert straight from the dataframe, without converting rows to python values
+    def write_table(self, df: pd.DataFrame, table_name: str, columns: dict = None):
+        columns = columns or infer_column_types(df)
+        conn = self.connect_for_write()
+        try:
+            conn.register("df_view", df[list(columns)])
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            conn.execute(self.create_table_sql(table_name, columns))
+            conn.execute(f"INSERT INTO {table_name} SELECT * FROM df_view")
+            conn.unregister("df_view")
+        finally:
+            conn.close()
+
+    def __repr__(self):
+        return f"DuckDBBackend({self.filepath!r})"
+
+
+# Dictionary of backends by name
+backends = {
+    backend.name: backend for backend in [PostgresBackend, SQLiteBackend, DuckDBBackend]
+}
+
+# Function to resolve a database file path relative to the v04 folder
+def resolve_path(filepath: str):
+    if os.path.isabs(filepath):
+        return filepath
+    v04_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(v04_dir, *filepath.split("/"))
+
+# Function to infer SQL column types from a dataframe
+def infer_column_types(df: pd.DataFrame):
+    columns = {}
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            columns[col] = "INTEGER"
+        elif pd.api.types.is_float_dtype(dtype):
+            columns[col] = "REAL"
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            columns[col] = "DATE"
+        else:
+            columns[col] = "TEXT"
+    return columns
+
+# Function to convert dataframe rows to plain python values for executemany
+# Dates are written as ISO strings, which every backend casts to DATE
+def to_records(df: pd.DataFrame):
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime("%Y-%m-%d")
+    df = df.astype(object).where(df.notna(), None)
+    return list(df.itertuples(index = False, name = None))
+
+# Function to get the configured backend, by name or from config / environment
+def get_backend(name: str = None, **kwargs):
+    name = name or os.environ.get(backend_env_var, db_backend)
+    if name not in backends:
+        raise ValueError(f"Unknown cdl backend '{name}', expected one of {list(backends)}")
+    return backends[name](**kwargs)
+
+# Function to copy the raw cdl_data table from one backend to another,
+# ie. from Postgres into a local DuckDB file for development & benchmarks
+def copy_cdl_data(source: CDLBackend, target: CDLBackend):
+    cdlDF = source.read_sql("SELECT * FROM cdl_data")
+    cdlDF['match_date'] = pd.to_datetime(cdlDF['match_date'])
+    target.write_table(cdlDF, "cdl_data", cdl_data_columns)
+    return len(cdlDF)
+
+
+# Copy the cdl data into a local file database, from the v04 folder:
+# python -m utils.setup.backends --source postgres --target duckdb
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Copy cdl_data between backends")
+    parser.add_argument("--source", default = "postgres", choices = list(backends))
+    parser.add_argument("--target", default = "duckdb", choices = list(backends))
+    args = parser.parse_args()
+
+    source, target = get_backend(args.source), get_backend(args.target)
+    n_rows = copy_cdl_data(source, target)
+    print(f"Copied {n_rows} rows from {source} to {target}")
@@ -1,3 +1,53 @@
 
 # PostgreSQL Password
-db_password = "1Oldsalt"
\ No newline at end of file
+db_password = "1Oldsalt"
+
+# Snapshot of the cleaned cdl data, loaded on startup instead of Postgres
+snapshot_path = "data/snapshots/cdl_data.parquet"
+
+# Snapshot of the Maps 1 - 3 Kill totals, updated with the cdl data snapshot
+totals_snapshot_path = "data/snapshots/adj_1_thru_3_totals.parquet"
+
+# Hours before a snapshot is checked against the database again
+snapshot_max_age_hours = 12
+
+# Database backend for the raw cdl data: "postgres", "sqlite" or "duckdb"
+# Override with the CDL_DB_BACKEND environment variable
+db_backend = "postgres"
+
+# Local database files used by the sqlite & duckdb backends
+db_file_paths = {
+    "sqlite": "data/cdl_db.sqlite",
+    "duckdb": "data/cdl_db.duckdb"
+}
+
+# Load series summaries, team summaries & standings from aggregate tables in the database,
+# instead of computing them from the full cdl data at startup
+use_aggregate_tables = False
+
+# History of scraped PrizePicks lines, replayed against results by the backtest
+lines_history_path = "data/prizepicks_lines.csv"
+
+# Megabytes of rendered plots kept in memory by the render cache
+render_cache_max_mb = 64
+
+# Also keep rendered plots on disk, so they survive restarts & are shared between app processes
+use_render_cache_disk = False
+render_cache_path = "data/render_cache"
+
+# Worker processes that render plots off the event loop, or 0 to render them in the app's process
+render_pool_workers = 2
+
+# Plots rendering in the worker processes at once. Later plots wait their turn without blocking other sessions
+render_pool_max_running = 4
+
+# Prerender the team-level plots into the render cache in the render pool, after the first session has loaded
+# Override with the CDL_WARM_PLOTS environment variable, or prerender them with python -m utils.plot_warmer
+warm_plot_cache = False
+
+# Output sizes to prerender, as (width, height, pixelratio), on top of the sizes sessions have rendered at,
+# ie. [(600, 400, 2)]
+warm_output_sizes = []
+
+# Also prerender the map ridgelines of every pair of teams, which are about 10x more plots
+warm_map_combinations = False
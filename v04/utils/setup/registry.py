@@ -0,0 +1,72 @@
+# Import time & threading
+import time
+import threading
+
+
+# Registry of derived dataframes, built on first access and then memoized
+# Builders take no arguments, and may read other entries of the registry,
+# ie. derived.register("rostersDF", lambda: build_rosters(derived.cdlDF))
+# Entries are read as attributes (derived.rostersDF) or with derived.get("rostersDF")
+# Verbose registries print the build time of every frame
+class DerivedData:
+
+    def __init__(self, verbose: bool = False):
+        self._builders = {}
+        self._frames = {}
+        self._build_times = {}
+        self._lock = threading.RLock()
+        self._verbose = verbose
+
+    # Function to register a builder under a name
+    def register(self, name: str, builder):
+        with self._lock:
+            self._builders[name] = builder
+            self._frames.pop(name, None)
+
+    # Function to get a derived frame, building it on first access
+    # The lock is reentrant, so builders can read entries they depend on
+    def get(self, name: str):
+        if name in self._frames:
+            return self._frames[name]
+        if name not in self._builders:
+            raise KeyError(f"No derived data registered as '{name}'")
+        with self._lock:
+            if name not in self._frames:
+                start = time.perf_counter()
+                self._frames[name] = self._builders[name]()
+                self._build_times[name] = (time.perf_counter() - start) * 1000
+                if self._verbose:
+                    print(f"Built {name} in {self._build_times[name]:.1f} ms")
+            return self._frames[name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    # Function to get a zero-argument getter for a derived frame, to pass to shiny modules
+    def getter(self, name: str):
+        return lambda: self.get(name)
+
+    # Function to check whether a derived frame has been built
+    def is_built(self, name: str):
+        return name in self._frames
+
+    # Function to drop one memoized frame, or all of them, so they are rebuilt on next access
+    def invalidate(self, name: str = None):
+        with self._lock:
+            if name is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(name, None)
+
+    # Function to get the build time of every frame built so far, in milliseconds
+    def build_times(self):
+        return dict(self._build_times)
+
+    # Function to list registered names
+    def names(self):
+        return list(self._builders)
@@ -0,0 +1,104 @@
+# Import pandas
+import pandas as pd
+
+# Import team dictionaries from setup
+from utils.setup.setup import team_abbrs, team_icons
+
+# Fixed category sets, so snapshots and synced rows share the same categories
+# Categories seen in the data but missing here are added, never dropped
+gamemode_categories = ['Hardpoint', 'Search & Destroy', 'Control']
+map_name_categories = [
+    '6 Star', 'Highrise', 'Invasion', 'Karachi', 'Rio',
+    'Skidrow', 'Sub Base', 'Terminal', 'Vista'
+]
+match_day_categories = [
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
+]
+# Team categories are sorted, so sorting by team matches sorting the team names
+team_categories = sorted(team_abbrs.keys())
+team_abbr_categories = sorted(team_abbrs.values())
+team_icon_categories = sorted(team_icons.values())
+
+# Compact schema for the cdl data and the frames derived from it
+# Columns map to a list of categories (None: categories taken from the data),
+# or to a numpy dtype. Only columns present in a frame are converted
+cdl_schema = {
+    # Categoricals
+    "player": None,
+    "team": team_categories,
+    "opp": team_categories,
+    "team_abbr": team_abbr_categories,
+    "opp_abbr": team_abbr_categories,
+    "team_icon": team_icon_categories,
+    "map_name": map_name_categories,
+    "gamemode": gamemode_categories,
+    "match_day": match_day_categories,
+    "map_wl": ['W', 'L'],
+
+    # Downcast numerics
+    "match_id": "int32",
+    "map_num": "int8",
+    "kills": "int16",
+    "deaths": "int8",
+    "plus_minus": "int8",
+    "dmg": "int16",
+    "kd": "float32",
+    "team_score": "int16",
+    "opp_score": "int16",
+    "total_score": "int16",
+    "score_diff": "int16",
+    "map_result": "int8",
+    "series_result": "int8",
+    "map_wins": "int8",
+    "map_losses": "int8",
+    "series_score_diff": "int8",
+    "dummy_x": "int8",
+}
+
+
+# Function to build categories for a column: the fixed set, plus any unseen values
+def get_categories(column: pd.Series, categories: list = None):
+    extra = sorted(set(column.dropna().unique()) - set(categories or []))
+    return list(categories or []) + extra
+
+# Function to apply the compact schema to the cdl data, or any frame derived from it
+def apply_cdl_schema(cdlDF_input: pd.DataFrame):
+
+    # Create a copy of cdlDF_input to avoid mutating the original
+    cdlDF = cdlDF_input.copy()
+
+    for col, target in cdl_schema.items():
+        if col not in cdlDF.columns:
+            continue
+
+        # Categoricals with fixed category sets
+        if target is None or isinstance(target, list):
+            values = cdlDF[col].astype(object) if isinstance(cdlDF[col].dtype, pd.CategoricalDtype) else cdlDF[col]
+            cdlDF[col] = pd.Categorical(values, categories = get_categories(values, target))
+
+        # Numerics, using the nullable dtype if the column has missing values
+        elif cdlDF[col].isna().any():
+            cdlDF[col] = cdlDF[col].astype(target.capitalize())
+        else:
+            cdlDF[col] = cdlDF[col].astype(target)
+
+    # Dates: datetime64 at day precision
+    if "match_date" in cdlDF.columns:
+        cdlDF["match_date"] = pd.to_datetime(cdlDF["match_date"]).dt.normalize()
+
+    return cdlDF
+
+# Function to report the memory footprint of frames before & after the compact schema
+def report_memory_usage(frames: dict):
+    report = []
+    for name, df in frames.items():
+        before = df.memory_usage(deep = True).sum() / 1024 ** 2
+        after = apply_cdl_schema(df).memory_usage(deep = True).sum() / 1024 ** 2
+        report.append({
+            "frame": name,
+            "rows": len(df),
+            "before_mb": round(before, 3),
+            "after_mb": round(after, 3),
+            "reduction": f"{1 - after / before:.0%}"
+        })
+    return pd.DataFrame(report)
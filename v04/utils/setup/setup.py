@@ -1,13 +1,9 @@
 # Import pandas, numpy, and datetime
 import pandas as pd
-import pandas.io.sql as sqlio
 import numpy as np
 
-# Import psycopg2 
-import psycopg2
-
-# Import db password from config
-from utils.setup.config import db_password
+# Import database backends
+from utils.setup.backends import get_backend
 
 # List of players that have been dropped
 dropped_players = [
@@ -54,27 +50,90 @@ team_names = {
     "TOR": "Toronto Ultra"
 }
 
+# Dictionary of team icons by team name
+team_icons = {
+    "Atlanta FaZe": "FaZe",
+    "Boston Breach": "Breach",
+    "Carolina Royal Ravens": "Ravens", 
+    "Las Vegas Legion": "Legion",
+    "Los Angeles Guerrillas": "Guerrillas", 
+    "Los Angeles Thieves": "Thieves", 
+    "Miami Heretics": "Heretics", 
+    "Minnesota ROKKR": "ROKKR", 
+    "New York Subliners": "Subliners",
+    "OpTic Texas": "OpTic", 
+    "Seattle Surge": "Surge", 
+    "Toronto Ultra": "Ultra"
+}
+
 # Hardpoint Maps Excluded from Maps 1 - 3 Dataframe Computation
 removed_hp_maps = ['Skidrow', 'Terminal']
 
-# Function to load and clean cdl data and return as pandas dataframe
-def load_and_clean_cdl_data():
+# Dictionary to map map_num to gamemode
+map_nums_to_gamemode = {
+    1: "Hardpoint", 
+    2: "Search & Destroy", 
+    3: "Control", 
+    4: "Hardpoint", 
+    5: "Search & Destroy"
+}
 
-    # establishing the connection
-    conn = psycopg2.connect(
-        database = "cdl_db", 
-        user = 'postgres', 
-        password = db_password,
-        host = '127.0.0.1', 
-        port = '5433'
-    )
+# Dictionary of the current map pool of every gamemode
+map_pools = {
+    "Hardpoint": ['6 Star', 'Karachi', 'Rio', 'Sub Base', 'Vista'], 
+    "Search & Destroy": ['6 Star', 'Highrise', 'Invasion', 'Karachi', 'Rio'], 
+    "Control": ['Highrise', 'Invasion', 'Karachi']
+}
+
+# Function to load raw cdl data from the database
+# If a watermark is given, only fetch matches newer than the latest match_id,
+# plus every match from the latest match_date, which may have been partially loaded
+def fetch_cdl_data(since_match_id = None, since_match_date = None):
+
+    # Get the configured database backend
+    backend = get_backend()
 
     # Load data into a pandas dataframe
-    cdlDF = sqlio.read_sql_query("SELECT * FROM cdl_data", conn)
-    cdlDF
+    if since_match_id is None:
+        cdlDF = backend.read_sql("SELECT * FROM cdl_data")
+    else:
+        cdlDF = backend.read_sql(
+            "SELECT * FROM cdl_data "
+            "WHERE match_id > :since_match_id OR match_date >= :since_match_date", 
+            params = {"since_match_id": int(since_match_id), "since_match_date": str(since_match_date)}
+        )
+
+    return cdlDF
+
+# Function to fetch the current version of the cdl data from the database
+# Cheap query: row count and latest match, used to tag snapshots
+def fetch_data_version(backend = None):
 
-    # Close the connection
-    conn.close()
+    # Query row count & latest match
+    version_df = (backend or get_backend()).read_sql(
+        "SELECT COUNT(*) AS n_rows, MAX(match_id) AS max_match_id, "
+        "MAX(match_date) AS max_match_date FROM cdl_data"
+    )
+
+    n_rows, max_match_id, max_match_date = version_df.iloc[0]
+    return format_data_version(n_rows, max_match_id, max_match_date)
+
+# Function to format a data version from row count and latest match
+def format_data_version(n_rows, max_match_id, max_match_date):
+    return f"{int(n_rows)}-{int(max_match_id)}-{pd.Timestamp(max_match_date).date()}"
+
+# Function to compute the data version of a cleaned cdl dataframe
+def compute_data_version(cdlDF_input: pd.DataFrame):
+    return format_data_version(
+        len(cdlDF_input), cdlDF_input['match_id'].max(), cdlDF_input['match_date'].max()
+    )
+
+# Function to load and clean cdl data and return as pandas dataframe
+def load_and_clean_cdl_data():
+    return clean_cdl_data(fetch_cdl_data())
+
+# Function to clean raw cdl data and return as pandas dataframe
+def clean_cdl_data(cdlDF: pd.DataFrame):
 
     # Drop unnecessary columns
     cdlDF.drop(["match_day", "deaths", "kd", "plus_minus", "dmg", "series_result"], axis=1)
@@ -86,28 +145,9 @@ def load_and_clean_cdl_data():
     cdlDF['map_wl'] = ["W" if x == 1 else "L" for x in cdlDF['map_result']]
 
     # Add team abbreviations, and icons
-
-    # Teams
-    teams = cdlDF.sort_values(by = ['team']).team.unique()
-
-    # Team Abbreviations
-    team_abbrs = [
-        "ATL", "BOS", "CAR", "LV", "LAG", "LAT",
-        "MIA", "MIN", "NYSL", "TX", "SEA", "TOR"
-        ]
-
-    # Team Icons
-    team_icons = np.array([team.split()[-1] for team in teams])
-    team_icons[9] = "OpTic"
-
-    team_abbrs_icons_df = pd.DataFrame({
-        "team": teams, 
-        "team_abbr": team_abbrs, 
-        "team_icon": team_icons
-    })
-
-    # Left join cdlDF & team_abbrs_icons_df
-    cdlDF = pd.merge(cdlDF, team_abbrs_icons_df, on = 'team', how = 'left')
+    # Mapped by team name, so that the pipeline also works on a subset of matches
+    cdlDF['team_abbr'] = cdlDF['team'].map(team_abbrs)
+    cdlDF['team_icon'] = cdlDF['team'].map(team_icons)
 
     # Get Opponents, Match Scores, and Score Differentials
 
@@ -118,14 +158,8 @@ def load_and_clean_cdl_data():
     cdlDF = cdlDF.sort_values(by=['match_date', 'match_id', 'map_num', 'team', 'player_lower'])
     cdlDF.reset_index(drop=True, inplace=True)
 
-    # Create DataFrame containing opponent information
-    opps = cdlDF.sort_values(by=['match_date', 'match_id', 'map_num', 'team', 'player_lower'], ascending=[True, True, True, False, True]) \
-                [['team', 'team_abbr', 'team_score']] \
-                .rename(columns={'team': 'opp', 'team_abbr': 'opp_abbr', 'team_score': 'opp_score'})
-    opps.reset_index(drop=True, inplace=True)
-
-    # Merge opponent DataFrame with original DataFrame
-    cdlDF = pd.concat([cdlDF, opps], axis=1)
+    # Add opponent information
+    cdlDF = add_opponent_columns(cdlDF)
 
     # Calculate total score and score differential
     cdlDF['total_score'] = cdlDF['team_score'] + cdlDF['opp_score']
@@ -153,21 +187,59 @@ def load_and_clean_cdl_data():
     
     return cdlDF
 
+# Function to add opponent columns (opp, opp_abbr, opp_score) to cdl data
+# Builds a team-level table with one row per match, map & team, pairs the two
+# teams of every match & map, and joins the pairs back onto the player rows.
+# Unlike aligning two sorted copies row by row, this needs no second sort and
+# stays correct when a team is missing player rows on a map
+def add_opponent_columns(cdlDF_input: pd.DataFrame):
+
+    # Integer keys for every match & map, and for every match, map & team
+    cdlDF = cdlDF_input
+    map_keys = cdlDF.groupby(['match_id', 'map_num'], sort = False).ngroup().to_numpy()
+    team_codes, teams = pd.factorize(cdlDF['team'])
+    team_keys, team_rows, row_to_team = np.unique(
+        map_keys * len(teams) + team_codes, return_index = True, return_inverse = True
+    )
+
+    # Team-level table, ordered by match & map, so both teams of a map are adjacent
+    team_maps = cdlDF.iloc[team_rows][['team', 'team_abbr', 'team_score']] \
+        .rename(columns = {'team': 'opp', 'team_abbr': 'opp_abbr', 'team_score': 'opp_score'}) \
+        .reset_index(drop = True)
+    team_map_keys = pd.Series(team_keys // len(teams))
+
+    # Pair each team with the adjacent team on the same match & map
+    # Maps without exactly two teams get no opponent
+    position = np.arange(len(team_maps))
+    opp_position = np.where(~team_map_keys.duplicated().to_numpy(), position + 1, position - 1)
+    has_opp = team_map_keys.map(team_map_keys.value_counts()).to_numpy() == 2
+    opps = team_maps.iloc[np.where(has_opp, opp_position, 0)].reset_index(drop = True)
+    opps = opps.where(pd.Series(has_opp), axis = 0)
+
+    # Join opponents back onto the player rows, without mutating cdlDF_input
+    opps = opps.iloc[row_to_team].set_index(cdlDF.index)
+    return pd.concat([cdlDF, opps], axis = 1)
+
+# Function to count wins & losses of a result column (1 for a win, 0 for a loss) by group,
+# with native aggregations
+def count_wins_and_losses(results_df: pd.DataFrame, keys: list, result_column: str, 
+                          wins_name = "wins", losses_name = "losses"):
+    counts = results_df \
+        .groupby(keys, observed = True)[result_column] \
+        .agg(["sum", "size"])
+    return pd.DataFrame({
+        wins_name: counts["sum"].astype("int64"), 
+        losses_name: (counts["size"] - counts["sum"]).astype("int64")
+    }) \
+        .reset_index()
+
 # Build dataframe of series scores & differentials
 def build_series_summaries(cdlDF_input):
-    series_score_diffs = \
+    series_score_diffs = count_wins_and_losses(
         cdlDF_input[["match_id", "match_date", "team", "team_icon", "map_num", "gamemode", "map_result"]] \
-        .drop_duplicates() \
-        .groupby(["match_id", "team", "team_icon"], observed = True) \
-        .agg(
-            map_wins = ("map_result", lambda x: sum(x)), 
-            map_losses = ("map_result", lambda x: len(x) - sum(x)), 
-        ) \
-        .reset_index().copy()
-
-    # Get score differentials
-    series_score_diffs["series_score_diff"] = \
-        series_score_diffs["map_wins"] - series_score_diffs["map_losses"]
+            .drop_duplicates(), 
+        ["match_id", "team", "team_icon"], "map_result", "map_wins", "map_losses"
+    )
     
     # Add match_date column back in
     series_score_diffs = pd.merge(
@@ -177,6 +249,18 @@ def build_series_summaries(cdlDF_input):
         on = "match_id"
     )
 
+    return summarize_series_results(series_score_diffs)
+
+# Function to add score differentials & opponents to series results
+# Takes one row per match & team, with map_wins, map_losses & match_date
+def summarize_series_results(series_score_diffs):
+
+    # Get score differentials
+    series_score_diffs.insert(
+        series_score_diffs.columns.get_loc("match_date"), "series_score_diff", 
+        series_score_diffs["map_wins"] - series_score_diffs["map_losses"]
+    )
+
     # Arrange by match_date, match_id, and team & reset index
     series_score_diffs = series_score_diffs.sort_values(
         by = ['match_date', 'match_id', 'team'], ascending = [True, True, True]
@@ -188,61 +272,74 @@ def build_series_summaries(cdlDF_input):
         .rename(columns = {"team_icon": "opp"}) \
         .reset_index(drop=True) 
 
-    opps
-
     # Bind series_score_diffs & opps
     series_score_diffs = pd.concat([series_score_diffs, opps], axis=1)
 
     # Return series_score_diffs
     return series_score_diffs
 
+# Map & mode combos removed from the map pool
+removed_map_modes = [
+    ('Hardpoint', 'Invasion'), 
+    ('Hardpoint', 'Skidrow'), 
+    ('Hardpoint', 'Terminal'), 
+    ('Search & Destroy', 'Skidrow'), 
+    ('Search & Destroy', 'Terminal')
+]
+
 # Function to filter maps from cdlDF
 def filter_maps(cdlDF_input):
         
     # Remove map & mode combos
-    cdlDF_input = \
-        cdlDF_input[
-            ~((cdlDF_input['gamemode'] == 'Hardpoint') & (cdlDF_input['map_name'] == 'Invasion')) &
-            ~((cdlDF_input['gamemode'] == 'Hardpoint') & (cdlDF_input['map_name'] == 'Skidrow')) &
-            ~((cdlDF_input['gamemode'] == 'Hardpoint') & (cdlDF_input['map_name'] == 'Terminal')) &
-            ~((cdlDF_input['gamemode'] == 'Search & Destroy') & (cdlDF_input['map_name'] == 'Skidrow')) &
-            ~((cdlDF_input['gamemode'] == 'Search & Destroy') & (cdlDF_input['map_name'] == 'Terminal')) 
-        ].reset_index(drop = True)
+    removed = pd.Series(False, index = cdlDF_input.index)
+    for gamemode, map_name in removed_map_modes:
+        removed |= (cdlDF_input['gamemode'] == gamemode) & (cdlDF_input['map_name'] == map_name)
+    cdlDF_input = cdlDF_input[~removed].reset_index(drop = True)
     
     return cdlDF_input
 
+# Function to count wins, losses, total maps & win percentage of map results by group
+def count_team_records(team_maps: pd.DataFrame, keys: list):
+    team_records = count_wins_and_losses(team_maps, keys, "map_result")
+    team_records["total"] = team_records["wins"] + team_records["losses"]
+    team_records["win_percentage"] = compute_win_percentages(team_records["wins"], team_records["total"])
+    return team_records
+
+# Function to compute win percentages, rounded to 2 decimals
+# Python's round on the few summary rows, so percentages round exactly as before,
+# ie. 9 / 40 rounds to 0.23, where NumPy's round gives 0.22
+def compute_win_percentages(wins: pd.Series, total: pd.Series):
+    return [round(n_wins / n_total, 2) for n_wins, n_total in zip(wins, total)]
+
 # Function to create a pandas dataframe of team summaries
 def build_team_summaries(cdlDF_input: pd.DataFrame): 
 
-    # Create a copy of cdlDF_input to avoid mutating the original
-    queried_df = cdlDF_input.copy()
+    # One row per match, team & map
+    team_maps = cdlDF_input[["match_id", "team", "team_icon", "map_name", "gamemode", "map_result"]] \
+        .drop_duplicates()
 
-    # Team Summaries by Map & Mode
-    team_summaries_DF_top = queried_df \
-        [["match_id", "team", "team_icon", "map_name", "gamemode", "map_result"]] \
-        .drop_duplicates() \
-        .groupby(["team", "team_icon", "gamemode", "map_name"], observed = True) \
-        .agg(
-            wins = ("map_result", lambda x: sum(x)), 
-            losses = ("map_result", lambda x: len(x) - sum(x)), 
-            total = ("map_result", lambda x: len(x)), 
-            win_percentage = ("map_result", lambda x: round(sum(x) / len(x), 2))
-        ) \
-        .reset_index()
+    # Team Summaries by Map & Mode, and by Mode only
+    team_summaries_DF_top = count_team_records(team_maps, ["team", "team_icon", "gamemode", "map_name"])
+    team_summaries_DF_bottom = count_team_records(team_maps, ["team", "team_icon", "gamemode"])
+
+    return summarize_team_records(team_summaries_DF_top, team_summaries_DF_bottom)
+
+# Function to stack team records by map & mode, and by mode only, into team summaries
+def summarize_team_records(team_summaries_DF_top: pd.DataFrame, team_summaries_DF_bottom: pd.DataFrame):
 
     # Some teams have not played every map & mode combination 
-    # So, we will add those combinations back in manually
-    map_and_mode_combos = queried_df[["gamemode", "map_name"]].drop_duplicates().sort_values(["gamemode", "map_name"]).reset_index(drop = True)
-    all_combinations = pd.DataFrame(
-        [(team, gamemode, map_name) for team in sorted(queried_df['team'].unique()) for _, (gamemode, map_name) in map_and_mode_combos.iterrows()], 
-        columns = ['team', 'gamemode', 'map_name']
+    # So, we will reindex over every team & every map and mode combination played
+    map_and_mode_combos = team_summaries_DF_top[["gamemode", "map_name"]].drop_duplicates().sort_values(["gamemode", "map_name"])
+    all_combinations = pd.MultiIndex.from_frame(
+        pd.DataFrame({"team": sorted(team_summaries_DF_top['team'].unique())}).merge(map_and_mode_combos, how = "cross")
     )
-    team_summaries_DF_top = pd.merge(
-        team_summaries_DF_top, 
-        all_combinations, 
-        on = ['team', 'gamemode', 'map_name'], 
-        how = "right"
-    ).fillna(0)
+    team_summaries_DF_top = team_summaries_DF_top \
+        .set_index(['team', 'gamemode', 'map_name']) \
+        .reindex(all_combinations) \
+        .reset_index() \
+        [team_summaries_DF_top.columns] \
+        .fillna({"wins": 0, "losses": 0, "total": 0, "win_percentage": 0})
+    team_summaries_DF_top['team_icon'] = team_summaries_DF_top['team'].map(team_icons)
 
     # Set datatypes
     team_summaries_DF_top['wins'] = team_summaries_DF_top['wins'].astype('int64')
@@ -250,19 +347,6 @@ def build_team_summaries(cdlDF_input: pd.DataFrame):
     team_summaries_DF_top['total'] = team_summaries_DF_top['total'].astype('int64')
     team_summaries_DF_top['win_percentage'] = team_summaries_DF_top['win_percentage'].astype('float64')
     
-    # Team Summaries by Mode only
-    team_summaries_DF_bottom = \
-        queried_df[["match_id", "team", "team_icon", "map_name", "gamemode", "map_result"]] \
-        .drop_duplicates() \
-        .groupby(["team", "team_icon", "gamemode"], observed = True) \
-        .agg(
-            wins = ("map_result", lambda x: sum(x)), 
-            losses = ("map_result", lambda x: len(x) - sum(x)), 
-            total = ("map_result", lambda x: len(x)), 
-            win_percentage = ("map_result", lambda x: round(sum(x) / len(x), 2))
-        ) \
-        .reset_index()
-    
     # Insert map_name column into team_summaries_DF_bottom
     # for stacking
     team_summaries_DF_bottom["map_name"] = "Overall"
@@ -288,6 +372,24 @@ def build_team_summaries(cdlDF_input: pd.DataFrame):
     
     return team_summaries_DF
 
+# Function to build a lookup of team records from team summaries, keyed by (team, gamemode, map_name),
+# with map_name "Overall" for every map of the gamemode
+def build_team_record_lookup(team_summaries_DF_input: pd.DataFrame):
+    return team_summaries_DF_input \
+        .dropna(subset = ["map_name"]) \
+        .set_index(["team", "gamemode", "map_name"]) \
+        [["wins", "losses", "win_percentage"]] \
+        .to_dict("index")
+
+# Function to compute CDL standings from series results since a start date
+def build_current_standings(cdlDF_input: pd.DataFrame, start_date: str):
+    return count_wins_and_losses(
+        cdlDF_input[(cdlDF_input["match_date"] >= start_date)] \
+            [["match_id", "team", "series_result"]] \
+            .drop_duplicates(), 
+        "team", "series_result"
+    )
+
 # Funciton to build rosters AFTER players have been filtered
 def build_rosters(cdlDF_input: pd.DataFrame):
     
@@ -385,48 +487,91 @@ def merge_player_props(old_props: pd.DataFrame, new_props: pd.DataFrame, rosters
     new_props = new_props.reset_index(drop=True)
     return new_props
     
+# Function to find series whose Map 1 Hardpoint has been removed from the map pool,
+# following the analysis in notebooks/maps_1_thru_3_kills.ipynb
+# 1. Replaceable: the series went to a Map 4 Hardpoint that is still in the map pool,
+#    so Map 4 stands in for Map 1
+# 2. Irreplaceable: Map 1 was retired from the game (every mode it was played in was removed),
+#    and there is no Map 4, or Map 4 was retired too, so the series is dropped
+# Returns arrays of replaceable & irreplaceable match_ids
+def find_old_map_1s(cdlDF_input: pd.DataFrame):
+
+    # Hardpoint maps removed from the map pool, and maps removed in every mode they were played in
+    old_hp_maps = [map_name for gamemode, map_name in removed_map_modes if gamemode == "Hardpoint"]
+    map_modes = cdlDF_input[["gamemode", "map_name"]].drop_duplicates()
+    is_removed = pd.Series(list(zip(map_modes["gamemode"], map_modes["map_name"])), index = map_modes.index) \
+        .isin(removed_map_modes)
+    retired_maps = [
+        map_name for map_name in old_hp_maps 
+        if is_removed[map_modes["map_name"] == map_name].all()
+    ]
+
+    # Map 1 & Map 4 Hardpoints of every series, side by side
+    hp_maps = cdlDF_input[cdlDF_input["gamemode"] == "Hardpoint"][["match_id", "map_num", "map_name"]] \
+        .drop_duplicates(["match_id", "map_num"])
+    series_maps = pd.merge(
+        hp_maps[hp_maps["map_num"] == 1][["match_id", "map_name"]].rename(columns = {"map_name": "map_1"}), 
+        hp_maps[hp_maps["map_num"] == 4][["match_id", "map_name"]].rename(columns = {"map_name": "map_4"}), 
+        how = "left", 
+        on = "match_id"
+    )
+    has_map_4 = series_maps["map_4"].notna()
+
+    replaceable = series_maps["map_1"].isin(old_hp_maps) & has_map_4 & \
+        ~series_maps["map_4"].isin(old_hp_maps)
+    irreplaceable = series_maps["map_1"].isin(retired_maps) & \
+        (~has_map_4 | series_maps["map_4"].isin(retired_maps))
+
+    return series_maps.loc[replaceable, "match_id"].to_numpy(), series_maps.loc[irreplaceable, "match_id"].to_numpy()
+
 # Function to build dataframe of previous player Maps 1 - 3 Kill totals based
-# on analysis performed in testing_maps_1_thru_3_kills.ipynb 
-def build_1_thru_3_totals(cdlDF_input: pd.DataFrame):
+# on analysis performed in notebooks/maps_1_thru_3_kills.ipynb
+# match_ids limits the totals to some series, ie. new ones, while old Map 1s are still
+# detected over the full cdlDF_input
+def build_1_thru_3_totals(cdlDF_input: pd.DataFrame, match_ids = None):
     
-    # 1. List of match_ids with replaceable map 1, 
-    # computed in testing_maps_1_thru_3_kills.ipynb 
-    replaceable_ids = [27200, 27237, 53372, 27219, 52845, 27245, 27255, 27266,
-                       27250, 52933, 27270, 35645, 27223, 27241, 53281, 27249, 
-                       27231, 27197, 52842, 27264, 27207]
+    # 1. Series with replaceable & irreplaceable old Map 1s
+    replaceable_ids, irr_old_maps = find_old_map_1s(cdlDF_input)
+
+    # Limit to the given series
+    if match_ids is not None:
+        cdlDF_input = cdlDF_input[cdlDF_input['match_id'].isin(match_ids)]
 
     # 2. If replaceable, replace all old Map 1s with corresponding Map 4
     adj_cdlDF = cdlDF_input[
         ~((cdlDF_input['match_id'].isin(replaceable_ids)) & 
         (cdlDF_input['map_num'] == 1))
-        ]
+        ].copy()
     adj_cdlDF.loc[((adj_cdlDF['match_id'].isin(replaceable_ids)) & (adj_cdlDF['map_num'] == 4)), 'map_num'] = 1
-    adj_cdlDF
 
-    # 3. List of match_ids with irreplaceable Map 1 Skidrow or Terminal
-    # computed in testing_maps_1_thru_3_kills.ipynb 
-    irr_old_maps = [27208, 35635, 27211, 27265, 27243, 35633, 35634, 35648,
-                    27220, 27230, 27206, 27221, 27229, 27213]
-
-    # 4. Drop all matches with irreplaceable Map 1 Skidrows or Terminals
+    # 3. Drop all matches with irreplaceable Map 1s
     adj_cdlDF = adj_cdlDF[~adj_cdlDF['match_id'].isin(irr_old_maps)]
 
-    # 5. Remove All Map 4s & Map 5s from adj_cdl
+    # 4. Remove All Map 4s & Map 5s from adj_cdl
     adj_cdlDF = adj_cdlDF[adj_cdlDF['map_num'] < 4].reset_index(drop = True)
 
-    # 6. Compute adjusted Maps 1 - 3 Kills for every Player & Series
+    # 5. Compute adjusted Maps 1 - 3 Kills for every Player & Series
     adj_1_thru_3_totals_df = adj_cdlDF \
-        .groupby(['match_id', 'player', 'match_date', 'team_abbr'])['kills'].sum() \
+        .groupby(['match_id', 'player', 'match_date', 'team_abbr'], observed = True)['kills'].sum() \
         .reset_index()
     
-    # 7. Sort values & return
+    # 6. Sort values & return
     adj_1_thru_3_totals_df = adj_1_thru_3_totals_df.sort_values(['match_id', 'team_abbr', "player"], ignore_index = True)
 
-    # 8. Convert match_date column to datetime
+    # 7. Convert match_date column to datetime
     adj_1_thru_3_totals_df["match_date"] = pd.to_datetime(adj_1_thru_3_totals_df['match_date'])
     
     return adj_1_thru_3_totals_df
 
+# Function to update Maps 1 - 3 Kill totals for some series, ie. new or re-fetched ones,
+# keeping the totals of every other series
+def update_1_thru_3_totals(adj_1_thru_3_totals_df: pd.DataFrame, cdlDF_input: pd.DataFrame, match_ids):
+    adj_1_thru_3_totals_df = pd.concat([
+        adj_1_thru_3_totals_df[~adj_1_thru_3_totals_df['match_id'].isin(match_ids)], 
+        build_1_thru_3_totals(cdlDF_input, match_ids)
+    ])
+    return adj_1_thru_3_totals_df.sort_values(['match_id', 'team_abbr', "player"], ignore_index = True)
+
 # Function to load vetoes
 def load_vetoes(filepath: str):
 
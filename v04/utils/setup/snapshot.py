@@ -0,0 +1,197 @@
+# Import os, json, time, and argparse
+import os
+import json
+import time
+import argparse
+
+# Import pandas & pyarrow
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Import setup
+from utils.setup.setup import \
+    fetch_cdl_data, fetch_data_version, clean_cdl_data, compute_data_version, \
+    build_1_thru_3_totals, update_1_thru_3_totals
+
+# Import compact schema
+from utils.setup.schema import apply_cdl_schema
+
+# Import snapshot settings from config
+from utils.setup.config import snapshot_path, totals_snapshot_path, snapshot_max_age_hours
+
+# Version of the cleaning pipeline. Bump whenever clean_cdl_data changes,
+# so that snapshots written by older code are rebuilt instead of loaded
+pipeline_version = 5
+
+# Key under which snapshot metadata is stored in the parquet schema
+metadata_key = b"cdl_snapshot"
+
+# Environment variable to force a refresh from the app, ie. CDL_REFRESH=1
+refresh_env_var = "CDL_REFRESH"
+
+
+# Function to get the absolute path of a snapshot file
+def get_snapshot_file(path: str = snapshot_path):
+    v04_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(v04_dir, *path.split("/"))
+
+# Function to read snapshot metadata without loading the data
+def read_snapshot_metadata(filepath: str):
+    if not os.path.exists(filepath):
+        return None
+    try:
+        metadata = pq.read_schema(filepath).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if metadata_key not in metadata:
+        return None
+    return json.loads(metadata[metadata_key])
+
+# Function to write the cleaned cdl data to a snapshot, tagged with its data version
+def write_snapshot(cdlDF: pd.DataFrame, data_version: str, filepath: str, **extra_metadata):
+
+    # Build table and attach snapshot metadata to the schema
+    table = pa.Table.from_pandas(cdlDF, preserve_index = False)
+    snapshot_metadata = {
+        "data_version": data_version,
+        "pipeline_version": pipeline_version,
+        "created_at": time.time(),
+        "max_match_id": int(cdlDF['match_id'].max()),
+        "max_match_date": str(cdlDF['match_date'].max().date()),
+        **extra_metadata
+    }
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        metadata_key: json.dumps(snapshot_metadata).encode()
+    })
+
+    # Write to a temporary file first, so a crash never leaves a half-written snapshot
+    os.makedirs(os.path.dirname(filepath), exist_ok = True)
+    tmp_filepath = filepath + ".tmp"
+    pq.write_table(table, tmp_filepath)
+    os.replace(tmp_filepath, filepath)
+
+# Function to read the cleaned cdl data from a snapshot
+def read_snapshot(filepath: str):
+    return pd.read_parquet(filepath)
+
+# Function to check whether a snapshot is older than the max age in config
+def is_snapshot_stale(filepath: str):
+    age_hours = (time.time() - os.path.getmtime(filepath)) / 3600
+    return age_hours > snapshot_max_age_hours
+
+# Function to rebuild the snapshot from the live database, along with the Maps 1 - 3 totals
+def refresh_snapshot(filepath: str):
+    data_version = fetch_data_version()
+    cdlDF = apply_cdl_schema(clean_cdl_data(fetch_cdl_data()))
+    write_snapshot(cdlDF, data_version, filepath)
+    write_snapshot(apply_cdl_schema(build_1_thru_3_totals(cdlDF)), data_version, get_snapshot_file(totals_snapshot_path))
+    return cdlDF
+
+# Function to read the Maps 1 - 3 totals snapshot, if it was built from the given data version
+def read_totals_snapshot(data_version: str):
+    filepath = get_snapshot_file(totals_snapshot_path)
+    metadata = read_snapshot_metadata(filepath)
+    if metadata is None or metadata.get("pipeline_version") != pipeline_version \
+            or metadata["data_version"] != data_version:
+        return None
+    return read_snapshot(filepath)
+
+# Function to append matches newer than the snapshot's watermark to the snapshot
+# Only the new rows are fetched and cleaned, so cost tracks new data, not the season history
+def sync_snapshot(filepath: str, metadata: dict, data_version: str):
+
+    # Fetch & clean rows past the watermark
+    new_rows = fetch_cdl_data(metadata["max_match_id"], metadata["max_match_date"])
+    cdlDF = read_snapshot(filepath)
+    totals = read_totals_snapshot(metadata["data_version"])
+    if not new_rows.empty:
+        new_rows = clean_cdl_data(new_rows)
+
+        # Replace re-fetched matches, append new ones, and restore the cleaned sort order
+        # The schema is re-applied, as new players widen the player categories
+        cdlDF = cdlDF[~cdlDF['match_id'].isin(new_rows['match_id'])]
+        cdlDF = pd.concat([cdlDF, new_rows], ignore_index = True) \
+            .sort_values(by = ['match_date', 'match_id', 'map_num', 'team'], ignore_index = True)
+        cdlDF = apply_cdl_schema(cdlDF)
+
+    # Older rows were edited or deleted if the versions still disagree: rebuild everything
+    if compute_data_version(cdlDF) != data_version:
+        return refresh_snapshot(filepath)
+
+    # Update the Maps 1 - 3 totals of the new series only, or rebuild them if they are out of date
+    if totals is None:
+        totals = build_1_thru_3_totals(cdlDF)
+    elif not new_rows.empty:
+        totals = update_1_thru_3_totals(totals, cdlDF, new_rows['match_id'].unique())
+
+    write_snapshot(cdlDF, data_version, filepath)
+    write_snapshot(apply_cdl_schema(totals), data_version, get_snapshot_file(totals_snapshot_path))
+    return cdlDF
+
+# Function to load the cleaned cdl data, using the snapshot whenever it is current
+# 1. refresh = True (or CDL_REFRESH=1): always rebuild from the database
+# 2. Snapshot missing, unreadable, or from an older pipeline: rebuild from the database
+# 3. Snapshot younger than snapshot_max_age_hours: load it without touching the database
+# 4. Snapshot stale: compare its data version with the database, and only sync new matches
+#    if it changed. If the database is unreachable, fall back to the stale snapshot
+def load_cdl_data(refresh = False):
+
+    filepath = get_snapshot_file()
+    refresh = refresh or os.environ.get(refresh_env_var, "0") == "1"
+    metadata = read_snapshot_metadata(filepath)
+
+    # Cases 1 & 2
+    if refresh or metadata is None or metadata.get("pipeline_version") != pipeline_version:
+        return refresh_snapshot(filepath)
+
+    # Case 3
+    if not is_snapshot_stale(filepath):
+        return read_snapshot(filepath)
+
+    # Case 4
+    try:
+        data_version = fetch_data_version()
+    except Exception as e:
+        print(f"Could not reach the cdl database ({e}), loading stale snapshot")
+        return read_snapshot(filepath)
+    if data_version != metadata["data_version"]:
+        return sync_snapshot(filepath, metadata, data_version)
+
+    # Data unchanged: mark the snapshot as fresh and load it
+    os.utime(filepath)
+    return read_snapshot(filepath)
+
+# Function to load the Maps 1 - 3 Kill totals of the cdl data loaded by load_cdl_data
+# Uses the totals snapshot when it matches the cdl data snapshot, and rebuilds it otherwise
+def load_1_thru_3_totals(cdlDF: pd.DataFrame):
+    metadata = read_snapshot_metadata(get_snapshot_file())
+    if metadata is not None:
+        totals = read_totals_snapshot(metadata["data_version"])
+        if totals is not None:
+            return totals
+    totals = apply_cdl_schema(build_1_thru_3_totals(cdlDF))
+    if metadata is not None:
+        write_snapshot(totals, metadata["data_version"], get_snapshot_file(totals_snapshot_path))
+    return totals
+
+
+# Rebuild or inspect the snapshot from the command line, from the v04 folder:
+# python -m utils.setup.snapshot --refresh
+# python -m utils.setup.snapshot --sync
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Manage the cdl data snapshot")
+    parser.add_argument("--refresh", action = "store_true",
+                        help = "rebuild the snapshot from the database")
+    parser.add_argument("--sync", action = "store_true",
+                        help = "append matches newer than the snapshot")
+    args = parser.parse_args()
+
+    metadata = read_snapshot_metadata(get_snapshot_file())
+    if args.sync and metadata is not None and metadata.get("pipeline_version") == pipeline_version:
+        cdlDF = sync_snapshot(get_snapshot_file(), metadata, fetch_data_version())
+    else:
+        cdlDF = load_cdl_data(refresh = args.refresh)
+    print(f"{get_snapshot_file()}: {len(cdlDF)} rows")
+    print(read_snapshot_metadata(get_snapshot_file()))
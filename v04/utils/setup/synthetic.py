@@ -0,0 +1,196 @@
+# Import datetime & argparse
+import datetime as dt
+import argparse
+
+# Import pandas & numpy
+import pandas as pd
+import numpy as np
+
+# Import team dictionaries from setup
+from utils.setup.setup import team_abbrs
+
+# Import backends, to write synthetic data to a local file database
+from utils.setup.backends import get_backend, cdl_data_columns
+
+# Teams as they are spelled in the database
+synthetic_teams = [team.replace("ROKKR", "RØKKR") for team in team_abbrs.keys()]
+
+# Players per roster
+roster_size = 4
+
+# Matches in a season today
+matches_per_season = 190
+
+# First match_id & season start date, as in the production data
+first_match_id = 27193
+season_start = dt.date(2023, 12, 8)
+
+# Gamemode by map number: maps 1 & 4 Hardpoint, 2 & 5 Search & Destroy, 3 Control
+gamemodes_by_map_num = {
+    1: "Hardpoint", 2: "Search & Destroy", 3: "Control", 4: "Hardpoint", 5: "Search & Destroy"
+}
+
+# Map pools by gamemode: early in the season, and after the mid-season map pool update
+legacy_map_pools = {
+    "Hardpoint": ["Invasion", "Karachi", "Skidrow", "Sub Base", "Terminal"],
+    "Search & Destroy": ["Highrise", "Invasion", "Karachi", "Skidrow", "Terminal"],
+    "Control": ["Highrise", "Invasion", "Karachi"]
+}
+current_map_pools = {
+    "Hardpoint": ["6 Star", "Karachi", "Rio", "Sub Base", "Vista"],
+    "Search & Destroy": ["6 Star", "Highrise", "Invasion", "Karachi", "Rio"],
+    "Control": ["Highrise", "Invasion", "Karachi"]
+}
+
+# Share of each season played on the legacy map pools
+legacy_share = 0.35
+
+# Winning score by gamemode
+winning_scores = {"Hardpoint": 250, "Search & Destroy": 6, "Control": 3}
+
+# Average kills per player by gamemode, and the spread of player skill around it
+mean_kills = {"Hardpoint": 24, "Search & Destroy": 7, "Control": 22}
+player_skill_sd = 0.12
+
+
+# Function to build synthetic rosters: one row per player, with a skill multiplier
+def build_synthetic_rosters(rng: np.random.Generator):
+    rosters = pd.DataFrame({
+        "team": np.repeat(synthetic_teams, roster_size),
+        "player": [f"{team_abbrs[team.replace('RØKKR', 'ROKKR')]}Player{i + 1}"
+                   for team in synthetic_teams for i in range(roster_size)]
+    })
+    rosters["skill"] = rng.lognormal(0, player_skill_sd, len(rosters))
+    return rosters
+
+# Function to schedule matches: two distinct teams and a date for each
+# Matches are played on Friday, Saturday & Sunday, about 8 per weekend
+def schedule_matches(rng: np.random.Generator, n_seasons: int, n_matches: int):
+    team_a = rng.integers(0, len(synthetic_teams), n_seasons * n_matches)
+    team_b = (team_a + rng.integers(1, len(synthetic_teams), len(team_a))) % len(synthetic_teams)
+
+    season = np.repeat(np.arange(n_seasons), n_matches)
+    match_in_season = np.tile(np.arange(n_matches), n_seasons)
+    weekend, match_in_weekend = np.divmod(match_in_season, 8)
+    day_offset = season * 365 + weekend * 7 + np.minimum(match_in_weekend // 3, 2)
+
+    return pd.DataFrame({
+        "match_id": first_match_id + np.arange(len(team_a)),
+        "match_date": pd.Timestamp(season_start) + pd.to_timedelta(day_offset, unit = "D"),
+        "legacy": match_in_season < n_matches * legacy_share,
+        "team_a": team_a,
+        "team_b": team_b
+    })
+
+# Function to simulate best-of-5 series: one row per map played
+def simulate_maps(rng: np.random.Generator, matches: pd.DataFrame, team_ratings: np.ndarray):
+
+    # Map win probability for team a, from the rating difference
+    n_matches = len(matches)
+    rating_diff = team_ratings[matches["team_a"].to_numpy()] - team_ratings[matches["team_b"].to_numpy()]
+    p_team_a = 1 / (1 + np.exp(-rating_diff))
+
+    # Simulate 5 maps per series, and keep maps until a team has 3 wins
+    a_wins = rng.random((n_matches, 5)) < p_team_a[:, None]
+    a_total = np.cumsum(a_wins, axis = 1)
+    b_total = np.cumsum(~a_wins, axis = 1)
+    decided = np.maximum(a_total, b_total) >= 3
+    maps_played = decided.argmax(axis = 1) + 1
+    played = np.arange(5)[None, :] < maps_played[:, None]
+
+    # Map-level table
+    match_idx, map_idx = np.nonzero(played)
+    maps = matches.iloc[match_idx].reset_index(drop = True)
+    maps["map_num"] = map_idx + 1
+    maps["gamemode"] = maps["map_num"].map(gamemodes_by_map_num)
+    maps["a_won"] = a_wins[match_idx, map_idx]
+    maps["a_won_series"] = a_total[match_idx, maps_played[match_idx] - 1] == 3
+
+    # Map names, drawn from the pool in use at the time of the match
+    maps["map_name"] = ""
+    for legacy, map_pools in [(True, legacy_map_pools), (False, current_map_pools)]:
+        for gamemode, pool in map_pools.items():
+            mask = (maps["legacy"] == legacy) & (maps["gamemode"] == gamemode)
+            maps.loc[mask, "map_name"] = rng.choice(pool, mask.sum())
+
+    # Scores: the winner hits the winning score, the loser lands somewhere below it
+    winning_score = maps["gamemode"].map(winning_scores).to_numpy()
+    losing_score = np.floor(winning_score * rng.beta(4, 2, len(maps))).astype(int)
+    losing_score = np.minimum(losing_score, winning_score - 1)
+    maps["a_score"] = np.where(maps["a_won"], winning_score, losing_score)
+    maps["b_score"] = np.where(maps["a_won"], losing_score, winning_score)
+
+    return maps
+
+# Function to expand maps to player rows, with kills, deaths & damage
+def simulate_player_stats(rng: np.random.Generator, maps: pd.DataFrame, rosters: pd.DataFrame):
+
+    # One team-level row per map & side
+    sides = []
+    for side, opp_side in [("a", "b"), ("b", "a")]:
+        side_df = maps[["match_id", "match_date", "map_num", "map_name", "gamemode"]].copy()
+        side_df["team_idx"] = maps[f"team_{side}"]
+        side_df["team_score"] = maps[f"{side}_score"]
+        side_df["map_result"] = (maps["a_won"] == (side == "a")).astype(int)
+        side_df["series_result"] = (maps["a_won_series"] == (side == "a")).astype(int)
+        sides.append(side_df)
+    team_maps = pd.concat(sides, ignore_index = True)
+
+    # Four player rows per team-level row
+    player_slot = np.tile(np.arange(roster_size), len(team_maps))
+    cdlDF = team_maps.loc[team_maps.index.repeat(roster_size)].reset_index(drop = True)
+    roster_idx = cdlDF["team_idx"].to_numpy() * roster_size + player_slot
+    cdlDF["player"] = rosters["player"].to_numpy()[roster_idx]
+    cdlDF["team"] = rosters["team"].to_numpy()[roster_idx]
+
+    # Kills & deaths: poisson around the gamemode average, scaled by skill and map result
+    base_kills = cdlDF["gamemode"].map(mean_kills).to_numpy()
+    skill = rosters["skill"].to_numpy()[roster_idx]
+    result_factor = np.where(cdlDF["map_result"] == 1, 1.08, 0.92)
+    cdlDF["kills"] = rng.poisson(base_kills * skill * result_factor)
+    cdlDF["deaths"] = rng.poisson(base_kills / skill / result_factor)
+    cdlDF["kd"] = np.round(cdlDF["kills"] / cdlDF["deaths"].clip(lower = 1), 2)
+    cdlDF["plus_minus"] = cdlDF["kills"] - cdlDF["deaths"]
+    cdlDF["dmg"] = (cdlDF["kills"] * rng.normal(130, 20, len(cdlDF))).clip(lower = 0).round().astype(int)
+    cdlDF["match_day"] = cdlDF["match_date"].dt.day_name()
+
+    return cdlDF
+
+# Function to generate synthetic raw cdl data, shaped like the cdl_data table
+# 1 season of 190 matches is about today's data volume
+def generate_cdl_data(n_seasons: int = 1, n_matches: int = matches_per_season, seed: int = 0):
+
+    rng = np.random.default_rng(seed)
+    rosters = build_synthetic_rosters(rng)
+    team_ratings = rng.normal(0, 0.5, len(synthetic_teams))
+
+    matches = schedule_matches(rng, n_seasons, n_matches)
+    maps = simulate_maps(rng, matches, team_ratings)
+    cdlDF = simulate_player_stats(rng, maps, rosters)
+
+    # Arrange like the database: no particular order
+    return cdlDF[list(cdl_data_columns)] \
+        .sample(frac = 1, random_state = seed) \
+        .reset_index(drop = True)
+
+# Function to write synthetic raw cdl data to a backend's cdl_data table
+def write_synthetic_cdl_data(backend_name: str, n_seasons: int = 1,
+                             n_matches: int = matches_per_season, seed: int = 0, **backend_kwargs):
+    cdlDF = generate_cdl_data(n_seasons, n_matches, seed)
+    get_backend(backend_name, **backend_kwargs).write_table(cdlDF, "cdl_data", cdl_data_columns)
+    return cdlDF
+
+
+# Fill a local file database with synthetic data, from the v04 folder:
+# python -m utils.setup.synthetic --seasons 10 --target duckdb
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Generate synthetic cdl data")
+    parser.add_argument("--seasons", type = int, default = 1)
+    parser.add_argument("--matches", type = int, default = matches_per_season,
+                        help = "matches per season")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--target", default = "duckdb", choices = ["sqlite", "duckdb"])
+    args = parser.parse_args()
+
+    cdlDF = write_synthetic_cdl_data(args.target, args.seasons, args.matches, args.seed)
+    print(f"Wrote {len(cdlDF)} synthetic rows to {get_backend(args.target)}")
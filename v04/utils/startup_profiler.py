@@ -0,0 +1,96 @@
+# Import os, sys, time, builtins & importlib
+import os
+import sys
+import time
+import builtins
+import importlib
+
+# Environment variable to turn on startup profiling, ie. CDL_PROFILE_STARTUP=1 shiny run app.py
+profile_env_var = "CDL_PROFILE_STARTUP"
+profile_startup = os.environ.get(profile_env_var, "") not in ("", "0")
+
+# Wall times recorded during startup, as (kind, name, milliseconds)
+startup_timings = []
+
+# State of the import timer
+_original_import = builtins.__import__
+_import_depth = 0
+_last_checkpoint = time.perf_counter()
+
+
+# Import hook that times every top-level import statement that loads new modules
+# Nested imports are included in the time of the import statement that triggered them
+def _timed_import(name, globals = None, locals = None, fromlist = (), level = 0):
+    global _import_depth
+    if _import_depth > 0:
+        return _original_import(name, globals, locals, fromlist, level)
+    n_modules = len(sys.modules)
+    start = time.perf_counter()
+    _import_depth += 1
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _import_depth -= 1
+        if len(sys.modules) > n_modules:
+            startup_timings.append(("import", name, (time.perf_counter() - start) * 1000))
+
+# Function to start timing imports, from the module that imports this one onwards
+def start_import_timer():
+    builtins.__import__ = _timed_import
+
+# Function to stop timing imports
+def stop_import_timer():
+    builtins.__import__ = _original_import
+
+# Function to record the wall time of a setup step, since the previous checkpoint
+# ie. startup_checkpoint("load cdl data") right after loading it
+def startup_checkpoint(name: str):
+    global _last_checkpoint
+    now = time.perf_counter()
+    if profile_startup:
+        startup_timings.append(("step", name, (now - _last_checkpoint) * 1000))
+    _last_checkpoint = now
+
+# Function to print the startup report, slowest first, and stop timing imports
+def report_startup():
+    if not profile_startup:
+        return
+    stop_import_timer()
+    total = sum(ms for kind, _, ms in startup_timings if kind == "step")
+    print("")
+    print("Startup profile")
+    print("---------------")
+    for kind, name, ms in sorted(startup_timings, key = lambda x: -x[2]):
+        print(f"{kind:>6}  {ms:9.1f} ms  {name}")
+    print(f"{'total':>6}  {total:9.1f} ms")
+
+# Module that is only imported on first attribute access, ie. sns = lazy_import("seaborn")
+# Keeps heavy dependencies out of startup until a plot or scrape needs them
+class LazyModule:
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            if profile_startup:
+                ms = (time.perf_counter() - start) * 1000
+                startup_timings.append(("lazy", self._name, ms))
+                print(f"Lazily imported {self._name} in {ms:.1f} ms")
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+# Function to get a lazily imported module
+def lazy_import(name: str):
+    return LazyModule(name)
+
+
+# Time imports from here on when profiling
+if profile_startup:
+    start_import_timer()
@@ -0,0 +1,131 @@
+# Import numpy & pandas
+import numpy as np
+import pandas as pd
+
+# Key for a streak across every map of a gamemode
+all_maps = "All"
+
+# Columns ordering maps & series from most recent to least recent
+map_recency = ["match_date", "match_id", "map_num"]
+series_recency = ["match_date", "match_id"]
+
+
+# Function to sort a dataframe by group, with each group's most recent row first
+def sort_by_recency(df: pd.DataFrame, keys: list, recency: list):
+    return df.sort_values(keys + recency,
+                          ascending = [True] * len(keys) + [False] * len(recency),
+                          ignore_index = True)
+
+# Function to compute the current streak of every group in one pass, with run-length encoding
+# results_df must be sorted by sort_by_recency, and map_result is 1 for a win, 0 for a loss
+# Returns a dictionary of streaks keyed by group, positive for wins and negative for losses
+def compute_current_streaks(results_df: pd.DataFrame, keys: list):
+    if results_df.empty:
+        return {}
+    results = results_df["map_result"].to_numpy()
+    group_ids = results_df.groupby(keys, observed = True, sort = False).ngroup().to_numpy()
+
+    # A new run starts at every change of result or group
+    new_group = np.r_[True, group_ids[1:] != group_ids[:-1]]
+    new_run = new_group | np.r_[True, results[1:] != results[:-1]]
+    run_ids = np.cumsum(new_run) - 1
+    run_lengths = np.bincount(run_ids)
+
+    # The current streak is the first run of each group
+    group_starts = np.flatnonzero(new_group)
+    streaks = np.where(results[group_starts] == 1, 1, -1) * run_lengths[run_ids[group_starts]]
+    group_keys = results_df.iloc[group_starts][keys].itertuples(index = False, name = None)
+    return dict(zip(group_keys, streaks.tolist()))
+
+# Function to build the current win streak of every team, gamemode & map, for compute_win_streak
+# Keys are (team, gamemode, map_name), with map_name "All" for every map of the gamemode
+def build_win_streaks(cdlDF_input: pd.DataFrame):
+    results_df = cdlDF_input[
+        ["match_id", "match_date", "team", "gamemode", "map_name", "map_result", "map_num"]
+    ] \
+        .drop_duplicates()
+    win_streaks = compute_current_streaks(
+        sort_by_recency(results_df, ["team", "gamemode", "map_name"], map_recency),
+        ["team", "gamemode", "map_name"]
+    )
+    win_streaks.update({
+        (team, gamemode, all_maps): streak
+        for (team, gamemode), streak in compute_current_streaks(
+            sort_by_recency(results_df, ["team", "gamemode"], map_recency),
+            ["team", "gamemode"]
+        ).items()
+    })
+    return win_streaks
+
+# Function to build an O/U streak index from kills, keyed by the given columns
+# Each entry holds the most recent kills, and the running min & max of kills from the most
+# recent map backwards, so the streak for any line comes from one binary search:
+# an Over streak lasts while kills >= line, an Under streak while kills <= line
+# The running min is stored negated, so both arrays are ascending
+def build_ou_streak_index(kills_df: pd.DataFrame, keys: list, recency: list):
+    sorted_df = sort_by_recency(kills_df, keys, recency)
+    kills = sorted_df["kills"].to_numpy(dtype = "float64")
+    grouped = sorted_df.groupby(keys, observed = True, sort = False)["kills"]
+    neg_running_min = -grouped.cummin().to_numpy(dtype = "float64")
+    running_max = grouped.cummax().to_numpy(dtype = "float64")
+    return {
+        key: (kills[positions[0]], neg_running_min[positions], running_max[positions])
+        for key, positions in grouped.indices.items()
+    }
+
+# Function to build the O/U streak index of every player, gamemode & map, for compute_player_ou_streak
+# Keys are (player, gamemode, map_name), with map_name "All" for every map of the gamemode
+def build_player_ou_streak_index(cdlDF_input: pd.DataFrame):
+    kills_df = cdlDF_input[["player", "gamemode", "map_name", "kills"] + map_recency]
+    streak_index = build_ou_streak_index(kills_df, ["player", "gamemode", "map_name"], map_recency)
+    streak_index.update({
+        (player, gamemode, all_maps): entry
+        for (player, gamemode), entry in
+            build_ou_streak_index(kills_df, ["player", "gamemode"], map_recency).items()
+    })
+    return streak_index
+
+# Function to build the Maps 1 - 3 O/U streak index, keyed by player,
+# for compute_player_1_thru_3_ou_streak
+def build_1_thru_3_ou_streak_index(maps_1_thru_3_DF_input: pd.DataFrame):
+    kills_df = maps_1_thru_3_DF_input[["player", "kills"] + series_recency]
+    return build_ou_streak_index(kills_df, ["player"], series_recency)
+
+# Function to compute the current O/U streak for a line from an O/U streak index entry
+def count_ou_streak(streak_entry: tuple, cur_line: float):
+    last_kills, neg_running_min, running_max = streak_entry
+    if last_kills - cur_line >= 0:
+        return "Over", int(np.searchsorted(neg_running_min, -cur_line, side = "right"))
+    else:
+        return "Under", int(np.searchsorted(running_max, cur_line, side = "right"))
+
+# Function to get a team's current win streak from the win streaks
+# Same output as compute_win_streak
+def query_win_streak(win_streaks: dict, team_input: str, gamemode_input: str, map_input = "All"):
+    return win_streaks.get((team_input, gamemode_input, map_input), 0)
+
+# Function to get a player's current O/U streak from the O/U streak index
+# Same output as compute_player_ou_streak
+def query_player_ou_streak(
+        streak_index: dict, player_input: str,
+        gamemode_input: str, cur_line: float, map_input = "All"
+):
+    streak_entry = streak_index.get((player_input, gamemode_input, map_input))
+
+    # If the player never played the map & mode, return "Never Played"
+    if streak_entry is None:
+        return "Never Played", " "
+
+    ou, streak = count_ou_streak(streak_entry, cur_line)
+    return ou, str(streak)
+
+# Function to get a player's current Maps 1 - 3 O/U streak from the Maps 1 - 3 O/U streak index
+# Same output as compute_player_1_thru_3_ou_streak
+def query_player_1_thru_3_ou_streak(streak_index: dict, player_input: str, cur_line: float):
+    streak_entry = streak_index.get(player_input)
+
+    # If the player never played, return "Never Played"
+    if streak_entry is None:
+        return "Never Played", " "
+
+    return count_ou_streak(streak_entry, cur_line)
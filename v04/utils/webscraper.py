@@ -1,21 +1,20 @@
 
-# Import selenium
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoSuchElementException
-
-# Import undetected chromedriver
-import undetected_chromedriver as uc
-
 # Import time & pandas
 import time
 import pandas as pd
 
 def scrape_prizepicks():
 
+    # Import selenium & undetected chromedriver here, so they only load when a scrape is requested
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.common.exceptions import NoSuchElementException
+
+    import undetected_chromedriver as uc
+
     # Set Chrome Options, specifically to allow location tracking on PrizePicks
     capabilities = DesiredCapabilities().CHROME
 